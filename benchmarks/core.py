@@ -0,0 +1,351 @@
+"""Micro-benchmarks of tuitka's own hot paths.
+
+Run from the repository root, with tuitka installed in the environment:
+
+    python benchmarks/core.py             # compare against baseline.json
+    python benchmarks/core.py --update    # record a new baseline
+
+Timings are divided by those of a fixed pure Python workload measured in the
+same run, so a baseline recorded on one machine stays meaningful on another.
+A benchmark regresses when its relative time grows by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Third party names the generated scripts import, some of them need plugins.
+THIRD_PARTY_IMPORTS = (
+    "requests",
+    "yaml",
+    "numpy",
+    "pandas",
+    "PySide6",
+    "matplotlib",
+    "dill",
+    "rich",
+    "textual",
+    "toml",
+)
+
+PYPROJECTS = {
+    "poetry": """
+[tool.poetry.dependencies]
+python = "^3.10"
+requests = "^2.31"
+numpy = { version = "1.26.4", extras = ["dev"] }
+rich = { version = ">=13" }
+textual = "*"
+""",
+    "hatch": """
+[tool.hatch.metadata]
+dependencies = ["requests>=2.31", "numpy==1.26.4", "rich", "textual"]
+""",
+    "pep621": """
+[project]
+name = "example"
+dependencies = ["requests>=2.31", "numpy==1.26.4", "rich", "textual"]
+
+[project.optional-dependencies]
+dev = ["pytest", "ruff"]
+""",
+}
+
+PEP_723_BLOCK = """# /// script
+# dependencies = [
+#   "requests>=2.31",
+#   "pyyaml",
+#   "rich",
+# ]
+# ///
+"""
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[Path], Callable[[], object]]
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    relative: float
+    baseline: float | None = None
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline:
+            return None
+        return self.relative / self.baseline - 1
+
+
+def calibration() -> None:
+    """Fixed workload the benchmarks are measured against."""
+    items = {str(index): index for index in range(200)}
+    sorted(items, key=lambda key: (len(key), key))
+
+
+def write_script(directory: Path, name: str, functions: int) -> Path:
+    lines = [PEP_723_BLOCK, "import os", "import sys", "from pathlib import Path"]
+    lines.extend(f"import {name}" for name in THIRD_PARTY_IMPORTS)
+    for index in range(functions):
+        lines.extend(
+            [
+                "",
+                "",
+                f"def function_{index}(value):",
+                f"    from json import dumps as dumps_{index}",
+                f"    result = [item * {index} for item in range(value)]",
+                "    if result:",
+                f"        return dumps_{index}(result)",
+                "    return None",
+            ]
+        )
+    script = directory / name
+    script.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return script
+
+
+def parse_script(functions: int):
+    def setup(directory: Path):
+        from tuitka.utils import DependencyParser
+
+        script = write_script(directory, f"script_{functions}.py", functions)
+        return lambda: DependencyParser(script).parse()
+
+    return setup
+
+
+def parse_pyproject(flavor: str):
+    def setup(directory: Path):
+        from tuitka.utils import DependencyParser
+
+        pyproject = directory / f"pyproject-{flavor}.toml"
+        pyproject.write_text(PYPROJECTS[flavor], encoding="utf-8")
+        parser = DependencyParser(directory / "main.py")
+        return lambda: parser.parse_pyproject_toml(pyproject)
+
+    return setup
+
+
+def prepare_command(directory: Path):
+    from tuitka.constants import DEFAULT_NUITKA_OPTIONS
+    from tuitka.utils import prepare_nuitka_command
+
+    script = write_script(directory, "prepare.py", 10)
+    options = {
+        **DEFAULT_NUITKA_OPTIONS,
+        "--onefile": True,
+        "--jobs": "4",
+        "--lto": "no",
+        "--output-dir": "dist",
+        "--include-package": ["rich", "textual", "yaml"],
+        "--nofollow-import-to": "*.tests,*.test",
+        "--noinclude-pytest-mode": "nofollow",
+        "--windows-console-mode": None,
+        **{f"--include-data-files=data/{index}.json": True for index in range(50)},
+    }
+    # The first call analyzes the script, later ones reuse the analysis.
+    prepare_nuitka_command(script, isolated=True, **options)
+    return lambda: prepare_nuitka_command(script, isolated=True, **options)
+
+
+def options_dict(directory: Path):
+    from tuitka.utils import create_nuitka_options_dict
+
+    create_nuitka_options_dict()
+    return create_nuitka_options_dict
+
+
+def plugins_for(count: int):
+    def setup(directory: Path):
+        from tuitka.utils import apply_plugins
+
+        imports = [f"package_{index}" for index in range(count)]
+        imports[:: count // 10] = ["PySide6", "PyQt5", "tkinter", "dill", "gi"] * 2
+        return lambda: apply_plugins(imports, is_standalone=True)
+
+    return setup
+
+
+BENCHMARKS = (
+    Benchmark("parse_small_script", parse_script(10)),
+    Benchmark("parse_huge_script", parse_script(3000)),
+    *(
+        Benchmark(f"parse_pyproject_{flavor}", parse_pyproject(flavor))
+        for flavor in PYPROJECTS
+    ),
+    Benchmark("prepare_nuitka_command", prepare_command),
+    Benchmark("create_nuitka_options_dict", options_dict),
+    Benchmark("apply_plugins_1k", plugins_for(1_000)),
+    Benchmark("apply_plugins_100k", plugins_for(100_000)),
+)
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Best time of one call in seconds, over ``repeat`` timed loops."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(
+    benchmarks=BENCHMARKS, repeat: int = 5, baseline: dict | None = None
+) -> list[Result]:
+    baseline = baseline or {}
+    results = []
+    with tempfile.TemporaryDirectory(prefix="tuitka-bench-") as temp_dir:
+        # Keep the analysis cache of these runs away from the user's.
+        previous_cache_dir = os.environ.get("TUITKA_CACHE_DIR")
+        os.environ["TUITKA_CACHE_DIR"] = str(Path(temp_dir) / "cache")
+        try:
+            for benchmark in benchmarks:
+                directory = Path(temp_dir) / benchmark.name
+                directory.mkdir()
+                function = benchmark.setup(directory)
+                # Measured next to each benchmark, as the machine's load drifts.
+                reference = measure(calibration, repeat)
+                seconds = measure(function, repeat)
+                results.append(
+                    Result(
+                        benchmark.name,
+                        seconds,
+                        seconds / reference,
+                        baseline.get(benchmark.name),
+                    )
+                )
+        finally:
+            if previous_cache_dir is None:
+                del os.environ["TUITKA_CACHE_DIR"]
+            else:
+                os.environ["TUITKA_CACHE_DIR"] = previous_cache_dir
+    return results
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_results(results: list[Result], threshold: float) -> str:
+    width = max(len(result.name) for result in results)
+    lines = [f"{'benchmark':<{width}}  {'time':>10}  {'relative':>10}  change"]
+    for result in results:
+        change = result.change
+        if change is None:
+            verdict = "no baseline"
+        else:
+            verdict = f"{change:+.1%}"
+            if change > threshold:
+                verdict += "  REGRESSION"
+        lines.append(
+            f"{result.name:<{width}}  {format_seconds(result.seconds):>10}"
+            f"  {result.relative:>10.2f}  {verdict}"
+        )
+    return "\n".join(lines)
+
+
+def read_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def write_baseline(path: Path, results: list[Result]) -> None:
+    data = {
+        "machine": f"{platform.machine()} {platform.system()}, "
+        f"Python {platform.python_version()}",
+        "benchmarks": {result.name: round(result.relative, 3) for result in results},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time tuitka's hot paths and compare them against a baseline."
+    )
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="NAME",
+        help="Only run benchmarks whose name contains one of these.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown counted as a regression, "
+        f"{DEFAULT_THRESHOLD} by default.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed loops per benchmark."
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Record the results as the new baseline instead of comparing.",
+    )
+    return parser.parse_args(argv)
+
+
+def is_regression(result: Result, args: argparse.Namespace) -> bool:
+    return result.change is not None and result.change > args.threshold
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    benchmarks = [
+        benchmark
+        for benchmark in BENCHMARKS
+        if not args.names or any(name in benchmark.name for name in args.names)
+    ]
+    baseline = {} if args.update else read_baseline(args.baseline)
+    results = run_benchmarks(benchmarks, args.repeat, baseline)
+
+    # A slowdown has to show up twice, a busy machine often causes one. New
+    # baselines take the best of two runs for the same reason.
+    suspects = {
+        result.name for result in results if args.update or is_regression(result, args)
+    }
+    if suspects:
+        rerun = run_benchmarks(
+            [benchmark for benchmark in benchmarks if benchmark.name in suspects],
+            args.repeat,
+            baseline,
+        )
+        best = {result.name: result for result in rerun}
+        results = [
+            min(result, best.get(result.name, result), key=lambda item: item.relative)
+            for result in results
+        ]
+    print(format_results(results, args.threshold))
+
+    if args.update:
+        write_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    regressions = [result.name for result in results if is_regression(result, args)]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
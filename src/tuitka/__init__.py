@@ -1,31 +1,432 @@
+# Imported before anything else, it takes the time --profile-startup starts at.
+from tuitka.startup import STARTED, STARTED_MODULES, StartupProfile
+
+import argparse
+import os
 import sys
-from tuitka.tui import NuitkaTUI
 from pathlib import Path
-from tuitka.utils import chdir_context, error
+from tuitka.constants import DEFAULT_BENCHMARK_RUNS, DEFAULT_NUITKA_OPTIONS
+from tuitka.utils import chdir_context, error, expand_script_paths
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tuitka",
+        description="A TUI Frontend for Nuitka - The Python Compiler",
+    )
+    parser.add_argument(
+        "scripts",
+        nargs="*",
+        metavar="SCRIPT",
+        help="Python files or glob patterns to compile. Without any, the TUI is started.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Maximum number of builds to run at once when compiling several scripts. "
+        "Defaults to what CPU count and available memory allow.",
+    )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Build in a throwaway environment instead of reusing a cached one.",
+    )
+    parser.add_argument(
+        "--reuse-build",
+        action="store_true",
+        help="Keep the build directory in tuitka's cache so rebuilds after small "
+        "edits reuse prior outputs.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="artifact_cache",
+        action="store_false",
+        help="Always compile, instead of restoring the programs of an identical "
+        "earlier build from the artifact cache.",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Compile without any UI for CI: stream the build output to stderr "
+        "and print a JSON result to stdout.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Compile the script again whenever it or a local module it imports "
+        "changes, reusing the previous build directory.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="After a successful build, run the program and the script under "
+        "CPython alike and report startup latency, wall time and peak memory. "
+        "The report is saved next to the program.",
+    )
+    parser.add_argument(
+        "--benchmark-runs",
+        type=int,
+        default=DEFAULT_BENCHMARK_RUNS,
+        metavar="RUNS",
+        help=f"Cold and warm runs of each program when benchmarking (default "
+        f"{DEFAULT_BENCHMARK_RUNS}).",
+    )
+    parser.add_argument(
+        "--benchmark-args",
+        default="",
+        metavar="ARGS",
+        help="Arguments passed to both programs when benchmarking, as one "
+        "shell quoted string.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Install every package from the wheelhouse and never touch the "
+        "network. Fill the wheelhouse with `tuitka wheelhouse` first.",
+    )
+    parser.add_argument(
+        "--wheelhouse",
+        type=Path,
+        default=os.environ.get("TUITKA_WHEELHOUSE"),
+        metavar="DIR",
+        help="Folder of wheels offline builds install from. "
+        "(default: $TUITKA_WHEELHOUSE)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print how long imports and the first frame took to stderr. The "
+        "TUI exits once its first frame is shown.",
+    )
+    args = parser.parse_args(argv)
+    if args.headless and not args.scripts:
+        parser.error("--headless needs at least one script to compile")
+    if args.watch and (not args.scripts or args.headless):
+        parser.error("--watch needs a script to compile and can not be --headless")
+    if args.benchmark and (not args.scripts or args.watch):
+        parser.error("--benchmark needs a script to compile and can not be --watch")
+    if args.benchmark_runs < 2:
+        parser.error("--benchmark-runs needs at least 2 runs for a confidence interval")
+    if args.offline and args.wheelhouse is None:
+        parser.error("--offline needs a --wheelhouse to install from")
+    return args
+
+
+def parse_fingerprint_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tuitka fingerprint",
+        description="Print the fingerprint of every input deciding what a build "
+        "of the scripts produces. Builds with the same fingerprint are restored "
+        "from the artifact cache.",
+    )
+    parser.add_argument("scripts", nargs="+", metavar="SCRIPT")
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Fingerprint a build in a throwaway environment.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the fingerprint inputs as JSON as well.",
+    )
+    return parser.parse_args(argv)
+
+
+def fingerprint_main(argv: list[str]) -> None:
+    from tuitka.constants import PYTHON_VERSION
+    from tuitka.fingerprint import run_fingerprint_cli
+
+    args = parse_fingerprint_args(argv)
+    paths = expand_script_paths(args.scripts)
+    for path in paths:
+        if not path.is_file():
+            error(f"{path} is not a valid Python file.")
+            sys.exit(1)
+    run_fingerprint_cli(
+        paths,
+        DEFAULT_NUITKA_OPTIONS,
+        PYTHON_VERSION,
+        isolated=args.isolated,
+        as_json=args.json,
+    )
+
+
+def parse_lock_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tuitka lock",
+        description="Resolve the dependencies of the scripts' builds into lock "
+        "files in each project's .tuitka/locks folder. Builds install exactly the "
+        "pinned versions, a build without a lock file creates it.",
+    )
+    parser.add_argument("scripts", nargs="+", metavar="SCRIPT")
+    parser.add_argument(
+        "--upgrade",
+        action="store_true",
+        help="Resolve again, picking up newer versions.",
+    )
+    parser.add_argument(
+        "--python",
+        default=None,
+        help="Python version the builds use. (default: the one tuitka runs on)",
+    )
+    return parser.parse_args(argv)
+
+
+def lock_main(argv: list[str]) -> None:
+    from tuitka.constants import PYTHON_VERSION
+    from tuitka.locks import run_lock_cli
+
+    args = parse_lock_args(argv)
+    paths = expand_script_paths(args.scripts)
+    for path in paths:
+        if not path.is_file():
+            error(f"{path} is not a valid Python file.")
+            sys.exit(1)
+    sys.exit(run_lock_cli(paths, args.python or PYTHON_VERSION, upgrade=args.upgrade))
+
+
+def parse_size_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tuitka size",
+        description="Break down the size of build outputs, standalone folders or "
+        "onefile programs, into the program, extension modules, shared libraries "
+        "and data files of each package.",
+    )
+    parser.add_argument("artifacts", nargs="+", metavar="ARTIFACT", type=Path)
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the full breakdown as JSON.",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=2,
+        help="Folder levels to show in the tree. (default: 2)",
+    )
+    parser.add_argument(
+        "--sort",
+        choices=("size", "name"),
+        default="size",
+        help="Order of the files in the tree. (default: size)",
+    )
+    return parser.parse_args(argv)
+
+
+def size_main(argv: list[str]) -> None:
+    from tuitka.size_report import run_size_cli
+
+    args = parse_size_args(argv)
+    for artifact in args.artifacts:
+        if not artifact.exists():
+            error(f"{artifact} does not exist.")
+            sys.exit(1)
+    try:
+        run_size_cli(args.artifacts, as_json=args.json, depth=args.depth, by=args.sort)
+    except ValueError as exc:
+        error(str(exc))
+        sys.exit(1)
+
+
+def parse_wheelhouse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tuitka wheelhouse",
+        description="Download every package the scripts' builds install into a "
+        "wheelhouse folder, for later builds with --offline. Scripts are locked "
+        "first, lock files and the current environment are taken as they are.",
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        metavar="SOURCE",
+        type=Path,
+        help="Python scripts or lock files.",
+    )
+    parser.add_argument(
+        "--from-environment",
+        action="store_true",
+        help="Also download the packages installed in the current environment.",
+    )
+    parser.add_argument(
+        "--wheelhouse",
+        type=Path,
+        default=os.environ.get("TUITKA_WHEELHOUSE"),
+        metavar="DIR",
+        help="Folder to download into. (default: $TUITKA_WHEELHOUSE)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only list what the wheelhouse lacks, without downloading.",
+    )
+    parser.add_argument(
+        "--python",
+        default=None,
+        help="Python version the builds use. (default: the one tuitka runs on)",
+    )
+    args = parser.parse_args(argv)
+    if not args.sources and not args.from_environment:
+        parser.error("give scripts, lock files or --from-environment")
+    if args.wheelhouse is None:
+        parser.error("--wheelhouse is required unless TUITKA_WHEELHOUSE is set")
+    return args
+
+
+def wheelhouse_main(argv: list[str]) -> None:
+    from tuitka.constants import PYTHON_VERSION
+    from tuitka.wheelhouse import run_wheelhouse_cli
+
+    args = parse_wheelhouse_args(argv)
+    for source in args.sources:
+        if not source.is_file():
+            error(f"{source} is not a script or lock file.")
+            sys.exit(1)
+    sys.exit(
+        run_wheelhouse_cli(
+            args.sources,
+            args.wheelhouse.resolve(),
+            args.python or PYTHON_VERSION,
+            from_environment=args.from_environment,
+            check_only=args.check,
+        )
+    )
+
+
+SUBCOMMANDS = {
+    "fingerprint": fingerprint_main,
+    "lock": lock_main,
+    "size": size_main,
+    "wheelhouse": wheelhouse_main,
+}
 
 
 def main() -> None:
-    if len(sys.argv) > 1:
-        path = Path(sys.argv[1]).resolve()
-        if not path.is_file() or not path.suffix == ".py":
+    if sys.argv[1:2] and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    startup = StartupProfile(STARTED, STARTED_MODULES)
+    startup.mark("import tuitka")
+    args = parse_args(sys.argv[1:])
+    try:
+        run(args, startup)
+    finally:
+        if args.profile_startup:
+            print(startup.format_report(), file=sys.stderr)
+
+
+def get_benchmark_options(args: argparse.Namespace) -> dict | None:
+    if not args.benchmark:
+        return None
+    import shlex
+
+    return {"arguments": shlex.split(args.benchmark_args), "runs": args.benchmark_runs}
+
+
+def run(args: argparse.Namespace, startup: StartupProfile) -> None:
+    """Start the mode ``args`` ask for, each importing only what it needs."""
+    startup_profile = startup if args.profile_startup else None
+    benchmark = get_benchmark_options(args)
+    if args.offline:
+        from tuitka.wheelhouse import enable_offline
+
+        # Set in the environment, the TUI and every build process pick it up.
+        enable_offline(args.wheelhouse)
+    if args.scripts:
+        paths = expand_script_paths(args.scripts)
+        invalid_paths = [
+            path for path in paths if not path.is_file() or not path.suffix == ".py"
+        ]
+        if not paths or invalid_paths:
+            path = invalid_paths[0] if invalid_paths else Path(args.scripts[0])
             error(
                 f"{path} is not a valid Python file. Please provide a valid Python file or if you want to run the TUI, just run `tuitka` without arguments.",
-                subtitle="Usage: tuitka <file.py>",
+                subtitle="Usage: tuitka <file.py> [<file.py> ...]",
             )
             return
 
-        from tuitka.inline_app import InlineCompilationApp
+        if args.headless:
+            startup.mode = "headless"
+            from tuitka.headless import run_headless
+
+            startup.mark("import tuitka.headless")
+            if not run_headless(
+                paths,
+                DEFAULT_NUITKA_OPTIONS,
+                args.workers,
+                isolated=args.isolated,
+                reuse_build=args.reuse_build,
+                artifact_cache=args.artifact_cache,
+                benchmark=benchmark,
+            ):
+                sys.exit(1)
+            return
 
-        default_options = {
-            "--onefile": True,
-            "--assume-yes-for-downloads": True,
-            "--remove-output": True,
-        }
+        if args.watch:
+            if len(paths) > 1:
+                error(
+                    "--watch compiles a single script.",
+                    subtitle="Usage: tuitka --watch <file.py>",
+                )
+                return
+            startup.mode = "watch"
+            from tuitka.watch import run_watch_cli
 
+            startup.mark("import tuitka.watch")
+            run_watch_cli(
+                paths[0],
+                DEFAULT_NUITKA_OPTIONS,
+                isolated=args.isolated,
+                artifact_cache=args.artifact_cache,
+            )
+            return
+
+        if len(paths) > 1:
+            startup.mode = "batch"
+            from tuitka.batch import run_batch_cli
+
+            startup.mark("import tuitka.batch")
+            if not run_batch_cli(
+                paths,
+                DEFAULT_NUITKA_OPTIONS,
+                args.workers,
+                isolated=args.isolated,
+                reuse_build=args.reuse_build,
+                artifact_cache=args.artifact_cache,
+                benchmark=benchmark,
+            ):
+                sys.exit(1)
+            return
+
+        startup.mode = "inline"
+        from tuitka.inline_app import InlineCompilationApp
+
+        startup.mark("import tuitka.inline_app")
+        path = paths[0]
         with chdir_context(path.parent):
-            inline_app = InlineCompilationApp(path, **default_options)
+            inline_app = InlineCompilationApp(
+                path,
+                isolated=args.isolated,
+                reuse_build=args.reuse_build,
+                artifact_cache=args.artifact_cache,
+                startup_profile=startup_profile,
+                **DEFAULT_NUITKA_OPTIONS,
+            )
+            startup.mark("prepare build")
             inline_app.run(inline=True)
+            if benchmark is not None and inline_app.artifacts:
+                from tuitka.benchmark import run_benchmark_cli
+
+                run_benchmark_cli(
+                    path, inline_app.artifacts, inline_app.python_version, **benchmark
+                )
             return
 
-    app = NuitkaTUI()
+    startup.mode = "tui"
+    from tuitka.tui import NuitkaTUI
+
+    startup.mark("import tuitka.tui")
+    app = NuitkaTUI(startup_profile=startup_profile)
     app.run()
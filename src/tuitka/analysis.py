@@ -0,0 +1,205 @@
+import hashlib
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from tuitka.cache import get_cache_dir, read_json, write_json_atomic
+from tuitka.plugins import ACCELERATED, PACKAGED, PluginDecision, match_plugins
+
+# Bump whenever the analysis changes, so older cache files are ignored.
+ANALYSIS_VERSION = 2
+
+# Analyses of this process, the persisted ones are only read once.
+_ANALYSES: dict[Path, "ScriptAnalysis"] = {}
+
+
+@dataclass
+class ScriptAnalysis:
+    """Everything a build learns from reading a script and its project.
+
+    Kept between runs, so building an unchanged script again parses nothing.
+    Paths are stored as strings to keep the analysis serializable.
+    """
+
+    script: str
+    content_hash: str
+    dependencies: list[str] = field(default_factory=list)
+    requirements_path: str | None = None
+    pep_723_block: str | None = None
+    imports: list[str] = field(default_factory=list)
+    detected_imports: list[str] = field(default_factory=list)
+    unresolved_imports: list[str] = field(default_factory=list)
+    local_modules: list[str] = field(default_factory=list)
+    # Plugin decisions for packaged and accelerated builds.
+    plugins: dict[str, list[dict]] = field(default_factory=dict)
+    # (mtime_ns, size) of every other file the analysis read.
+    inputs: dict[str, list[int]] = field(default_factory=dict)
+    # Hash of the importable names in each directory holding a local module.
+    directories: dict[str, str] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    distribution_index: str | None = None
+
+    def get_plugin_decisions(self, mode: str) -> list[PluginDecision]:
+        return [
+            PluginDecision(**{**decision, "imports": tuple(decision["imports"])})
+            for decision in self.plugins.get(mode, [])
+        ]
+
+    def to_metadata(self):
+        """A fresh DependenciesMetadata, callers are free to modify it."""
+        from tuitka.utils import DependenciesMetadata
+
+        return DependenciesMetadata(
+            dependencies=list(self.dependencies),
+            requirements_path=Path(self.requirements_path)
+            if self.requirements_path
+            else None,
+            detected_imports=list(self.detected_imports),
+            unresolved_imports=list(self.unresolved_imports),
+            local_modules=[Path(path) for path in self.local_modules],
+        )
+
+    def is_current(self, content_hash: str) -> bool:
+        """Whether nothing the analysis was made from changed since."""
+        if content_hash != self.content_hash:
+            return False
+        for path, stamp in self.inputs.items():
+            if _get_stamp(Path(path)) != stamp:
+                return False
+        if any(os.path.exists(path) for path in self.missing):
+            return False
+        for path, names_hash in self.directories.items():
+            if _get_module_names_hash(Path(path)) != names_hash:
+                return False
+        if self.distribution_index is not None:
+            from tuitka.distributions import get_index_key
+
+            return get_index_key() == self.distribution_index
+        return True
+
+
+def _get_stamp(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _get_module_names_hash(directory: Path) -> str | None:
+    """Changes when a module or package appears in or leaves ``directory``.
+
+    Build output such as "main.build" or "main.bin" does not count, so
+    building a script does not invalidate its analysis.
+    """
+    try:
+        names = sorted(
+            entry.name
+            for entry in os.scandir(directory)
+            if entry.name.endswith((".py", ".pyw"))
+            or (entry.is_dir() and "." not in entry.name)
+        )
+    except OSError:
+        return None
+    return hashlib.sha256("\0".join(names).encode("utf-8")).hexdigest()
+
+
+def get_analysis_path(script: Path) -> Path:
+    script_hash = hashlib.sha256(str(script).encode("utf-8")).hexdigest()
+    return get_cache_dir("analysis") / f"{script.stem}-{script_hash[:12]}.json"
+
+
+def _load_analysis(script: Path) -> ScriptAnalysis | None:
+    if script in _ANALYSES:
+        return _ANALYSES[script]
+    data = read_json(get_analysis_path(script))
+    if not isinstance(data, dict) or data.pop("version", None) != ANALYSIS_VERSION:
+        return None
+    try:
+        return ScriptAnalysis(**data)
+    except TypeError:
+        return None
+
+
+def _run_analysis(script: Path, content_hash: str) -> ScriptAnalysis:
+    from tuitka.utils import DependencyParser
+
+    parser = DependencyParser(script)
+    metadata = parser.parse()
+    local_modules = [path.resolve() for path in metadata.local_modules]
+
+    watched = {path for path in local_modules if path != script}
+    watched.update(parser.input_files)
+    # A new module next to a local one may shadow an import resolved before.
+    directories = {path.parent for path in local_modules}
+
+    distribution_index = None
+    if metadata.requirements_path is None:
+        from tuitka.distributions import get_index_key
+
+        distribution_index = get_index_key()
+
+    return ScriptAnalysis(
+        script=str(script),
+        content_hash=content_hash,
+        dependencies=metadata.dependencies,
+        requirements_path=str(metadata.requirements_path)
+        if metadata.requirements_path
+        else None,
+        pep_723_block=parser.pep_723_block,
+        imports=parser.imports,
+        detected_imports=metadata.detected_imports,
+        unresolved_imports=metadata.unresolved_imports,
+        local_modules=[str(path) for path in local_modules],
+        plugins={
+            mode: [
+                {**asdict(decision), "imports": list(decision.imports)}
+                for decision in match_plugins(parser.imports, mode)
+            ]
+            for mode in (PACKAGED, ACCELERATED)
+        },
+        inputs={str(path): _get_stamp(path) for path in sorted(watched)},
+        directories={
+            str(path): _get_module_names_hash(path) for path in sorted(directories)
+        },
+        missing=[str(path) for path in parser.missing_files],
+        distribution_index=distribution_index,
+    )
+
+
+def analyze_script(script: Path) -> ScriptAnalysis | None:
+    """Analysis of ``script``, reused while the script and its project are unchanged.
+
+    Returns None if the script can not be read.
+    """
+    script = Path(script).resolve()
+    try:
+        content_hash = hashlib.sha256(script.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+    analysis = _load_analysis(script)
+    if analysis is None or not analysis.is_current(content_hash):
+        analysis = _run_analysis(script, content_hash)
+        try:
+            write_json_atomic(
+                get_analysis_path(script),
+                {"version": ANALYSIS_VERSION, **asdict(analysis)},
+            )
+        except OSError:
+            pass
+    _ANALYSES[script] = analysis
+    return analysis
+
+
+def clear_analysis_memo() -> None:
+    """Forget the analyses of this process, the persisted ones are kept."""
+    _ANALYSES.clear()
+
+
+__all__ = [
+    "ScriptAnalysis",
+    "analyze_script",
+    "clear_analysis_memo",
+    "get_analysis_path",
+]
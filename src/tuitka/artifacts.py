@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.cache import (
+    evict_least_recently_used,
+    get_cache_dir,
+    get_cache_size_limit,
+    get_directory_size,
+    read_json,
+    remove_path,
+    write_json_atomic,
+)
+from tuitka.fingerprint import BuildFingerprint, get_build_fingerprint
+
+ARTIFACT_MARKER = "tuitka-artifact.json"
+ARTIFACT_CACHE_SIZE_VARIABLE = "TUITKA_ARTIFACT_CACHE_SIZE"
+DEFAULT_ARTIFACT_CACHE_SIZE = 5 * 1024**3
+
+# Nuitka's intermediate folders and the sources themselves.
+_NON_ARTIFACT_SUFFIXES = {".py", ".pyw", ".pyi", ".build", ".onefile-build"}
+
+
+def get_output_dir(script: Path, nuitka_options: dict) -> Path:
+    return Path(nuitka_options.get("--output-dir") or script.parent)
+
+
+def find_artifacts(script: Path, nuitka_options: dict, since: float) -> list[Path]:
+    """Programs a build wrote next to the script or into its output directory."""
+    names = {script.stem}
+    if output_filename := nuitka_options.get("--output-filename"):
+        names.update((output_filename, Path(output_filename).stem))
+
+    artifacts = []
+    for entry in sorted(get_output_dir(script, nuitka_options).iterdir()):
+        if (
+            any(
+                entry.name == name or entry.name.startswith(f"{name}.")
+                for name in names
+            )
+            and entry.suffix not in _NON_ARTIFACT_SUFFIXES
+            and entry.stat().st_mtime >= since
+        ):
+            artifacts.append(entry)
+    return artifacts
+
+
+def _copy(source: Path, target: Path) -> None:
+    if source.is_dir():
+        shutil.copytree(source, target, symlinks=True, dirs_exist_ok=True)
+    else:
+        shutil.copy2(source, target)
+
+
+@dataclass
+class ArtifactCacheEntry:
+    """Finished programs of a build, stored under the build's fingerprint."""
+
+    script: Path
+    python_version: str
+    nuitka_options: dict
+    dependencies_metadata: object
+    isolated: bool = False
+    fingerprint: BuildFingerprint = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.fingerprint = get_build_fingerprint(
+            self.script,
+            self.python_version,
+            self.nuitka_options,
+            self.dependencies_metadata,
+            isolated=self.isolated,
+        )
+
+    @property
+    def path(self) -> Path:
+        return get_cache_dir("artifacts") / self.fingerprint.digest
+
+    def restore(self, destination: Path) -> list[Path] | None:
+        """Copy the cached programs to ``destination``, None on a cache miss."""
+        marker_path = self.path / ARTIFACT_MARKER
+        marker = read_json(marker_path)
+        if not marker:
+            return None
+
+        restored = []
+        try:
+            for name in marker.get("artifacts", []):
+                _copy(self.path / name, destination / name)
+                restored.append(destination / name)
+            os.utime(marker_path)
+        except OSError:
+            return None
+        return restored
+
+    def store(self, artifacts: list[Path]) -> Path | None:
+        """Keep the programs of a successful build for later identical builds."""
+        if not artifacts:
+            return None
+        # The build may have created the environment, so its exact packages are
+        # known now. The sources are the ones the build started with.
+        fingerprint = get_build_fingerprint(
+            self.script,
+            self.python_version,
+            self.nuitka_options,
+            self.dependencies_metadata,
+            isolated=self.isolated,
+            sources=self.fingerprint.inputs["sources"],
+        )
+        target = get_cache_dir("artifacts") / fingerprint.digest
+        if (target / ARTIFACT_MARKER).exists():
+            os.utime(target / ARTIFACT_MARKER)
+            return target
+
+        # Assembled aside and moved into place, so readers never see a partial entry.
+        temp_dir = Path(tempfile.mkdtemp(dir=target.parent, prefix=".tmp-"))
+        try:
+            for artifact in artifacts:
+                _copy(artifact, temp_dir / artifact.name)
+            write_json_atomic(
+                temp_dir / ARTIFACT_MARKER,
+                {
+                    "script": str(self.script),
+                    "artifacts": [artifact.name for artifact in artifacts],
+                    "inputs": fingerprint.inputs,
+                    "created": time.time(),
+                    "size": get_directory_size(temp_dir),
+                },
+            )
+            # Leftovers of an interrupted store are not trustworthy.
+            remove_path(target)
+            os.replace(temp_dir, target)
+        except OSError:
+            remove_path(temp_dir)
+            return None
+
+        prune_artifacts(keep=target)
+        return target
+
+
+def prune_artifacts(keep: Path | None = None) -> list[Path]:
+    """Evict the least recently used artifacts beyond the size limit."""
+    entries = {}
+    for marker in get_cache_dir("artifacts").glob(f"*/{ARTIFACT_MARKER}"):
+        if marker.parent.name.startswith("."):
+            continue
+        data = read_json(marker) or {}
+        try:
+            entries[marker.parent] = (marker.stat().st_mtime, data.get("size", 0))
+        except OSError:
+            continue
+    max_bytes = get_cache_size_limit(
+        ARTIFACT_CACHE_SIZE_VARIABLE, DEFAULT_ARTIFACT_CACHE_SIZE
+    )
+    return evict_least_recently_used(entries, max_bytes, keep={keep})
+
+
+__all__ = [
+    "ArtifactCacheEntry",
+    "find_artifacts",
+    "get_output_dir",
+    "prune_artifacts",
+]
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 
@@ -9,25 +10,43 @@ def get_asset_path(asset_name: str) -> Path:
 STYLE_MAIN = get_asset_path("style.tcss")
 STYLE_INLINE_APP = get_asset_path("style_inline_app.tcss")
 STYLE_MODAL_FILEDIALOG = get_asset_path("style_modal_filedialog.tcss")
+STYLE_MODAL_BENCHMARK = get_asset_path("style_modal_benchmark.tcss")
 STYLE_MODAL_COMPILATION = get_asset_path("style_modal_compilation.tcss")
 STYLE_MODAL_SETTINGS = get_asset_path("style_modal_settings.tcss")
+STYLE_MODAL_SIZE_REPORT = get_asset_path("style_modal_size_report.tcss")
 STYLE_MODAL_SPLASHSCREEN = get_asset_path("style_modal_splashscreen.tcss")
 STYLE_MODAL_SUPPORT = get_asset_path("style_modal_support.tcss")
 
 NUITKA_LOGO = get_asset_path("logo/nuitka.png")
 
-CONTENT_SUPPORT_NUITKA = get_asset_path("content/support_nuitka.md").read_text(
-    encoding="utf-8"
-)
-CONTENT_COMMERCIAL = get_asset_path("content/commercial.md").read_text(encoding="utf-8")
+# Text assets are only read when first used, not when tuitka is imported.
+_CONTENT_ASSETS = {
+    "CONTENT_SUPPORT_NUITKA": "content/support_nuitka.md",
+    "CONTENT_COMMERCIAL": "content/commercial.md",
+}
+
+
+@cache
+def get_asset_content(asset_name: str) -> str:
+    return get_asset_path(asset_name).read_text(encoding="utf-8")
+
+
+def __getattr__(name: str) -> str:
+    if name in _CONTENT_ASSETS:
+        return get_asset_content(_CONTENT_ASSETS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
+    "get_asset_content",
     "get_asset_path",
     "STYLE_MAIN",
     "STYLE_INLINE_APP",
     "STYLE_MODAL_FILEDIALOG",
+    "STYLE_MODAL_BENCHMARK",
     "STYLE_MODAL_COMPILATION",
     "STYLE_MODAL_SETTINGS",
+    "STYLE_MODAL_SIZE_REPORT",
     "STYLE_MODAL_SPLASHSCREEN",
     "STYLE_MODAL_SUPPORT",
     "NUITKA_LOGO",
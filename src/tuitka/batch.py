@@ -0,0 +1,380 @@
+import asyncio
+import codecs
+import os
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.artifacts import ArtifactCacheEntry, find_artifacts, get_output_dir
+from tuitka.build_dirs import BuildDirectory
+from tuitka.build_output import get_log_path
+from tuitka.build_phases import PhaseTracker, get_trace_path
+from tuitka.constants import PYTHON_VERSION
+from tuitka.resources import get_available_memory, get_cpu_count
+from tuitka.utils import parse_dependencies, prepare_nuitka_command
+
+# Rough peak memory of one Nuitka build, the C compiler being the main consumer.
+MEMORY_PER_BUILD = 2 * 1024**3
+# Fewer C compiler processes than this per build make the build itself too slow.
+MIN_CPUS_PER_BUILD = 2
+
+
+@dataclass
+class BuildJob:
+    script: Path
+    nuitka_options: dict = field(default_factory=dict)
+    python_version: str = PYTHON_VERSION
+    isolated: bool = False
+    reuse_build: bool = False
+    artifact_cache: bool = True
+
+
+@dataclass
+class BuildResult:
+    job: BuildJob
+    exit_code: int
+    duration: float
+    log_path: Path
+    phases: PhaseTracker | None = None
+    trace_path: Path | None = None
+    command: list[str] = field(default_factory=list)
+    dependencies: list[str] = field(default_factory=list)
+    artifacts: list[Path] = field(default_factory=list)
+    # Imports no package was found for, the build may fail on them.
+    unresolved_imports: list[str] = field(default_factory=list)
+    fingerprint: str | None = None
+    cached: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.exit_code == 0
+
+
+def get_worker_count(job_count: int, max_workers: int | None = None) -> int:
+    """Number of builds to run at once, bounded by CPUs and available memory."""
+    workers = max(1, get_cpu_count() // MIN_CPUS_PER_BUILD)
+
+    available_memory = get_available_memory()
+    if available_memory is not None:
+        workers = min(workers, max(1, available_memory // MEMORY_PER_BUILD))
+
+    if max_workers is not None:
+        workers = min(workers, max_workers)
+
+    return max(1, min(workers, job_count))
+
+
+def make_jobs(
+    scripts: list[Path],
+    nuitka_options: dict,
+    workers: int,
+    isolated: bool = False,
+    reuse_build: bool = False,
+    artifact_cache: bool = True,
+) -> list[BuildJob]:
+    options = dict(nuitka_options)
+    if "--jobs" not in options:
+        # Share the CPUs between the builds instead of oversubscribing them.
+        options["--jobs"] = str(max(1, get_cpu_count() // workers))
+    return [
+        BuildJob(
+            script,
+            options,
+            isolated=isolated,
+            reuse_build=reuse_build,
+            artifact_cache=artifact_cache,
+        )
+        for script in scripts
+    ]
+
+
+def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+    if os.name != "nt":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    process.kill()
+
+
+async def run_build(
+    job: BuildJob,
+    log_path: Path,
+    on_output: Callable[[bytes], None] | None = None,
+) -> BuildResult:
+    """Compile one script, writing the build output to ``log_path``.
+
+    ``on_output`` is called with every chunk of output as it arrives.
+    """
+    if not job.reuse_build:
+        return await _run_build(job, log_path, on_output, job.nuitka_options)
+    # Waits for another build of the same script, off the event loop.
+    build_directory = await asyncio.to_thread(
+        BuildDirectory.for_build, job.script, job.python_version, job.nuitka_options
+    )
+    try:
+        return await _run_build(
+            job,
+            log_path,
+            on_output,
+            build_directory.apply(job.nuitka_options),
+            build_directory,
+        )
+    finally:
+        # Cancelled builds as well, or the directory stays locked.
+        build_directory.release()
+
+
+async def _run_build(
+    job: BuildJob,
+    log_path: Path,
+    on_output: Callable[[bytes], None] | None,
+    nuitka_options: dict,
+    build_directory: BuildDirectory | None = None,
+) -> BuildResult:
+    command, dependencies_metadata = prepare_nuitka_command(
+        job.script, job.python_version, isolated=job.isolated, **nuitka_options
+    )
+    start = time.perf_counter()
+    dependencies = dependencies_metadata.dependencies if dependencies_metadata else []
+    unresolved_imports = (
+        dependencies_metadata.unresolved_imports if dependencies_metadata else []
+    )
+
+    cache_entry = None
+    if job.artifact_cache and dependencies_metadata is not None:
+        cache_entry = ArtifactCacheEntry(
+            job.script,
+            job.python_version,
+            nuitka_options,
+            dependencies_metadata,
+            isolated=job.isolated,
+        )
+        destination = (
+            job.script.parent
+            if build_directory is not None
+            else get_output_dir(job.script, nuitka_options)
+        )
+        restored = cache_entry.restore(destination)
+        if restored is not None:
+            log_path.write_text(
+                f"Restored {', '.join(path.name for path in restored)} from the "
+                f"artifact cache, fingerprint {cache_entry.fingerprint.digest}\n",
+                encoding="utf-8",
+            )
+            return BuildResult(
+                job=job,
+                exit_code=0,
+                duration=time.perf_counter() - start,
+                log_path=log_path,
+                command=command,
+                dependencies=dependencies,
+                artifacts=restored,
+                fingerprint=cache_entry.fingerprint.digest,
+                cached=True,
+            )
+    # File systems may store modification times coarser than time.time().
+    started_at = time.time() - 1
+    phases = PhaseTracker(title=job.script.name)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    with log_path.open("wb") as log_file:
+        if unresolved_imports:
+            # Reported before Nuitka starts, not minutes later when it fails.
+            warning = dependencies_metadata.describe_unresolved_imports() + "\n"
+            warning = warning.encode()
+            log_file.write(warning)
+            if on_output:
+                on_output(warning)
+        # Every build runs in its script's directory without touching our cwd.
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=job.script.parent,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            # A process group of its own, so a cancelled build can stop the C
+            # compiler processes as well.
+            start_new_session=os.name != "nt",
+        )
+        try:
+            while chunk := await process.stdout.read(65536):
+                log_file.write(chunk)
+                if on_output:
+                    on_output(chunk)
+                phases.feed(decoder.decode(chunk))
+            exit_code = await process.wait()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                _kill_process_group(process)
+                await process.wait()
+            raise
+
+    phases.feed(decoder.decode(b"", final=True))
+    phases.finish(exit_code)
+
+    artifacts = []
+    if build_directory is not None:
+        if exit_code == 0:
+            artifacts = build_directory.restore_outputs()
+    elif exit_code == 0:
+        artifacts = find_artifacts(job.script, nuitka_options, started_at)
+    if cache_entry is not None and exit_code == 0:
+        cache_entry.store(artifacts)
+
+    return BuildResult(
+        job=job,
+        exit_code=exit_code,
+        duration=time.perf_counter() - start,
+        log_path=log_path,
+        phases=phases,
+        trace_path=phases.write_chrome_trace(get_trace_path(job.script)),
+        command=command,
+        dependencies=dependencies,
+        artifacts=artifacts,
+        unresolved_imports=unresolved_imports,
+        fingerprint=cache_entry.fingerprint.digest if cache_entry else None,
+    )
+
+
+async def run_batch(
+    jobs: list[BuildJob], workers: int, on_event=None, on_output=None
+) -> list[BuildResult]:
+    """Run all jobs with at most ``workers`` builds in flight.
+
+    ``on_event`` is called with ("started", job) and ("finished", result),
+    ``on_output`` with the job and every chunk of its build output.
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run_job(job: BuildJob) -> BuildResult:
+        async with semaphore:
+            if on_event:
+                on_event("started", job)
+            result = await run_build(
+                job,
+                get_log_path(job.script),
+                (lambda chunk: on_output(job, chunk)) if on_output else None,
+            )
+            if on_event:
+                on_event("finished", result)
+            return result
+
+    return list(await asyncio.gather(*(run_job(job) for job in jobs)))
+
+
+def run_batch_cli(
+    scripts: list[Path],
+    nuitka_options: dict,
+    max_workers: int | None = None,
+    isolated: bool = False,
+    reuse_build: bool = False,
+    artifact_cache: bool = True,
+    benchmark: dict | None = None,
+) -> bool:
+    """Compile the scripts, printing a summary table once all builds ended.
+
+    With ``benchmark``, the keyword arguments of run_benchmark_cli(), every
+    successful build is benchmarked afterwards, one at a time.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    workers = get_worker_count(len(scripts), max_workers)
+
+    jobs = make_jobs(
+        scripts, nuitka_options, workers, isolated, reuse_build, artifact_cache
+    )
+
+    def on_event(kind: str, item) -> None:
+        if kind == "started":
+            console.print(f"[dim]Compiling[/dim] {item.script}")
+        elif item.cached:
+            console.print(
+                f"[green]✓[/green] {item.job.script} [dim](restored from the "
+                f"artifact cache in {item.duration:.1f}s)[/dim]"
+            )
+        elif item.success:
+            console.print(
+                f"[green]✓[/green] {item.job.script} [dim]({item.duration:.1f}s)[/dim]"
+            )
+            console.print(
+                f"  [dim]{item.phases.format_breakdown()}, trace {item.trace_path}[/dim]"
+            )
+        else:
+            console.print(
+                f"[red]✗[/red] {item.job.script} [dim]exit code {item.exit_code}, "
+                f"see {item.log_path}[/dim]"
+            )
+
+    for job in jobs:
+        metadata = parse_dependencies(job.script)
+        if metadata.unresolved_imports:
+            console.print(
+                f"[yellow]{job.script}[/yellow] "
+                f"{metadata.describe_unresolved_imports()}",
+                highlight=False,
+            )
+    console.print(
+        f"Compiling {len(jobs)} scripts with {workers} parallel "
+        f"build{'s' if workers != 1 else ''}..."
+    )
+    start = time.perf_counter()
+    results = asyncio.run(run_batch(jobs, workers, on_event))
+    total_duration = time.perf_counter() - start
+
+    table = Table(title="Tuitka batch summary")
+    table.add_column("Script")
+    table.add_column("Result")
+    table.add_column("Duration", justify="right")
+    table.add_column("Slowest phase")
+    table.add_column("Log")
+    for result in results:
+        slowest = result.phases.slowest_phase() if result.phases else None
+        table.add_row(
+            str(result.job.script),
+            "[green]cached[/green]"
+            if result.cached
+            else "[green]passed[/green]"
+            if result.success
+            else "[red]failed[/red]",
+            f"{result.duration:.1f}s",
+            f"{slowest.label} {slowest.duration:.1f}s" if slowest else "",
+            str(result.log_path),
+        )
+    console.print(table)
+
+    failed = sum(not result.success for result in results)
+    console.print(
+        f"{len(results) - failed} passed, {failed} failed "
+        f"in {total_duration:.1f}s (sum of builds "
+        f"{sum(result.duration for result in results):.1f}s)"
+    )
+    if benchmark is not None:
+        from tuitka.benchmark import run_benchmark_cli
+
+        for result in results:
+            if result.success:
+                run_benchmark_cli(
+                    result.job.script,
+                    result.artifacts,
+                    result.job.python_version,
+                    console=console,
+                    **benchmark,
+                )
+    return failed == 0
+
+
+__all__ = [
+    "BuildJob",
+    "BuildResult",
+    "get_worker_count",
+    "make_jobs",
+    "run_batch",
+    "run_batch_cli",
+    "run_build",
+]
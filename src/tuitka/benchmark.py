@@ -0,0 +1,548 @@
+import json
+import math
+import os
+import select
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from tuitka.cache import write_json_atomic
+from tuitka.constants import DEFAULT_BENCHMARK_RUNS
+from tuitka.resources import format_size
+
+REPORT_SUFFIX = ".benchmark.json"
+# Programs running longer are stopped, the run counts as failed.
+RUN_TIMEOUT = 600
+EXECUTABLE_SUFFIXES = (".bin", ".exe", "")
+# How often the memory of a running program is sampled where that is needed.
+# Growth in the last interval before it exits is missed.
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Two sided 95% quantiles of Student's t distribution for 1 to 30 degrees of
+# freedom, above that the normal distribution's 1.96 is close enough.
+_T_QUANTILES = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+
+
+@dataclass
+class Estimate:
+    """Mean of some samples, with the half width of its 95% confidence interval."""
+
+    mean: float
+    margin: float | None
+    samples: int
+
+    @classmethod
+    def from_samples(cls, values: list[float]) -> "Estimate | None":
+        if not values:
+            return None
+        if len(values) == 1:
+            return cls(values[0], None, 1)
+        degrees = len(values) - 1
+        quantile = _T_QUANTILES[degrees - 1] if degrees <= len(_T_QUANTILES) else 1.96
+        margin = quantile * statistics.stdev(values) / math.sqrt(len(values))
+        return cls(statistics.fmean(values), margin, len(values))
+
+    def format(self, unit: str) -> str:
+        def format_value(value: float) -> str:
+            if unit == "bytes":
+                return format_size(int(value))
+            return f"{value:.2f} s" if value >= 1 else f"{value * 1000:.1f} ms"
+
+        if self.margin is None:
+            return format_value(self.mean)
+        return f"{format_value(self.mean)} ± {format_value(self.margin)}"
+
+
+@dataclass
+class RunSample:
+    # Seconds until the first output, or the whole run if nothing was printed.
+    startup: float
+    wall: float
+    peak_rss: int | None
+    exit_code: int
+
+
+# Name, unit and label of every reported estimate.
+METRICS = (
+    ("cold_startup", "seconds", "Cold startup"),
+    ("warm_startup", "seconds", "Warm startup"),
+    ("wall", "seconds", "Wall time"),
+    ("peak_rss", "bytes", "Peak RSS"),
+)
+
+
+@dataclass
+class ProgramBenchmark:
+    command: list[str]
+    cold: list[RunSample] = field(default_factory=list)
+    warm: list[RunSample] = field(default_factory=list)
+
+    @property
+    def failed_runs(self) -> int:
+        return sum(sample.exit_code != 0 for sample in (*self.cold, *self.warm))
+
+    def estimates(self) -> dict[str, Estimate | None]:
+        return {
+            "cold_startup": Estimate.from_samples([run.startup for run in self.cold]),
+            "warm_startup": Estimate.from_samples([run.startup for run in self.warm]),
+            "wall": Estimate.from_samples([run.wall for run in self.warm]),
+            "peak_rss": Estimate.from_samples(
+                [run.peak_rss for run in self.warm if run.peak_rss is not None]
+            ),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "command": self.command,
+            "failed_runs": self.failed_runs,
+            "estimates": {
+                name: asdict(estimate) if estimate else None
+                for name, estimate in self.estimates().items()
+            },
+            "cold": [asdict(run) for run in self.cold],
+            "warm": [asdict(run) for run in self.warm],
+        }
+
+
+@dataclass
+class BenchmarkReport:
+    """The compiled program and its script under CPython, run alike."""
+
+    script: Path
+    executable: Path
+    python: Path
+    arguments: list[str]
+    runs: int
+    compiled: ProgramBenchmark
+    interpreted: ProgramBenchmark
+    # Whether cold runs read the programs' files from disk, which needs
+    # posix_fadvise. Elsewhere they only differ from warm runs in coming first.
+    cold_from_disk: bool
+    created: float = field(default_factory=time.time)
+    path: Path | None = None
+
+    @property
+    def speedup(self) -> float | None:
+        """How many times faster the compiled program ran, by mean wall time."""
+        compiled = self.compiled.estimates()["wall"]
+        interpreted = self.interpreted.estimates()["wall"]
+        if not compiled or not interpreted or not compiled.mean:
+            return None
+        return interpreted.mean / compiled.mean
+
+    def to_dict(self) -> dict:
+        return {
+            "script": str(self.script),
+            "executable": str(self.executable),
+            "python": str(self.python),
+            "arguments": self.arguments,
+            "runs": self.runs,
+            "cold_from_disk": self.cold_from_disk,
+            "created": self.created,
+            "speedup": self.speedup,
+            "compiled": self.compiled.to_dict(),
+            "interpreted": self.interpreted.to_dict(),
+        }
+
+    def make_table(self):
+        from rich.table import Table
+
+        table = Table(title=f"{self.executable.name} against CPython")
+        table.add_column("")
+        table.add_column("Compiled", justify="right")
+        table.add_column("CPython", justify="right")
+        table.add_column("Change", justify="right")
+        compiled = self.compiled.estimates()
+        interpreted = self.interpreted.estimates()
+        for name, unit, label in METRICS:
+            ours, theirs = compiled[name], interpreted[name]
+            change = ""
+            if ours and theirs and theirs.mean:
+                percent = (ours.mean - theirs.mean) / theirs.mean * 100
+                style = "green" if percent <= 0 else "red"
+                change = f"[{style}]{percent:+.0f}%[/{style}]"
+            table.add_row(
+                label,
+                ours.format(unit) if ours else "n/a",
+                theirs.format(unit) if theirs else "n/a",
+                change,
+            )
+
+        notes = [f"{self.runs} runs each, mean ± 95% confidence interval"]
+        if not self.cold_from_disk:
+            notes.append("cold runs could not bypass the page cache")
+        failed_runs = self.compiled.failed_runs + self.interpreted.failed_runs
+        if failed_runs:
+            notes.append(f"[red]{failed_runs} runs exited with an error[/red]")
+        if self.path is not None:
+            notes.append(f"saved to {self.path}")
+        table.caption = "\n".join(notes)
+        return table
+
+
+def find_executable(artifact: Path) -> Path | None:
+    """The program to run of a build artifact, if it is one."""
+    if artifact.suffix == ".app":
+        candidates = sorted((artifact / "Contents" / "MacOS").glob("*"))
+    elif artifact.suffix == ".dist":
+        candidates = sorted(artifact.iterdir())
+    else:
+        candidates = [artifact]
+    for candidate in candidates:
+        if (
+            candidate.suffix in EXECUTABLE_SUFFIXES
+            and candidate.is_file()
+            and os.access(candidate, os.X_OK)
+        ):
+            return candidate
+    return None
+
+
+def get_report_path(artifact: Path) -> Path:
+    return artifact.with_name(f"{artifact.name}{REPORT_SUFFIX}")
+
+
+def get_script_python(script: Path, python_version: str) -> Path:
+    """Interpreter of the script's build environment, with its dependencies."""
+    from tuitka.analysis import analyze_script
+    from tuitka.environments import (
+        ENVIRONMENT_MARKER,
+        ensure_environment,
+        get_environment_dir,
+        get_environment_python,
+        get_nuitka_requirement,
+    )
+
+    analysis = analyze_script(script)
+    requirements = [
+        *(analysis.dependencies if analysis else []),
+        get_nuitka_requirement(),
+    ]
+    environment_dir = get_environment_dir(requirements, python_version)
+    if not (environment_dir / ENVIRONMENT_MARKER).exists():
+        from tuitka.locks import ensure_lock, get_script_lock_path
+        from tuitka.wheelhouse import get_offline_wheelhouse
+
+        # Isolated builds leave no environment behind.
+        wheelhouse = get_offline_wheelhouse()
+        lock_path = ensure_lock(
+            get_script_lock_path(script, requirements, python_version),
+            requirements,
+            python_version,
+            wheelhouse=wheelhouse,
+        )
+        environment_dir = ensure_environment(
+            requirements, python_version, lock_path, wheelhouse
+        )
+    return get_environment_python(environment_dir)
+
+
+def drop_from_page_cache(paths: list[Path], sync: bool = True) -> bool:
+    """Make the next read of ``paths`` come from disk, where the OS allows it.
+
+    Without ``sync``, pages of the files not written back yet stay cached.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            # Pages not written back yet can not be dropped.
+            if sync:
+                os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return True
+
+
+def _get_program_files(executable: Path) -> list[Path]:
+    if executable.parent.suffix == ".dist" or executable.parent.name == "MacOS":
+        bundle = (
+            executable.parent
+            if executable.parent.suffix == ".dist"
+            else executable.parents[2]
+        )
+        return [path for path in bundle.rglob("*") if path.is_file()]
+    return [executable]
+
+
+_INTERPRETER_PATHS_CODE = """
+import json, os, sys, sysconfig
+paths = sysconfig.get_paths()
+roots = [os.path.realpath(sys.executable)]
+roots += [paths.get(name) for name in ("stdlib", "platstdlib", "purelib", "platlib")]
+library_dir = sysconfig.get_config_var("LIBDIR")
+library = sysconfig.get_config_var("LDLIBRARY")
+if library_dir and library:
+    roots.append(os.path.join(library_dir, library))
+print(json.dumps(roots))
+"""
+
+
+def _get_interpreter_files(python: Path) -> list[Path]:
+    """Files ``python`` may load: itself, libpython, stdlib and site-packages."""
+    try:
+        result = subprocess.run(
+            [str(python), "-c", _INTERPRETER_PATHS_CODE],
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        roots = json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return []
+    files = set()
+    for root in (Path(root) for root in roots if root):
+        if root.is_file():
+            files.add(root)
+        elif root.is_dir():
+            files.update(path for path in root.rglob("*") if path.is_file())
+    return sorted(files)
+
+
+def _get_script_files(script: Path) -> list[Path]:
+    from tuitka.analysis import analyze_script
+
+    analysis = analyze_script(script)
+    local_modules = analysis.local_modules if analysis else []
+    return [script, *map(Path, local_modules)]
+
+
+def _get_tree_peak_rss(pid: int) -> int:
+    """Summed peak RSS of a process and its descendants, as /proc tells it."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmHWM:"):
+                    total += int(line.split()[1]) * 1024
+            for children in Path(f"/proc/{current}/task").glob("*/children"):
+                pending.extend(map(int, children.read_text().split()))
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def measure_run(
+    command: list[str], cwd: Path, timeout: float = RUN_TIMEOUT
+) -> RunSample:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    first_output = None
+    peak_rss = None
+    # The peak memory wait4() reports on Linux includes what the process used
+    # before exec, that is a copy of tuitka itself, so /proc is sampled instead.
+    sample_rss = sys.platform == "linux"
+    fd = process.stdout.fileno()
+    try:
+        while True:
+            if sample_rss:
+                peak_rss = max(peak_rss or 0, _get_tree_peak_rss(process.pid))
+                if not select.select([fd], [], [], RSS_SAMPLE_INTERVAL)[0]:
+                    continue
+            if not os.read(fd, 65536):
+                break
+            if first_output is None:
+                first_output = time.perf_counter()
+    finally:
+        timer.cancel()
+        process.stdout.close()
+
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if not sample_rss:
+            # Includes the processes it waited for, like the program a onefile
+            # binary unpacks. Bytes on macOS, KiB elsewhere.
+            peak_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    else:
+        process.wait()
+    end = time.perf_counter()
+    return RunSample(
+        startup=(first_output or end) - start,
+        wall=end - start,
+        peak_rss=peak_rss or None,
+        exit_code=process.returncode,
+    )
+
+
+def run_benchmark(
+    script: Path,
+    executable: Path,
+    python: Path,
+    arguments: list[str] | None = None,
+    runs: int = DEFAULT_BENCHMARK_RUNS,
+    on_progress: Callable[[int, int], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> BenchmarkReport | None:
+    """Run ``executable`` and ``script`` under ``python`` ``runs`` times each.
+
+    Cold runs come first, each after dropping the files of both programs from
+    the page cache: the compiled program, and the script with the interpreter,
+    its standard library and site-packages. Warm runs follow after one
+    unmeasured run each. The two
+    programs take turns, so changing machine load affects both alike.
+    ``on_progress`` is called with the finished and total number of runs.
+    Returns None once ``should_stop`` is true.
+    """
+    script = Path(script).resolve()
+    executable = Path(executable).resolve()
+    arguments = list(arguments or [])
+    compiled = ProgramBenchmark([str(executable), *arguments])
+    interpreted = ProgramBenchmark([str(python), str(script), *arguments])
+    programs = (compiled, interpreted)
+    # Dropping only a program's own files would leave the other's shared ones,
+    # like libpython of a non-standalone build, warm.
+    cold_files = [*_get_program_files(executable), *_get_script_files(script)]
+    # Thousands of files that were not just written, syncing them is slow.
+    interpreter_files = _get_interpreter_files(python)
+    total = 2 * (2 * runs + 1)
+    done = 0
+    cold_from_disk = True
+
+    def measure(benchmark: ProgramBenchmark) -> RunSample | None:
+        nonlocal done
+        if should_stop is not None and should_stop():
+            return None
+        sample = measure_run(benchmark.command, script.parent)
+        done += 1
+        if on_progress is not None:
+            on_progress(done, total)
+        return sample
+
+    for _ in range(runs):
+        for benchmark in programs:
+            cold_from_disk = (
+                drop_from_page_cache(cold_files)
+                and drop_from_page_cache(interpreter_files, sync=False)
+                and cold_from_disk
+            )
+            if (sample := measure(benchmark)) is None:
+                return None
+            benchmark.cold.append(sample)
+    for benchmark in programs:
+        if measure(benchmark) is None:
+            return None
+    for _ in range(runs):
+        for benchmark in programs:
+            if (sample := measure(benchmark)) is None:
+                return None
+            benchmark.warm.append(sample)
+
+    return BenchmarkReport(
+        script=script,
+        executable=executable,
+        python=python,
+        arguments=arguments,
+        runs=runs,
+        compiled=compiled,
+        interpreted=interpreted,
+        cold_from_disk=cold_from_disk,
+    )
+
+
+def benchmark_build(
+    script: Path,
+    artifacts: list[Path],
+    python_version: str,
+    arguments: list[str] | None = None,
+    runs: int = DEFAULT_BENCHMARK_RUNS,
+    on_progress: Callable[[int, int], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> BenchmarkReport | None:
+    """Benchmark the program a build produced and save the report next to it.
+
+    Returns None if the build produced no program to run, or once stopped.
+    """
+    for artifact in artifacts:
+        if (executable := find_executable(artifact)) is not None:
+            break
+    else:
+        return None
+
+    report = run_benchmark(
+        script,
+        executable,
+        get_script_python(script, python_version),
+        arguments,
+        runs,
+        on_progress,
+        should_stop,
+    )
+    if report is not None:
+        report.path = get_report_path(artifact)
+        try:
+            write_json_atomic(report.path, report.to_dict())
+        except OSError:
+            report.path = None
+    return report
+
+
+def run_benchmark_cli(
+    script: Path,
+    artifacts: list[Path],
+    python_version: str,
+    arguments: list[str] | None = None,
+    runs: int = DEFAULT_BENCHMARK_RUNS,
+    console=None,
+) -> BenchmarkReport | None:
+    from rich.console import Console
+
+    console = console or Console()
+    with console.status(f"Benchmarking {script.name} against CPython...") as status:
+        report = benchmark_build(
+            script,
+            artifacts,
+            python_version,
+            arguments,
+            runs,
+            lambda done, total: status.update(
+                f"Benchmarking {script.name} against CPython, run {done}/{total}..."
+            ),
+        )
+    if report is None:
+        console.print(f"[dim]{script.name} produced no program to benchmark.[/dim]")
+    else:
+        console.print(report.make_table())
+    return report
+
+
+__all__ = [
+    "BenchmarkReport",
+    "Estimate",
+    "ProgramBenchmark",
+    "RunSample",
+    "benchmark_build",
+    "drop_from_page_cache",
+    "find_executable",
+    "get_report_path",
+    "get_script_python",
+    "measure_run",
+    "run_benchmark",
+    "run_benchmark_cli",
+]
@@ -0,0 +1,278 @@
+import importlib.metadata
+import re
+import sys
+import sysconfig
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.environments import (
+    get_environment_dir,
+    get_environment_site_packages,
+    get_nuitka_requirement,
+    normalize_requirement,
+)
+from tuitka.resources import format_size
+
+# Rough rules of thumb for Nuitka's output: the generated C code of a MiB of
+# Python source takes about this long to compile on one CPU, and the compiled
+# code ends up about this much larger than the source.
+COMPILE_SECONDS_PER_SOURCE_MIB = 60
+BINARY_BYTES_PER_SOURCE_BYTE = 1.5
+
+# Subpackages holding the test suites of a package, its code never imports them.
+TEST_PACKAGE_NAMES = frozenset({"tests", "test"})
+
+# Heavy packages Nuitka's anti-bloat plugin keeps out with "nofollow", with the
+# top level import names each option covers.
+ANTI_BLOAT_MODES = (
+    ("--noinclude-setuptools-mode", "setuptools", ("setuptools", "setuptools_scm")),
+    ("--noinclude-pytest-mode", "pytest", ("pytest", "_pytest", "py", "nose")),
+    ("--noinclude-unittest-mode", "unittest", ("unittest", "doctest")),
+    ("--noinclude-pydoc-mode", "pydoc", ("pydoc", "pydoc_data")),
+    ("--noinclude-IPython-mode", "IPython", ("IPython", "ipykernel", "ipywidgets")),
+    ("--noinclude-dask-mode", "dask", ("dask", "distributed")),
+    ("--noinclude-numba-mode", "numba", ("numba",)),
+)
+
+_EXTRA_MARKER = re.compile(r"\bextra\s*==")
+
+
+@dataclass
+class BloatRecommendation:
+    """Nuitka options keeping modules the program does not use out of the build."""
+
+    title: str
+    options: dict[str, str]
+    modules: list[str] = field(default_factory=list)
+    # Python source compiled to C, and everything else (data files, DLLs).
+    source_bytes: int = 0
+    other_bytes: int = 0
+
+    @property
+    def size(self) -> int:
+        return self.source_bytes + self.other_bytes
+
+    def estimate_seconds(self, jobs: int = 1) -> float:
+        mib = self.source_bytes / 1024**2
+        return mib * COMPILE_SECONDS_PER_SOURCE_MIB / max(1, jobs)
+
+    def estimate_binary_bytes(self) -> int:
+        return int(self.source_bytes * BINARY_BYTES_PER_SOURCE_BYTE) + self.other_bytes
+
+    def describe(self, jobs: int = 1) -> str:
+        options = " ".join(f"{flag}={value}" for flag, value in self.options.items())
+        return (
+            f"{self.title}: {format_size(self.size)} in {len(self.modules)} "
+            f"module{'s' if len(self.modules) != 1 else ''}, about "
+            f"{self.estimate_seconds(jobs):.0f} s of compilation and "
+            f"{format_size(self.estimate_binary_bytes())} of program saved "
+            f"with {options}"
+        )
+
+
+def find_distributions(requirements: list[str], python_version: str) -> list:
+    """Installed distributions of the build environment, or else of this Python."""
+    environment_dir = get_environment_dir(
+        [*requirements, get_nuitka_requirement()], python_version
+    )
+    site_packages = get_environment_site_packages(environment_dir)
+    if site_packages is not None:
+        return list(importlib.metadata.distributions(path=[str(site_packages)]))
+    return list(importlib.metadata.distributions())
+
+
+def get_dependency_closure(requirements: list[str], distributions: list) -> list:
+    """Distributions ``requirements`` pull in, following their requirements."""
+    by_name = {}
+    for distribution in distributions:
+        name = distribution.metadata["Name"]
+        if name:
+            by_name.setdefault(normalize_requirement(name), distribution)
+
+    closure = {}
+    pending = [normalize_requirement(requirement) for requirement in requirements]
+    while pending:
+        name = re.split(r"[\s\[<>=!~;(]", pending.pop(), maxsplit=1)[0]
+        distribution = by_name.get(name)
+        if distribution is None or name in closure:
+            continue
+        closure[name] = distribution
+        for requirement in distribution.requires or []:
+            # Optional extras are not installed just because a package is.
+            if not _EXTRA_MARKER.search(requirement):
+                pending.append(normalize_requirement(requirement))
+    return [closure[name] for name in sorted(closure)]
+
+
+def _module_name(parts: tuple[str, ...]) -> str:
+    parts = list(parts)
+    parts[-1] = parts[-1].split(".", 1)[0]
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _is_module_file(file) -> bool:
+    """Files below an importable top level, not metadata or installed scripts."""
+    return bool(file.parts) and not (
+        file.parts[0] == ".." or file.parts[0].endswith((".dist-info", ".data"))
+    )
+
+
+def _get_file_size(distribution, file) -> int:
+    if file.size is not None:
+        return file.size
+    try:
+        return Path(distribution.locate_file(file)).stat().st_size
+    except OSError:
+        return 0
+
+
+def _add_file(recommendation: BloatRecommendation, path, size: int) -> None:
+    if path.suffix == ".py":
+        recommendation.source_bytes += size
+    elif path.suffix != ".pyc":
+        recommendation.other_bytes += size
+
+
+def get_stdlib_files(import_names: tuple[str, ...]):
+    """(path, size) of the standard library modules ``import_names``."""
+    stdlib = Path(sysconfig.get_paths()["stdlib"])
+    for name in import_names:
+        module = stdlib / f"{name}.py"
+        if module.is_file():
+            yield Path(f"{name}.py"), module.stat().st_size
+        package = stdlib / name
+        if package.is_dir():
+            for path in package.rglob("*"):
+                if path.is_file() and "__pycache__" not in path.parts:
+                    yield path.relative_to(stdlib), path.stat().st_size
+
+
+def find_bloat(
+    project_imports: list[str],
+    local_modules: list[Path],
+    distributions: list,
+    min_size: int = 256 * 1024,
+) -> list[BloatRecommendation]:
+    """Recommend exclusions for heavy modules the project does not use itself.
+
+    ``distributions`` are the ones the project pulls in, modules the project
+    imports directly are never recommended.
+    """
+    imported = set(project_imports)
+    recommendations = []
+
+    # Test suites shipped inside packages, unless the project has its own.
+    local_tests = any(
+        path.parent.name in TEST_PACKAGE_NAMES or path.stem in TEST_PACKAGE_NAMES
+        for path in local_modules
+    )
+    files_by_import = {}
+    for distribution in distributions:
+        for file in distribution.files or []:
+            if _is_module_file(file):
+                top_level = file.parts[0].split(".", 1)[0]
+                files_by_import.setdefault(top_level, []).append(
+                    (file, _get_file_size(distribution, file))
+                )
+
+    if not local_tests:
+        tests = BloatRecommendation("Test suites of dependencies", {})
+        modules, names = set(), set()
+        for files in files_by_import.values():
+            for path, size in files:
+                # Top level "tests" packages are never imported by anything.
+                index = next(
+                    (
+                        index
+                        for index, part in enumerate(path.parts[1:-1], 1)
+                        if part in TEST_PACKAGE_NAMES
+                    ),
+                    None,
+                )
+                if index is not None:
+                    names.add(path.parts[index])
+                    modules.add(".".join(path.parts[: index + 1]))
+                    _add_file(tests, path, size)
+        if names:
+            tests.modules = sorted(modules)
+            tests.options["--nofollow-import-to"] = ",".join(
+                f"*.{name}" for name in sorted(names)
+            )
+            recommendations.append(tests)
+
+    for flag, title, import_names in ANTI_BLOAT_MODES:
+        if imported.intersection(import_names):
+            continue
+        recommendation = BloatRecommendation(title, {flag: "nofollow"})
+        modules = set()
+        if any(name in sys.stdlib_module_names for name in import_names):
+            files = list(get_stdlib_files(import_names))
+        else:
+            files = [
+                item for name in import_names for item in files_by_import.get(name, [])
+            ]
+        for path, size in files:
+            # Test suites are accounted for above.
+            if TEST_PACKAGE_NAMES.intersection(path.parts[1:-1]):
+                continue
+            if path.suffix == ".py":
+                modules.add(_module_name(path.parts))
+            _add_file(recommendation, path, size)
+        recommendation.modules = sorted(modules)
+        if recommendation.modules:
+            recommendations.append(recommendation)
+
+    recommendations = [item for item in recommendations if item.size >= min_size]
+    return sorted(recommendations, key=lambda item: item.size, reverse=True)
+
+
+def analyze_bloat(script: Path, python_version: str) -> list[BloatRecommendation]:
+    """Anti-bloat recommendations for compiling ``script``."""
+    from tuitka.analysis import analyze_script
+    from tuitka.utils import DependencyParser
+
+    analysis = analyze_script(script)
+    if analysis is not None:
+        metadata = analysis.to_metadata()
+        imports = analysis.imports
+    else:
+        parser = DependencyParser(script)
+        metadata = parser.parse()
+        imports = parser.imports
+    distributions = get_dependency_closure(
+        metadata.dependencies,
+        find_distributions(metadata.dependencies, python_version),
+    )
+    return find_bloat(imports, metadata.local_modules, distributions)
+
+
+def apply_recommendations(
+    nuitka_options: dict, recommendations: list[BloatRecommendation]
+) -> dict:
+    """``nuitka_options`` with the recommended options added to them."""
+    options = dict(nuitka_options)
+    for recommendation in recommendations:
+        for flag, value in recommendation.options.items():
+            current = options.get(flag)
+            if flag == "--nofollow-import-to" and isinstance(current, str) and current:
+                patterns = current.split(",")
+                patterns.extend(
+                    pattern for pattern in value.split(",") if pattern not in patterns
+                )
+                options[flag] = ",".join(patterns)
+            elif not current:
+                options[flag] = value
+    return options
+
+
+__all__ = [
+    "ANTI_BLOAT_MODES",
+    "BloatRecommendation",
+    "analyze_bloat",
+    "apply_recommendations",
+    "find_bloat",
+    "find_distributions",
+    "get_dependency_closure",
+]
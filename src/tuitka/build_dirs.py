@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.cache import (
+    acquire_lock,
+    evict_least_recently_used,
+    get_cache_dir,
+    get_cache_size_limit,
+    get_directory_size,
+    read_json,
+    release_lock,
+    write_json_atomic,
+)
+
+BUILD_MARKER = "tuitka-build.json"
+BUILD_CACHE_SIZE_VARIABLE = "TUITKA_BUILD_CACHE_SIZE"
+DEFAULT_BUILD_CACHE_SIZE = 5 * 1024**3
+
+# Options that only decide where outputs go, the build itself is the same.
+_LOCATION_OPTIONS = {"--output-dir", "--remove-output"}
+
+
+def get_build_key(script_path: Path, python_version: str, nuitka_options: dict) -> str:
+    options = sorted(
+        (flag, value)
+        for flag, value in nuitka_options.items()
+        if flag not in _LOCATION_OPTIONS and value is not None
+    )
+    payload = json.dumps(
+        [str(script_path.resolve()), python_version, options],
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class BuildDirectory:
+    """A build directory kept between builds so Nuitka can reuse prior outputs.
+
+    It is locked from ``for_build`` until ``release``, so neither a build of the
+    same script nor the quota of another build touches it in between.
+    """
+
+    path: Path
+    script_path: Path
+    released: bool = field(default=False, compare=False)
+
+    @classmethod
+    def for_build(
+        cls, script_path: Path, python_version: str, nuitka_options: dict
+    ) -> "BuildDirectory":
+        key = get_build_key(script_path, python_version, nuitka_options)
+        path = get_cache_dir("builds") / f"{script_path.stem}-{key}"
+        acquire_lock(path)
+        path.mkdir(parents=True, exist_ok=True)
+        os.utime(path)
+        return cls(path=path, script_path=script_path)
+
+    def apply(self, nuitka_options: dict) -> dict:
+        """Redirect the build into this directory and keep its build folder."""
+        options = dict(nuitka_options)
+        options.pop("--remove-output", None)
+        options["--output-dir"] = str(self.path)
+        return options
+
+    def restore_outputs(self) -> list[Path]:
+        """Copy the finished program next to the script, as a normal build would."""
+        destination = self.script_path.parent
+        files = [
+            entry
+            for entry in self.path.iterdir()
+            if entry.is_file() and entry.name != BUILD_MARKER
+        ]
+        file_stems = {entry.name.split(".")[0] for entry in files}
+
+        restored = []
+        for entry in self.path.iterdir():
+            target = destination / entry.name
+            if entry in files:
+                shutil.copy2(entry, target)
+            elif entry.suffix == ".app" or (
+                # Onefile builds leave their dist folder behind as well.
+                entry.suffix == ".dist" and entry.stem not in file_stems
+            ):
+                shutil.copytree(entry, target, symlinks=True, dirs_exist_ok=True)
+            else:
+                continue
+            restored.append(target)
+        return restored
+
+    def release(self) -> None:
+        """Record the directory size, unlock it and enforce the cache quota."""
+        if self.released:
+            return
+        self.released = True
+        try:
+            write_json_atomic(
+                self.path / BUILD_MARKER,
+                {
+                    "script": str(self.script_path),
+                    "last_used": time.time(),
+                    "size": get_directory_size(self.path),
+                },
+            )
+        finally:
+            release_lock(self.path)
+        prune_build_dirs(keep=self.path)
+
+
+def prune_build_dirs(keep: Path | None = None) -> list[Path]:
+    """Evict the least recently used build directories beyond the quota."""
+    entries = {}
+    for path in get_cache_dir("builds").iterdir():
+        # Locks of build directories live next to them.
+        if not path.is_dir() or path.suffix == ".lock":
+            continue
+        # for_build() touches the directory when a build starts using it.
+        last_used = path.stat().st_mtime
+        marker = read_json(path / BUILD_MARKER)
+        if marker:
+            last_used = max(last_used, marker.get("last_used", 0))
+            entries[path] = (last_used, marker.get("size", 0))
+        else:
+            entries[path] = (last_used, get_directory_size(path))
+    max_bytes = get_cache_size_limit(
+        BUILD_CACHE_SIZE_VARIABLE, DEFAULT_BUILD_CACHE_SIZE
+    )
+    return evict_least_recently_used(entries, max_bytes, keep={keep})
+
+
+__all__ = [
+    "BuildDirectory",
+    "get_build_key",
+    "prune_build_dirs",
+]
@@ -0,0 +1,177 @@
+import hashlib
+import re
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from tuitka.cache import get_cache_dir
+
+# CSI sequences (colors, cursor movement), OSC sequences (titles, links) and
+# two character escapes, as written by Nuitka and uv into a terminal.
+_ANSI_ESCAPE = re.compile(
+    r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])"
+)
+
+
+def strip_ansi(text: str) -> str:
+    return _ANSI_ESCAPE.sub("", text)
+
+
+class LineSplitter:
+    """Turn chunks of terminal output into complete, plain text lines.
+
+    Chunks may end in the middle of a line or an escape sequence, so the
+    unfinished rest is kept until the next chunk. Progress bars redraw their
+    line after a carriage return, only the final state of such a line is kept.
+    """
+
+    def __init__(self) -> None:
+        self.pending = ""
+
+    def feed(self, data: str) -> list[str]:
+        self.pending += data
+        *lines, self.pending = self.pending.split("\n")
+        return [self._clean(line) for line in lines]
+
+    def flush(self) -> list[str]:
+        line, self.pending = self.pending, ""
+        return [self._clean(line)] if line else []
+
+    @staticmethod
+    def _clean(line: str) -> str:
+        line = line.rstrip("\r")
+        return strip_ansi(line.rsplit("\r", 1)[-1])
+
+
+# Lines kept in memory, everything else is only on disk.
+RECENT_LINES = 2000
+# Every this many lines the file offset is remembered, to read lines back.
+CHECKPOINT_LINES = 1024
+# Index entries kept per kind, later ones are only counted.
+MAX_INDEXED_LINES = 500
+
+_ERROR_LINE = re.compile(
+    r"^([\w-]+:)?(FATAL|ERROR):"
+    r"|^(error|fatal error): "
+    r"|^× "
+    r"|^Traceback \(most recent call last\):"
+    r"|: (fatal )?error: "
+)
+_WARNING_LINE = re.compile(r"^([\w-]+:)?WARNING:|^warning: |: warning: ")
+
+
+def get_log_path(script: Path) -> Path:
+    script_hash = hashlib.sha256(str(script.resolve()).encode("utf-8")).hexdigest()
+    return get_cache_dir("logs") / f"{script.stem}-{script_hash[:12]}.log"
+
+
+def classify_line(line: str) -> str | None:
+    """Kind of a build output line: "error", "warning" or None."""
+    line = line.lstrip()
+    if _ERROR_LINE.search(line):
+        return "error"
+    if _WARNING_LINE.search(line):
+        return "warning"
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class LogEntry:
+    line_number: int
+    kind: str
+    text: str
+
+
+class BuildLog:
+    """Tee build output to a file, keeping only recent lines in memory.
+
+    Warnings and errors are indexed as lines arrive, so the first failure of a
+    long build can be found without scanning or holding the whole output.
+    """
+
+    def __init__(self, path: Path, recent_lines: int = RECENT_LINES) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = path.open("wb")
+        self.splitter = LineSplitter()
+        self.recent_lines: deque[str] = deque(maxlen=recent_lines)
+        self.line_count = 0
+        self.offset = 0
+        self.checkpoints = [0]
+        self.entries: dict[str, list[LogEntry]] = {"error": [], "warning": []}
+        self.counts = {"error": 0, "warning": 0}
+
+    def feed(self, data: str) -> None:
+        for line in self.splitter.feed(data):
+            self.add_line(line)
+
+    def add_line(self, line: str) -> None:
+        kind = classify_line(line)
+        if kind is not None:
+            self.counts[kind] += 1
+            if len(self.entries[kind]) < MAX_INDEXED_LINES:
+                self.entries[kind].append(LogEntry(self.line_count, kind, line))
+
+        data = line.encode("utf-8", errors="replace") + b"\n"
+        self.file.write(data)
+        self.offset += len(data)
+        self.line_count += 1
+        if self.line_count % CHECKPOINT_LINES == 0:
+            self.checkpoints.append(self.offset)
+        self.recent_lines.append(line)
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        for line in self.splitter.flush():
+            self.add_line(line)
+        self.file.close()
+
+    @property
+    def error_count(self) -> int:
+        return self.counts["error"]
+
+    @property
+    def warning_count(self) -> int:
+        return self.counts["warning"]
+
+    @property
+    def first_error(self) -> LogEntry | None:
+        return self.entries["error"][0] if self.entries["error"] else None
+
+    def read_lines(self, start: int, count: int) -> list[str]:
+        """Lines ``start`` to ``start + count`` of the log, read back from disk."""
+        start = max(0, start)
+        if start >= self.line_count - len(self.recent_lines):
+            first_recent = self.line_count - len(self.recent_lines)
+            return list(self.recent_lines)[start - first_recent :][:count]
+
+        if not self.file.closed:
+            self.file.flush()
+        checkpoint = start // CHECKPOINT_LINES
+        lines = []
+        with self.path.open("rb") as log_file:
+            log_file.seek(self.checkpoints[checkpoint])
+            for line_number, data in enumerate(log_file, checkpoint * CHECKPOINT_LINES):
+                if line_number >= start + count:
+                    break
+                if line_number >= start:
+                    lines.append(data.decode("utf-8", errors="replace").rstrip("\n"))
+        return lines
+
+    def format_counts(self) -> str:
+        parts = []
+        for kind in ("error", "warning"):
+            count = self.counts[kind]
+            parts.append(f"{count} {kind}{'s' if count != 1 else ''}")
+        return ", ".join(parts)
+
+
+__all__ = [
+    "BuildLog",
+    "LineSplitter",
+    "LogEntry",
+    "classify_line",
+    "get_log_path",
+    "strip_ansi",
+]
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.build_output import LineSplitter
+from tuitka.cache import get_cache_dir, write_json_atomic
+
+# Build phases in the order they run, with the output lines starting them.
+# A phase may be skipped, e.g. the dependency install with a reused environment
+# or the resolution with an existing lock file.
+BUILD_PHASES = [
+    ("environment", "Environment setup", None),
+    (
+        "resolution",
+        "Dependency resolution",
+        re.compile(r"^Resolving dependencies into "),
+    ),
+    (
+        "dependencies",
+        "Dependency install",
+        re.compile(r"^(Using Python .* environment at|Resolved \d+ packages?)"),
+    ),
+    ("python", "Python compilation", re.compile(r"^Nuitka(-Options)?: ")),
+    ("c-source", "C code generation", re.compile(r"^Nuitka: Generating source code")),
+    ("c-compile", "C compilation", re.compile(r"^Nuitka: Running C compilation")),
+    ("link", "Linking", re.compile(r"^Nuitka-Scons: Backend (C )?linking")),
+    (
+        "onefile",
+        "Onefile packing",
+        re.compile(r"^(Nuitka-Postprocessing: Creating single file|Nuitka-Onefile: )"),
+    ),
+]
+
+_WARNING_LINE = re.compile(r"^[\w-]+:WARNING: ")
+
+
+@dataclass
+class BuildPhase:
+    name: str
+    label: str
+    start: float
+    end: float | None = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+
+@dataclass
+class PhaseTracker:
+    """Timestamp build phases from the output lines of a build.
+
+    Phases only move forward, so a line that looks like an earlier phase, such
+    as the onefile bootstrap compilation using Scons again, is ignored.
+    """
+
+    title: str = "build"
+    clock: Callable[[], float] = time.perf_counter
+    phases: list[BuildPhase] = field(default_factory=list)
+    warnings: list[tuple[float, str]] = field(default_factory=list)
+    exit_code: int | None = None
+
+    def __post_init__(self) -> None:
+        self.started_at = self.clock()
+        self.wall_started_at = time.time()
+        self.splitter = LineSplitter()
+        self.phase_index = 0
+        name, label, _ = BUILD_PHASES[0]
+        self.phases.append(BuildPhase(name, label, 0.0))
+
+    def now(self) -> float:
+        return self.clock() - self.started_at
+
+    def feed(self, data: str) -> None:
+        """Feed a chunk of raw terminal output."""
+        for line in self.splitter.feed(data):
+            self.feed_line(line)
+
+    def feed_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        if _WARNING_LINE.match(line):
+            self.warnings.append((self.now(), line))
+            return
+        # The furthest phase wins, "Nuitka:" alone only starts the Python one.
+        for index in reversed(range(self.phase_index + 1, len(BUILD_PHASES))):
+            name, label, pattern = BUILD_PHASES[index]
+            if pattern.match(line):
+                self._start_phase(index, name, label)
+                return
+
+    def _start_phase(self, index: int, name: str, label: str) -> None:
+        now = self.now()
+        self.phases[-1].end = now
+        self.phases.append(BuildPhase(name, label, now))
+        self.phase_index = index
+
+    def finish(self, exit_code: int | None = None) -> None:
+        for line in self.splitter.flush():
+            self.feed_line(line)
+        if self.phases[-1].end is None:
+            self.phases[-1].end = self.now()
+        self.exit_code = exit_code
+
+    @property
+    def duration(self) -> float:
+        return self.phases[-1].end or self.now()
+
+    def slowest_phase(self) -> BuildPhase:
+        return max(self.phases, key=lambda phase: phase.duration)
+
+    def format_breakdown(self, separator: str = " · ") -> str:
+        return separator.join(
+            f"{phase.label} {phase.duration:.1f}s" for phase in self.phases
+        )
+
+    def to_chrome_trace(self) -> dict:
+        """Trace event format, as loaded by Perfetto and chrome://tracing."""
+        pid = os.getpid()
+        base = self.wall_started_at * 1_000_000
+
+        def microseconds(seconds: float) -> int:
+            return round(seconds * 1_000_000)
+
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "tuitka"}},
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 1,
+                "args": {"name": self.title},
+            },
+            {
+                "name": self.title,
+                "cat": "build",
+                "ph": "X",
+                "ts": round(base),
+                "dur": microseconds(self.duration),
+                "pid": pid,
+                "tid": 1,
+                "args": {"exit_code": self.exit_code},
+            },
+        ]
+        for phase in self.phases:
+            events.append(
+                {
+                    "name": phase.label,
+                    "cat": phase.name,
+                    "ph": "X",
+                    "ts": round(base) + microseconds(phase.start),
+                    "dur": microseconds(phase.duration),
+                    "pid": pid,
+                    "tid": 1,
+                }
+            )
+        for timestamp, line in self.warnings:
+            events.append(
+                {
+                    "name": line,
+                    "cat": "warning",
+                    "ph": "i",
+                    "s": "t",
+                    "ts": round(base) + microseconds(timestamp),
+                    "pid": pid,
+                    "tid": 1,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> Path | None:
+        try:
+            write_json_atomic(path, self.to_chrome_trace())
+        except OSError:
+            return None
+        return path
+
+
+def get_trace_path(script: Path) -> Path:
+    script_hash = hashlib.sha256(str(script.resolve()).encode("utf-8")).hexdigest()
+    return get_cache_dir("traces") / f"{script.stem}-{script_hash[:12]}.json"
+
+
+__all__ = [
+    "BUILD_PHASES",
+    "BuildPhase",
+    "PhaseTracker",
+    "get_trace_path",
+]
@@ -0,0 +1,112 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from tuitka.batch import BuildJob
+
+QUEUED = "queued"
+RUNNING = "running"
+PASSED = "passed"
+FAILED = "failed"
+CACHED = "cached"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = frozenset({PASSED, FAILED, CACHED, CANCELLED})
+
+
+@dataclass
+class QueueEntry:
+    id: int
+    job: BuildJob
+    # Preset the job was queued with, shown next to the script.
+    label: str = ""
+    state: str = QUEUED
+    exit_code: int | None = None
+    started: float | None = None
+    finished: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+
+class BuildQueue:
+    """Builds waiting for, or holding, one of ``concurrency`` build slots.
+
+    Builds start in the order they were queued. Two builds of the same script
+    never run at once, as they would write the same output files.
+    """
+
+    def __init__(self, concurrency: int = 1) -> None:
+        self.concurrency = max(1, concurrency)
+        self.entries: list[QueueEntry] = []
+        self.next_id = 1
+
+    def add(self, job: BuildJob, label: str = "") -> QueueEntry:
+        entry = QueueEntry(self.next_id, job, label)
+        self.next_id += 1
+        self.entries.append(entry)
+        return entry
+
+    def get(self, entry_id: int) -> QueueEntry | None:
+        return next((entry for entry in self.entries if entry.id == entry_id), None)
+
+    def in_state(self, *states: str) -> list[QueueEntry]:
+        return [entry for entry in self.entries if entry.state in states]
+
+    def take_ready(self, can_start=None) -> list[QueueEntry]:
+        """Mark as running, and return, the queued builds that may start now.
+
+        ``can_start`` may hold back builds that are not ready to start yet.
+        """
+        running = self.in_state(RUNNING)
+        busy_scripts: set[Path] = {entry.job.script for entry in running}
+        ready = []
+        for entry in self.in_state(QUEUED):
+            if len(running) + len(ready) >= self.concurrency:
+                break
+            if entry.job.script in busy_scripts:
+                continue
+            if can_start is not None and not can_start(entry):
+                continue
+            busy_scripts.add(entry.job.script)
+            entry.state = RUNNING
+            entry.started = time.perf_counter()
+            ready.append(entry)
+        return ready
+
+    def finish(self, entry: QueueEntry, state: str, exit_code: int | None) -> None:
+        entry.state = state
+        entry.exit_code = exit_code
+        entry.finished = time.perf_counter()
+        if entry.started is None:
+            entry.started = entry.finished
+
+    def format_counts(self) -> str:
+        counts = [
+            (len(self.in_state(RUNNING)), "running"),
+            (len(self.in_state(QUEUED)), "queued"),
+            (len(self.in_state(PASSED, CACHED)), "passed"),
+            (len(self.in_state(FAILED)), "failed"),
+            (len(self.in_state(CANCELLED)), "cancelled"),
+        ]
+        return ", ".join(f"{count} {name}" for count, name in counts if count)
+
+
+__all__ = [
+    "CACHED",
+    "CANCELLED",
+    "FAILED",
+    "FINISHED_STATES",
+    "PASSED",
+    "QUEUED",
+    "RUNNING",
+    "BuildQueue",
+    "QueueEntry",
+]
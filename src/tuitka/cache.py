@@ -0,0 +1,288 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Locks of an unknown owner older than this belong to a process that died
+# without cleaning up.
+STALE_LOCK_SECONDS = 3 * 60 * 60
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory below tuitka's per-user cache root."""
+    override = os.environ.get("TUITKA_CACHE_DIR")
+    if override:
+        base = Path(override)
+    elif sys.platform == "win32":
+        local_app_data = os.environ.get("LOCALAPPDATA")
+        base = Path(local_app_data) if local_app_data else Path.home() / "AppData/Local"
+        base = base / "tuitka" / "Cache"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches" / "tuitka"
+    else:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+        base = base / "tuitka"
+
+    path = base.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_json(path: Path):
+    """Read a cache file, returning None if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write a cache file so concurrent readers never see partial content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            json.dump(data, temp_file, separators=(",", ":"))
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def get_cache_size_limit(env_var: str, default_bytes: int) -> int:
+    """Size limit in bytes, configurable in GiB through an environment variable."""
+    value = os.environ.get(env_var)
+    if value:
+        try:
+            return int(float(value) * 1024**3)
+        except ValueError:
+            pass
+    return default_bytes
+
+
+def get_directory_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def remove_path(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def evict_least_recently_used(
+    entries: dict[Path, tuple[float, int]], max_bytes: int, keep=()
+) -> list[Path]:
+    """Remove entries, oldest first, until their total size fits ``max_bytes``.
+
+    ``entries`` maps each cache entry to its (last use timestamp, size in bytes).
+    Entries listed in ``keep``, locked or leased entries are never removed.
+    """
+    total = sum(size for _, size in entries.values())
+    removed = []
+    for path, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+        if total <= max_bytes:
+            break
+        if path in keep or is_locked(path) or is_leased(path):
+            continue
+        remove_path(path)
+        removed.append(path)
+        total -= size
+    return removed
+
+
+def prune_cache_files(
+    directory: Path, max_bytes: int, keep: Path | None = None
+) -> list[Path]:
+    """Evict the least recently written JSON files of a cache directory."""
+    entries = {}
+    for path in directory.glob("*.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries[path] = (stat.st_mtime, stat.st_size)
+    return evict_least_recently_used(entries, max_bytes, keep={keep})
+
+
+def _get_lock_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.lock")
+
+
+_LOCK_OWNER = "owner"
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_INVALID_PARAMETER = 87
+_STILL_ACTIVE = 259
+
+
+def is_locked(path: Path) -> bool:
+    return _get_lock_path(path).exists()
+
+
+def _is_process_running(pid: int) -> bool:
+    if os.name == "nt":
+        # Signal 0 would kill the process on Windows, query it instead.
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.OpenProcess.restype = ctypes.c_void_p
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return ctypes.get_last_error() != _ERROR_INVALID_PARAMETER
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(
+                ctypes.c_void_p(handle), ctypes.byref(exit_code)
+            ):
+                return True
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(ctypes.c_void_p(handle))
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _is_owner_gone(owner: int | None, path: Path) -> bool:
+    if owner is not None:
+        return not _is_process_running(owner)
+    return time.time() - path.stat().st_mtime > STALE_LOCK_SECONDS
+
+
+def _is_stale(lock_path: Path) -> bool:
+    try:
+        owner = int((lock_path / _LOCK_OWNER).read_text())
+    except (OSError, ValueError):
+        owner = None
+    return _is_owner_gone(owner, lock_path)
+
+
+def acquire_lock(path: Path, poll_interval: float = 0.5) -> None:
+    """Lock a cache entry, waiting while another process holds it.
+
+    The lock stays until ``release_lock``, or until its process is gone.
+    """
+    lock_path = _get_lock_path(path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        try:
+            lock_path.mkdir()
+            break
+        except FileExistsError:
+            try:
+                if _is_stale(lock_path):
+                    release_lock(path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(poll_interval)
+    try:
+        (lock_path / _LOCK_OWNER).write_text(str(os.getpid()))
+    except OSError:
+        pass
+
+
+def release_lock(path: Path) -> None:
+    lock_path = _get_lock_path(path)
+    (lock_path / _LOCK_OWNER).unlink(missing_ok=True)
+    try:
+        lock_path.rmdir()
+    except OSError:
+        pass
+
+
+def _get_leases_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.leases")
+
+
+def acquire_lease(path: Path) -> None:
+    """Mark a cache entry as in use by this process until ``release_lease``.
+
+    Unlike a lock, any number of processes can hold a lease on the same entry
+    at once. Eviction skips entries with a lease whose process still runs.
+    """
+    leases_path = _get_leases_path(path)
+    while True:
+        leases_path.mkdir(parents=True, exist_ok=True)
+        try:
+            (leases_path / str(os.getpid())).touch()
+            return
+        except FileNotFoundError:
+            # Removed by ``is_leased`` as it found no lease left, try again.
+            continue
+
+
+def release_lease(path: Path) -> None:
+    leases_path = _get_leases_path(path)
+    (leases_path / str(os.getpid())).unlink(missing_ok=True)
+    try:
+        leases_path.rmdir()
+    except OSError:
+        pass
+
+
+def is_leased(path: Path) -> bool:
+    """Whether a running process holds a lease on ``path``, dropping stale ones."""
+    leases_path = _get_leases_path(path)
+    try:
+        leases = list(leases_path.iterdir())
+    except OSError:
+        return False
+    for lease in leases:
+        try:
+            if not _is_owner_gone(int(lease.name), lease):
+                return True
+            lease.unlink(missing_ok=True)
+        except (OSError, ValueError):
+            continue
+    try:
+        leases_path.rmdir()
+    except OSError:
+        pass
+    return False
+
+
+@contextmanager
+def cache_lock(path: Path, poll_interval: float = 0.5):
+    """Serialize processes working on the same cache entry."""
+    acquire_lock(path, poll_interval)
+    try:
+        yield
+    finally:
+        release_lock(path)
+
+
+__all__ = [
+    "acquire_lease",
+    "acquire_lock",
+    "cache_lock",
+    "evict_least_recently_used",
+    "get_cache_dir",
+    "get_cache_size_limit",
+    "get_directory_size",
+    "is_leased",
+    "is_locked",
+    "prune_cache_files",
+    "read_json",
+    "release_lease",
+    "release_lock",
+    "remove_path",
+    "write_json_atomic",
+]
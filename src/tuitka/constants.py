@@ -2,6 +2,15 @@ import sys
 
 PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
 
+DEFAULT_NUITKA_OPTIONS = {
+    "--onefile": True,
+    "--assume-yes-for-downloads": True,
+    "--remove-output": True,
+}
+
+# Runs of the program and of the script each, when benchmarking a build.
+DEFAULT_BENCHMARK_RUNS = 10
+
 sss_snek = r"""
     ____                  
        / . .\                
@@ -0,0 +1,138 @@
+import hashlib
+import importlib.metadata
+import os
+import sys
+from functools import cache
+
+from tuitka.cache import get_cache_dir, read_json, write_json_atomic
+
+# Bump whenever the layout of the cached index changes.
+DISTRIBUTION_INDEX_VERSION = 1
+
+# Import names that differ from the name of the distribution providing them.
+BUNDLED_IMPORT_NAMES = {
+    "Bio": "biopython",
+    "Crypto": "pycryptodome",
+    "Cryptodome": "pycryptodomex",
+    "Levenshtein": "Levenshtein",
+    "MySQLdb": "mysqlclient",
+    "OpenGL": "PyOpenGL",
+    "OpenSSL": "pyOpenSSL",
+    "PIL": "pillow",
+    "Xlib": "python-xlib",
+    "_cffi_backend": "cffi",
+    "attr": "attrs",
+    "bs4": "beautifulsoup4",
+    "cv2": "opencv-python",
+    "dateutil": "python-dateutil",
+    "discord": "discord.py",
+    "docx": "python-docx",
+    "dotenv": "python-dotenv",
+    "engineio": "python-engineio",
+    "faiss": "faiss-cpu",
+    "fitz": "PyMuPDF",
+    "gi": "PyGObject",
+    "git": "GitPython",
+    "github": "PyGithub",
+    "googleapiclient": "google-api-python-client",
+    "grpc": "grpcio",
+    "jose": "python-jose",
+    "jwt": "PyJWT",
+    "ldap": "python-ldap",
+    "magic": "python-magic",
+    "markdown": "Markdown",
+    "mpl_toolkits": "matplotlib",
+    "multipart": "python-multipart",
+    "nacl": "PyNaCl",
+    "osgeo": "GDAL",
+    "pkg_resources": "setuptools",
+    "pptx": "python-pptx",
+    "psycopg2": "psycopg2-binary",
+    "pythoncom": "pywin32",
+    "pywintypes": "pywin32",
+    "serial": "pyserial",
+    "shapefile": "pyshp",
+    "skimage": "scikit-image",
+    "sklearn": "scikit-learn",
+    "slugify": "python-slugify",
+    "socketio": "python-socketio",
+    "speech_recognition": "SpeechRecognition",
+    "telegram": "python-telegram-bot",
+    "usb": "pyusb",
+    "websocket": "websocket-client",
+    "win32api": "pywin32",
+    "win32com": "pywin32",
+    "win32con": "pywin32",
+    "win32gui": "pywin32",
+    "wx": "wxPython",
+    "yaml": "PyYAML",
+    "zmq": "pyzmq",
+}
+
+
+def get_index_key() -> str:
+    """Changes whenever a distribution is installed into or removed from sys.path."""
+    digest = hashlib.sha256(str(DISTRIBUTION_INDEX_VERSION).encode("utf-8"))
+    for entry in sys.path:
+        try:
+            mtime_ns = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            continue
+        digest.update(f"{entry}\0{mtime_ns}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+@cache
+def load_installed_import_index() -> dict[str, list[str]]:
+    """Top level import names of the installed distributions."""
+    cache_path = get_cache_dir("distributions") / f"index-{get_index_key()}.json"
+    index = read_json(cache_path)
+    if isinstance(index, dict):
+        return index
+
+    index = {
+        name: sorted(set(distributions))
+        for name, distributions in importlib.metadata.packages_distributions().items()
+    }
+    try:
+        write_json_atomic(cache_path, index)
+        for stale in cache_path.parent.glob("index-*.json"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return index
+
+
+def resolve_distribution(import_name: str) -> str | None:
+    """Distribution providing ``import_name``, without any network access."""
+    installed = load_installed_import_index().get(import_name, [])
+    if len(installed) == 1:
+        return installed[0]
+    if import_name in BUNDLED_IMPORT_NAMES:
+        return BUNDLED_IMPORT_NAMES[import_name]
+    # Several distributions share namespace packages such as "google", picking
+    # one of them would be a guess.
+    return None
+
+
+def resolve_distributions(import_names: list[str]) -> tuple[list[str], list[str]]:
+    """Split imports into the distributions providing them and unresolved names."""
+    distributions = {}
+    unresolved = []
+    for import_name in import_names:
+        distribution = resolve_distribution(import_name)
+        if distribution is None:
+            unresolved.append(import_name)
+        else:
+            distributions.setdefault(distribution.lower(), distribution)
+    return sorted(distributions.values(), key=str.lower), unresolved
+
+
+__all__ = [
+    "BUNDLED_IMPORT_NAMES",
+    "get_index_key",
+    "load_installed_import_index",
+    "resolve_distribution",
+    "resolve_distributions",
+]
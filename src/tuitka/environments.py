@@ -0,0 +1,421 @@
+"""Persistent build environments, reused between builds with the same inputs.
+
+This module is also the entry point of build commands: ``python -m
+tuitka.environments --python 3.12 --with requests --lock <file> -- <nuitka
+arguments>`` makes sure the lock file and a matching environment exist and then
+runs Nuitka inside it, or with ``--isolated`` in a throwaway environment.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tuitka.cache import (
+    acquire_lease,
+    cache_lock,
+    evict_least_recently_used,
+    get_cache_dir,
+    get_cache_size_limit,
+    get_directory_size,
+    read_json,
+    release_lease,
+    remove_path,
+    write_json_atomic,
+)
+from tuitka.nuitka_options import get_nuitka_version
+from tuitka.wheelhouse import get_offline_args
+
+ENVIRONMENT_MARKER = "tuitka-environment.json"
+ENVIRONMENT_CACHE_SIZE_VARIABLE = "TUITKA_ENV_CACHE_SIZE"
+DEFAULT_ENVIRONMENT_CACHE_SIZE = 10 * 1024**3
+
+_REQUIREMENT_NAME_REGEX = re.compile(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_MARKER_OPERATOR_REGEX = re.compile(r"\s*(===|==|!=|~=|<=|>=|<|>)\s*")
+
+_JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+_JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+
+
+def normalize_requirement(requirement: str) -> str:
+    """Canonical spelling of a requirement, so equivalent spellings share a key."""
+    requirement, separator, marker = requirement.partition(";")
+    match = _REQUIREMENT_NAME_REGEX.match(requirement)
+    name = re.sub(r"[-_.]+", "-", match.group(1)).lower() if match else ""
+    # Whitespace means nothing around extras, operators and versions.
+    rest = "".join(requirement[match.end() if match else 0 :].split())
+    if rest.startswith("@"):
+        rest = f" @ {rest[1:]}"
+    if not separator:
+        return f"{name}{rest}"
+    marker = _MARKER_OPERATOR_REGEX.sub(r"\1", " ".join(marker.split()))
+    return f"{name}{rest}; {marker}"
+
+
+def get_nuitka_requirement() -> str:
+    """Build with the Nuitka version tuitka itself knows the options of."""
+    nuitka_version = get_nuitka_version()
+    return f"nuitka=={nuitka_version}" if nuitka_version else "nuitka"
+
+
+def get_environment_key(requirements: list[str], python_version: str) -> str:
+    normalized = sorted({normalize_requirement(req) for req in requirements})
+    payload = json.dumps([python_version, normalized], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_environment_dir(requirements: list[str], python_version: str) -> Path:
+    key = get_environment_key(requirements, python_version)
+    return get_cache_dir("environments") / key
+
+
+def get_environment_site_packages(environment_dir: Path) -> Path | None:
+    if sys.platform == "win32":
+        candidates = [environment_dir / "Lib" / "site-packages"]
+    else:
+        candidates = sorted(environment_dir.glob("lib/python*/site-packages"))
+    return next((path for path in candidates if path.is_dir()), None)
+
+
+def get_environment_packages(environment_dir: Path) -> list[str] | None:
+    """Exact Python version and packages of a finished environment, if it exists."""
+    if not (environment_dir / ENVIRONMENT_MARKER).exists():
+        return None
+
+    packages = []
+    try:
+        config = (environment_dir / "pyvenv.cfg").read_text(encoding="utf-8")
+    except OSError:
+        config = ""
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() in ("version", "version_info"):
+            packages.append(f"python=={value.strip()}")
+            break
+
+    site_packages = get_environment_site_packages(environment_dir)
+    dist_infos = site_packages.glob("*.dist-info") if site_packages else []
+    for dist_info in dist_infos:
+        name, _, version = dist_info.name[: -len(".dist-info")].partition("-")
+        packages.append(f"{normalize_requirement(name)}=={version}")
+    return sorted(packages)
+
+
+def get_environment_python(environment_dir: Path) -> Path:
+    if sys.platform == "win32":
+        return environment_dir / "Scripts" / "python.exe"
+    return environment_dir / "bin" / "python"
+
+
+def build_environment_command(
+    requirements: list[str],
+    python_version: str,
+    nuitka_args: list[str],
+    lock_path: Path | None = None,
+    isolated: bool = False,
+    wheelhouse: Path | None = None,
+) -> list[str]:
+    cmd = [sys.executable, "-m", "tuitka.environments", "--python", python_version]
+    for requirement in requirements:
+        cmd.extend(["--with", requirement])
+    if lock_path is not None:
+        cmd.extend(["--lock", str(lock_path)])
+    if isolated:
+        cmd.append("--isolated")
+    if wheelhouse is not None:
+        cmd.extend(["--wheelhouse", str(wheelhouse)])
+    cmd.append("--")
+    cmd.extend(nuitka_args)
+    return cmd
+
+
+def get_isolated_command(
+    requirements: list[str],
+    python_version: str,
+    lock_path: Path | None = None,
+    wheelhouse: Path | None = None,
+) -> list[str]:
+    """Nuitka in a throwaway environment created by ``uv run --isolated``."""
+    cmd = [
+        "uv",
+        "--python-preference",
+        "system",
+        "run",
+        "--no-project",
+        "--python",
+        python_version,
+        "--isolated",
+        *get_offline_args(wheelhouse),
+    ]
+    if lock_path is not None:
+        cmd.extend(["--with-requirements", str(lock_path)])
+    else:
+        for requirement in requirements:
+            cmd.extend(["--with", requirement])
+    cmd.extend(["-m", "nuitka"])
+    return cmd
+
+
+def _create_environment(
+    environment_dir: Path,
+    requirements: list[str],
+    python_version: str,
+    lock_path: Path | None = None,
+    wheelhouse: Path | None = None,
+) -> None:
+    offline_args = get_offline_args(wheelhouse)
+    subprocess.run(
+        [
+            "uv",
+            "venv",
+            "--python-preference",
+            "system",
+            "--python",
+            python_version,
+            *(["--offline"] if wheelhouse is not None else []),
+            str(environment_dir),
+        ],
+        check=True,
+    )
+    python = str(get_environment_python(environment_dir))
+    if lock_path is not None:
+        # Exactly the locked packages, nothing is resolved again.
+        install = ["uv", "pip", "sync", "--python", python, str(lock_path)]
+    else:
+        install = ["uv", "pip", "install", "--python", python, *requirements]
+    subprocess.run([*install, *offline_args], check=True)
+
+
+def prune_environments(keep: Path | None = None) -> list[Path]:
+    """Evict the least recently used environments beyond the size limit.
+
+    Every build leases its environment while Nuitka runs from it, leased
+    environments are never evicted.
+    """
+    entries = {}
+    for marker in get_cache_dir("environments").glob(f"*/{ENVIRONMENT_MARKER}"):
+        data = read_json(marker) or {}
+        try:
+            last_used = marker.stat().st_mtime
+        except OSError:
+            continue
+        entries[marker.parent] = (last_used, data.get("size", 0))
+    max_bytes = get_cache_size_limit(
+        ENVIRONMENT_CACHE_SIZE_VARIABLE, DEFAULT_ENVIRONMENT_CACHE_SIZE
+    )
+    return evict_least_recently_used(entries, max_bytes, keep={keep})
+
+
+def is_environment_current(environment_dir: Path, lock_path: Path | None) -> bool:
+    """Whether a finished environment exists, holding the pins of ``lock_path``."""
+    from tuitka.locks import get_lock_digest
+
+    marker = environment_dir / ENVIRONMENT_MARKER
+    if not marker.exists():
+        return False
+    if lock_path is None or not lock_path.exists():
+        return True
+    return (read_json(marker) or {}).get("lock") == get_lock_digest(lock_path)
+
+
+def ensure_environment(
+    requirements: list[str],
+    python_version: str,
+    lock_path: Path | None = None,
+    wheelhouse: Path | None = None,
+) -> Path:
+    """Return an environment with ``requirements`` installed, creating it once.
+
+    With ``lock_path`` the environment holds the pins of that lock file, and is
+    created again once the lock file changed. With ``wheelhouse`` everything is
+    installed from there, without network access.
+    """
+    from tuitka.locks import get_lock_digest
+
+    environment_dir = get_environment_dir(requirements, python_version)
+    marker = environment_dir / ENVIRONMENT_MARKER
+    lock_digest = get_lock_digest(lock_path) if lock_path is not None else None
+
+    with cache_lock(environment_dir):
+        if is_environment_current(environment_dir, lock_path):
+            os.utime(marker)
+            print(f"Reusing build environment {environment_dir}", flush=True)
+            return environment_dir
+
+        # Leftovers of an interrupted creation are not trustworthy.
+        remove_path(environment_dir)
+        print(f"Creating build environment {environment_dir}", flush=True)
+        try:
+            _create_environment(
+                environment_dir, requirements, python_version, lock_path, wheelhouse
+            )
+        except BaseException:
+            remove_path(environment_dir)
+            raise
+
+        write_json_atomic(
+            marker,
+            {
+                "python": python_version,
+                "requirements": sorted(requirements),
+                "lock": lock_digest,
+                "created": time.time(),
+                "size": get_directory_size(environment_dir),
+            },
+        )
+
+    prune_environments(keep=environment_dir)
+    return environment_dir
+
+
+def _kill_children_on_exit() -> None:
+    """Put this process in a Windows job object that is killed once it exits.
+
+    The processes it starts join the job, so stopping the wrapper also stops
+    uv, Nuitka and the C compiler instead of leaving them running.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class BasicLimits(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class ExtendedLimits(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", BasicLimits),
+            ("IoInfo", ctypes.c_uint64 * 6),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = [
+        wintypes.HANDLE,
+        ctypes.c_int,
+        ctypes.c_void_p,
+        wintypes.DWORD,
+    ]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+
+    # The handle is not inherited, it closes when this process ends however
+    # it ends, and closing the last handle kills everything in the job.
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return
+    limits = ExtendedLimits()
+    limits.BasicLimitInformation.LimitFlags = _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    if kernel32.SetInformationJobObject(
+        job,
+        _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION,
+        ctypes.byref(limits),
+        ctypes.sizeof(limits),
+    ):
+        kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tuitka.environments")
+    parser.add_argument("--python", required=True)
+    parser.add_argument("--with", dest="requirements", action="append", default=[])
+    parser.add_argument("--lock", type=Path)
+    parser.add_argument("--isolated", action="store_true")
+    parser.add_argument("--wheelhouse", type=Path)
+    parser.add_argument("nuitka_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    nuitka_args = args.nuitka_args
+    if nuitka_args[:1] == ["--"]:
+        nuitka_args = nuitka_args[1:]
+    if sys.platform == "win32":
+        _kill_children_on_exit()
+
+    if args.wheelhouse is not None and (
+        args.isolated
+        or not is_environment_current(
+            get_environment_dir(args.requirements, args.python), args.lock
+        )
+    ):
+        from tuitka.locks import read_lock
+        from tuitka.wheelhouse import check_wheelhouse
+
+        # Everything to install has to be there before the build starts.
+        locked = read_lock(args.lock) if args.lock is not None else None
+        if not check_wheelhouse(
+            locked if locked is not None else args.requirements,
+            args.wheelhouse,
+            args.python,
+            locked=locked is not None,
+        ):
+            return 1
+
+    try:
+        if args.lock is not None:
+            from tuitka.locks import ensure_lock
+
+            ensure_lock(
+                args.lock, args.requirements, args.python, wheelhouse=args.wheelhouse
+            )
+        if args.isolated:
+            command = get_isolated_command(
+                args.requirements, args.python, args.lock, args.wheelhouse
+            )
+        else:
+            # Leased before it is looked up, so no other build evicts it in
+            # between. exec keeps the process id, the lease lasts while Nuitka
+            # runs and is stale once it exits.
+            acquire_lease(get_environment_dir(args.requirements, args.python))
+            environment_dir = ensure_environment(
+                args.requirements, args.python, args.lock, args.wheelhouse
+            )
+            command = [str(get_environment_python(environment_dir)), "-m", "nuitka"]
+    except subprocess.CalledProcessError as e:
+        return e.returncode or 1
+
+    command.extend(nuitka_args)
+    if sys.platform == "win32":
+        # exec on Windows spawns a new process and lets the parent exit early,
+        # waiting keeps the job object, and with it Nuitka, tied to this one.
+        try:
+            return subprocess.call(command)
+        finally:
+            if not args.isolated:
+                release_lease(environment_dir)
+    os.execvp(command[0], command)
+
+
+__all__ = [
+    "build_environment_command",
+    "ensure_environment",
+    "get_environment_dir",
+    "get_environment_key",
+    "get_environment_packages",
+    "get_environment_site_packages",
+    "get_isolated_command",
+    "get_nuitka_requirement",
+    "is_environment_current",
+    "normalize_requirement",
+    "prune_environments",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+import hashlib
+import heapq
+import os
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+
+from tuitka.cache import (
+    get_cache_dir,
+    get_cache_size_limit,
+    prune_cache_files,
+    read_json,
+    write_json_atomic,
+)
+
+# Bump whenever the index changes, so older cache files are ignored.
+INDEX_VERSION = 1
+FILE_INDEX_CACHE_SIZE_VARIABLE = "TUITKA_FILE_INDEX_CACHE_SIZE"
+DEFAULT_FILE_INDEX_CACHE_SIZE = 256 * 1024**2
+
+# Directories never holding scripts to compile, whatever .gitignore says.
+EXCLUDED_DIRECTORIES = frozenset({"__pycache__", "node_modules", "site-packages"})
+# Nuitka's build and output directories.
+BUILD_OUTPUT_SUFFIXES = (".build", ".dist", ".onefile-build", ".app")
+
+ENTRY_POINT_NAMES = frozenset({"__main__.py", "main.py"})
+# PEP 723 blocks are looked for in this much of the start of a file.
+PEP_723_SCAN_BYTES = 64 * 1024
+_PEP_723_START = re.compile(rb"(?m)^# /// script\s*$")
+
+# Ranks of a query word matching the file name, its start, or only the path.
+TIER_NAME_PREFIX = 4
+TIER_NAME = 3
+TIER_PATH = 2
+TIER_FUZZY = 1
+
+
+def _translate_pattern(pattern: str) -> str:
+    """Regular expression of a .gitignore glob."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[index + 1 : end].replace("\\", "\\\\")
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                parts.append(f"[{content}]")
+                index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+class IgnoreRules:
+    """Patterns of the .gitignore files from the root down to one directory.
+
+    Like git, the last matching pattern decides and "!" patterns include a path
+    again. Paths are relative to the root, in posix form.
+    """
+
+    def __init__(self, rules: tuple = (), key: str = "") -> None:
+        # (directory of the .gitignore, compiled pattern, negated, directories only)
+        self.rules = rules
+        self.key = key
+
+    def child(self, directory: str, gitignore: str | None) -> "IgnoreRules":
+        """Rules for ``directory``, adding the patterns of its own .gitignore."""
+        if not gitignore:
+            return self
+        rules = list(self.rules)
+        for line in gitignore.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate_pattern(line.lstrip("/"))
+            regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+            rules.append((directory, re.compile(regex), negated, directory_only))
+        key = hashlib.sha256(
+            f"{self.key}\0{directory}\0{gitignore}".encode()
+        ).hexdigest()
+        return IgnoreRules(tuple(rules), key[:16])
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        ignored = False
+        for directory, regex, negated, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if directory:
+                if not path.startswith(f"{directory}/"):
+                    continue
+                relative = path[len(directory) + 1 :]
+            else:
+                relative = path
+            if regex.match(relative):
+                ignored = not negated
+        return ignored
+
+
+def is_excluded_directory(path: Path) -> bool:
+    """Directories that are hidden, caches, build output or virtual environments."""
+    name = path.name
+    return (
+        name.startswith(".")
+        or name in EXCLUDED_DIRECTORIES
+        or name.endswith(BUILD_OUTPUT_SUFFIXES)
+        or (path / "pyvenv.cfg").exists()
+    )
+
+
+def has_pep_723_block(path: Path) -> bool:
+    try:
+        with path.open("rb") as file:
+            head = file.read(PEP_723_SCAN_BYTES)
+    except OSError:
+        return False
+    return _PEP_723_START.search(head) is not None
+
+
+def _get_index_path(root: Path) -> Path:
+    root_hash = hashlib.sha256(str(root).encode("utf-8")).hexdigest()
+    return get_cache_dir("file_index") / f"{root.name or 'root'}-{root_hash[:12]}.json"
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """The searchable files of one refresh, replaced as a whole by the next."""
+
+    paths: list[str]
+    lowered: list[str]
+    name_starts: list[int]
+    entry_scores: list[int]
+    default_order: list[int]
+    # All lowered paths in one string, so a query is first matched in C.
+    joined: str
+    offsets: list[int]
+
+
+class FileIndex:
+    """Python files below ``root`` with fuzzy search, entry points ranked first.
+
+    The directory listings are kept between refreshes and runs. A refresh only
+    lists directories whose modification time or .gitignore rules changed, so
+    it costs one stat per directory when nothing changed. File contents are
+    only looked at again when their directory changes.
+    """
+
+    def __init__(self, root: Path, listings: dict | None = None) -> None:
+        self.root = root
+        # Relative directory -> {"mtime", "rules", "ignore", "dirs", "files"},
+        # files mapping names to [mtime_ns, size, entry point score].
+        self.listings: dict[str, dict] = listings or {}
+        self.snapshot: _Snapshot
+        # (snapshot, query, matching indexes) of the last search.
+        self.last_search: tuple[_Snapshot, str, list[int]] | None = None
+        self._rebuild()
+
+    @property
+    def paths(self) -> list[str]:
+        return self.snapshot.paths
+
+    @classmethod
+    def load(cls, root: Path) -> "FileIndex":
+        """The persisted index of ``root``, possibly outdated, or an empty one."""
+        root = Path(root).resolve()
+        data = read_json(_get_index_path(root))
+        if (
+            isinstance(data, dict)
+            and data.get("version") == INDEX_VERSION
+            and isinstance(data.get("listings"), dict)
+        ):
+            return cls(root, data["listings"])
+        return cls(root)
+
+    def save(self) -> None:
+        index_path = _get_index_path(self.root)
+        try:
+            write_json_atomic(
+                index_path, {"version": INDEX_VERSION, "listings": self.listings}
+            )
+        except OSError:
+            return
+        prune_cache_files(
+            index_path.parent,
+            get_cache_size_limit(
+                FILE_INDEX_CACHE_SIZE_VARIABLE, DEFAULT_FILE_INDEX_CACHE_SIZE
+            ),
+            keep=index_path,
+        )
+
+    def __len__(self) -> int:
+        return len(self.snapshot.paths)
+
+    def _list_directory(
+        self, relative: str, directory: Path, rules: IgnoreRules, previous: dict | None
+    ) -> tuple[list[str], dict[str, list]]:
+        previous_files = previous["files"] if previous else {}
+        directories, files = [], {}
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return directories, files
+        for entry in entries:
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if not is_excluded_directory(Path(entry.path)) and not rules.is_ignored(
+                    path, True
+                ):
+                    directories.append(entry.name)
+            elif entry.name.endswith((".py", ".pyw")) and not rules.is_ignored(
+                path, False
+            ):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                record = previous_files.get(entry.name)
+                if record is None or record[:2] != [stat.st_mtime_ns, stat.st_size]:
+                    score = 2 if entry.name in ENTRY_POINT_NAMES else 0
+                    if has_pep_723_block(Path(entry.path)):
+                        score = 2
+                    record = [stat.st_mtime_ns, stat.st_size, score]
+                files[entry.name] = record
+        return sorted(directories), files
+
+    def refresh(self, should_stop=None) -> bool:
+        """Bring the index up to date, returns whether anything changed.
+
+        ``should_stop`` is polled between directories, a stopped refresh keeps
+        the index as it was.
+        """
+        listings = {}
+        changed = False
+        pending = [("", IgnoreRules())]
+        while pending:
+            if should_stop is not None and should_stop():
+                return False
+            relative, rules = pending.pop()
+            directory = self.root / relative if relative else self.root
+            try:
+                mtime = directory.stat().st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            previous = self.listings.get(relative)
+
+            gitignore_path = directory / ".gitignore"
+            try:
+                ignore_stamp = [gitignore_path.stat().st_mtime_ns]
+            except OSError:
+                ignore_stamp = None
+            if previous is not None and previous.get("ignore_stamp") == ignore_stamp:
+                gitignore = previous.get("ignore")
+            elif ignore_stamp is not None:
+                try:
+                    gitignore = gitignore_path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    gitignore = None
+            else:
+                gitignore = None
+            rules = rules.child(relative, gitignore)
+
+            if (
+                previous is not None
+                and previous["mtime"] == mtime
+                and previous["rules"] == rules.key
+                and previous.get("ignore_stamp") == ignore_stamp
+            ):
+                listing = previous
+            else:
+                directories, files = self._list_directory(
+                    relative, directory, rules, previous
+                )
+                listing = {
+                    "mtime": mtime,
+                    "rules": rules.key,
+                    "ignore": gitignore,
+                    "ignore_stamp": ignore_stamp,
+                    "dirs": directories,
+                    "files": files,
+                }
+                changed = (
+                    changed
+                    or previous is None
+                    or (previous["dirs"] != directories or previous["files"] != files)
+                )
+            listings[relative] = listing
+            for name in listing["dirs"]:
+                pending.append((f"{relative}/{name}" if relative else name, rules))
+
+        changed = changed or listings.keys() != self.listings.keys()
+        self.listings = listings
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self) -> None:
+        paths, scores = [], []
+        for relative in sorted(self.listings):
+            files = self.listings[relative]["files"]
+            for name in sorted(files):
+                paths.append(f"{relative}/{name}" if relative else name)
+                scores.append(files[name][2])
+        lowered = [path.lower() for path in paths]
+        offsets, offset = [], 0
+        for path in lowered:
+            offsets.append(offset)
+            offset += len(path) + 1
+        # Refreshes run in a worker thread. Swapped in by one assignment,
+        # searches running meanwhile keep working on the previous snapshot.
+        self.snapshot = _Snapshot(
+            paths=paths,
+            lowered=lowered,
+            name_starts=[path.rfind("/") + 1 for path in paths],
+            entry_scores=scores,
+            default_order=sorted(
+                range(len(paths)),
+                key=lambda index: (
+                    -scores[index],
+                    paths[index].count("/"),
+                    lowered[index],
+                ),
+            ),
+            joined="\n".join(lowered),
+            offsets=offsets,
+        )
+
+    @staticmethod
+    def _prefilter(snapshot: _Snapshot, pattern: re.Pattern) -> list[int]:
+        """Indexes of the paths ``pattern`` is found in."""
+        joined, offsets = snapshot.joined, snapshot.offsets
+        found, line_end = [], -1
+        position = 0
+        while match := pattern.search(joined, position):
+            start = match.start()
+            if start > line_end:
+                index = bisect_right(offsets, start) - 1
+                found.append(index)
+                # Further matches in the same path are skipped.
+                line_end = joined.find("\n", start)
+                if line_end == -1:
+                    break
+                position = line_end + 1
+            else:
+                position = line_end + 1
+        return found
+
+    def search(self, query: str, limit: int = 200) -> list[str]:
+        """Relative paths of the files matching every word of ``query``.
+
+        Matches in the file name rank above matches in the directories, and
+        entry points above other files matching as well.
+        """
+        snapshot = self.snapshot
+        paths, lowered = snapshot.paths, snapshot.lowered
+        name_starts, entry_scores = snapshot.name_starts, snapshot.entry_scores
+        words = query.lower().split()
+        if not words:
+            self.last_search = None
+            return [paths[index] for index in snapshot.default_order[:limit]]
+
+        query = " ".join(words)
+        fuzzy = [
+            re.compile("[^\n]*?".join(re.escape(char) for char in word))
+            for word in words
+        ]
+        last_search = self.last_search
+        if (
+            last_search is not None
+            and last_search[0] is snapshot
+            and query.startswith(last_search[1])
+        ):
+            candidates = last_search[2]
+        else:
+            candidates = self._prefilter(snapshot, fuzzy[0])
+
+        matches, keys = [], {}
+        for index in candidates:
+            path = lowered[index]
+            name_start = name_starts[index]
+            tier, span = 0, 0
+            for word, pattern in zip(words, fuzzy):
+                position = path.find(word, name_start)
+                if position == name_start:
+                    tier += TIER_NAME_PREFIX
+                elif position != -1:
+                    tier += TIER_NAME
+                elif word in path:
+                    tier += TIER_PATH
+                else:
+                    match = pattern.search(path)
+                    if match is None:
+                        break
+                    tier += TIER_FUZZY
+                    span += match.end() - match.start()
+            else:
+                matches.append(index)
+                keys[index] = (-tier, -entry_scores[index], span, len(path), path)
+
+        self.last_search = (snapshot, query, matches)
+        best = heapq.nsmallest(limit, matches, key=keys.__getitem__)
+        return [paths[index] for index in best]
+
+
+__all__ = [
+    "FileIndex",
+    "IgnoreRules",
+    "has_pep_723_block",
+    "is_excluded_directory",
+]
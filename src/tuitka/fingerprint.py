@@ -0,0 +1,186 @@
+import hashlib
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from tuitka.environments import (
+    get_environment_dir,
+    get_environment_packages,
+    get_nuitka_requirement,
+    normalize_requirement,
+)
+from tuitka.locks import get_script_lock_path, read_lock
+from tuitka.nuitka_options import get_nuitka_version
+
+# Bump whenever the fingerprint inputs change, so old fingerprints never match.
+FINGERPRINT_VERSION = 3
+
+# Options changing neither what is built nor how it is built.
+_IGNORED_OPTIONS = {
+    "--assume-yes-for-downloads",
+    "--jobs",
+    "--output-dir",
+    "--remove-output",
+}
+
+
+@dataclass
+class BuildFingerprint:
+    digest: str
+    inputs: dict
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_path(path: Path) -> str:
+    """Content hash of a file, or of the names and contents of a directory tree."""
+    if path.is_file():
+        return hash_file(path)
+    digest = hashlib.sha256()
+    for entry in sorted(path.rglob("*")):
+        if entry.is_file():
+            relative = entry.relative_to(path).as_posix()
+            digest.update(f"{relative}\0{hash_file(entry)}\0".encode())
+    return digest.hexdigest()
+
+
+def get_source_hashes(script: Path, local_modules: list[Path]) -> dict[str, str]:
+    root = script.resolve().parent
+    hashes = {}
+    for path in {script.resolve(), *local_modules}:
+        try:
+            name = path.relative_to(root).as_posix()
+        except ValueError:
+            name = path.as_posix()
+        hashes[name] = hash_file(path)
+    return dict(sorted(hashes.items()))
+
+
+def get_option_inputs(nuitka_options: dict, base_dir: Path) -> list[list]:
+    """Options in canonical order, with the contents of files they point to."""
+    inputs = []
+    for flag in sorted(nuitka_options):
+        value = nuitka_options[flag]
+        if flag in _IGNORED_OPTIONS or value is None or value is False:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            entry = [flag, item]
+            if isinstance(item, str) and item:
+                # Data options are given as "source=destination".
+                source = base_dir / item.split("=", 1)[0]
+                if source.exists():
+                    entry.append(hash_path(source))
+            inputs.append(entry)
+    return inputs
+
+
+def get_build_fingerprint(
+    script: Path,
+    python_version: str,
+    nuitka_options: dict,
+    dependencies_metadata,
+    *,
+    isolated: bool = False,
+    sources: dict[str, str] | None = None,
+) -> BuildFingerprint:
+    """Fingerprint of every input deciding what a build produces.
+
+    ``dependencies_metadata`` is the one returned by prepare_nuitka_command().
+    Only the options in ``nuitka_options`` count, not those its resource profile
+    picked for the free memory of the moment. Dependencies are the pins of the
+    project's lock file once it exists, or else the exact packages of the
+    cached build environment.
+    """
+    dependencies = sorted(
+        normalize_requirement(dependency)
+        for dependency in dependencies_metadata.dependencies
+    )
+    requirements = [*dependencies_metadata.dependencies, get_nuitka_requirement()]
+    locked = read_lock(get_script_lock_path(script, requirements, python_version))
+    if locked is not None:
+        dependencies = sorted(locked)
+    elif not isolated:
+        packages = get_environment_packages(
+            get_environment_dir(requirements, python_version)
+        )
+        if packages is not None:
+            dependencies = packages
+
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "platform": f"{sys.platform}-{platform.machine()}",
+        "python": python_version,
+        "nuitka": get_nuitka_version(),
+        "script": script.name,
+        "sources": sources
+        if sources is not None
+        else get_source_hashes(script, dependencies_metadata.local_modules),
+        "dependencies": dependencies,
+        "options": get_option_inputs(nuitka_options, script.resolve().parent),
+    }
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return BuildFingerprint(
+        digest=hashlib.sha256(payload.encode("utf-8")).hexdigest(), inputs=inputs
+    )
+
+
+def run_fingerprint_cli(
+    scripts: list[Path],
+    nuitka_options: dict,
+    python_version: str,
+    isolated: bool = False,
+    as_json: bool = False,
+) -> None:
+    """Print the fingerprint of each script, as a build of it would compute it."""
+    from tuitka.artifacts import ARTIFACT_MARKER
+    from tuitka.cache import get_cache_dir
+    from tuitka.utils import prepare_nuitka_command
+
+    results = []
+    for script in scripts:
+        _, dependencies_metadata = prepare_nuitka_command(
+            script, python_version, isolated=isolated, **nuitka_options
+        )
+        fingerprint = get_build_fingerprint(
+            script,
+            python_version,
+            nuitka_options,
+            dependencies_metadata,
+            isolated=isolated,
+        )
+        cached = (
+            get_cache_dir("artifacts") / fingerprint.digest / ARTIFACT_MARKER
+        ).exists()
+        results.append(
+            {
+                "script": str(script),
+                "fingerprint": fingerprint.digest,
+                "cached": cached,
+                "inputs": fingerprint.inputs,
+            }
+        )
+
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"{result['fingerprint']}  {result['script']}")
+
+
+__all__ = [
+    "BuildFingerprint",
+    "get_build_fingerprint",
+    "get_option_inputs",
+    "get_source_hashes",
+    "hash_path",
+    "run_fingerprint_cli",
+]
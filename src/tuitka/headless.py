@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from tuitka.batch import (
+    BuildJob,
+    BuildResult,
+    get_worker_count,
+    make_jobs,
+    run_batch,
+)
+
+
+def build_result_data(result: BuildResult) -> dict:
+    phases = result.phases.phases if result.phases else []
+    return {
+        "script": str(result.job.script),
+        "success": result.success,
+        "exit_code": result.exit_code,
+        "command": result.command,
+        "dependencies": result.dependencies,
+        "unresolved_imports": result.unresolved_imports,
+        "artifacts": [str(path) for path in result.artifacts],
+        "fingerprint": result.fingerprint,
+        "cached": result.cached,
+        "duration": round(result.duration, 3),
+        "phases": {phase.name: round(phase.duration, 3) for phase in phases},
+        "log": str(result.log_path),
+        "trace": str(result.trace_path) if result.trace_path else None,
+    }
+
+
+class OutputStreamer:
+    """Forward build output to stderr, prefixed with the script when several run."""
+
+    def __init__(self, stream, prefix_lines: bool) -> None:
+        self.stream = stream
+        self.prefix_lines = prefix_lines
+        self.pending: dict[Path, bytes] = {}
+
+    def write(self, job: BuildJob, chunk: bytes) -> None:
+        if self.prefix_lines:
+            *lines, self.pending[job.script] = (
+                self.pending.get(job.script, b"") + chunk
+            ).split(b"\n")
+            prefix = f"[{job.script.name}] ".encode()
+            chunk = b"".join(prefix + line + b"\n" for line in lines)
+        self.stream.write(chunk)
+        self.stream.flush()
+
+    def flush(self, job: BuildJob) -> None:
+        """Write the last line of a finished build if it lacked a newline."""
+        if rest := self.pending.pop(job.script, b""):
+            self.write(job, rest + b"\n")
+
+
+def run_headless(
+    scripts: list[Path],
+    nuitka_options: dict,
+    max_workers: int | None = None,
+    isolated: bool = False,
+    reuse_build: bool = False,
+    artifact_cache: bool = True,
+    benchmark: dict | None = None,
+    stdout=None,
+    stderr=None,
+) -> bool:
+    """Compile without any UI, for CI.
+
+    Build output is streamed to stderr as it arrives and a JSON result is
+    written to stdout once every build ended. With ``benchmark``, the keyword
+    arguments of benchmark_build(), successful builds are benchmarked and the
+    reports added to the result.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr.buffer
+
+    workers = get_worker_count(len(scripts), max_workers)
+    jobs = make_jobs(
+        scripts, nuitka_options, workers, isolated, reuse_build, artifact_cache
+    )
+    streamer = OutputStreamer(stderr, prefix_lines=len(jobs) > 1)
+
+    def on_event(kind: str, item) -> None:
+        if kind == "finished":
+            streamer.flush(item.job)
+
+    start = time.perf_counter()
+    results = asyncio.run(run_batch(jobs, workers, on_event, streamer.write))
+    success = all(result.success for result in results)
+    builds = [build_result_data(result) for result in results]
+    if benchmark is not None:
+        from tuitka.benchmark import benchmark_build
+
+        for result, data in zip(results, builds):
+            if not result.success:
+                continue
+            # Creating an interpreter prints progress, stdout is for the result.
+            with contextlib.redirect_stdout(sys.stderr):
+                report = benchmark_build(
+                    result.job.script,
+                    result.artifacts,
+                    result.job.python_version,
+                    **benchmark,
+                )
+            data["benchmark"] = report.to_dict() if report else None
+
+    json.dump(
+        {
+            "success": success,
+            "duration": round(time.perf_counter() - start, 3),
+            "workers": workers,
+            "builds": builds,
+        },
+        stdout,
+        indent=2,
+    )
+    stdout.write("\n")
+    return success
+
+
+__all__ = [
+    "build_result_data",
+    "run_headless",
+]
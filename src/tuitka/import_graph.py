@@ -0,0 +1,266 @@
+import ast
+import hashlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tuitka.cache import (
+    get_cache_dir,
+    get_cache_size_limit,
+    prune_cache_files,
+    read_json,
+    write_json_atomic,
+)
+from tuitka.resources import get_cpu_count
+
+# Bump whenever the layout of the cached import records changes.
+IMPORT_CACHE_VERSION = 1
+# Below this many files, starting worker processes costs more than it saves.
+PARALLEL_PARSE_THRESHOLD = 64
+IMPORT_CACHE_SIZE_VARIABLE = "TUITKA_IMPORT_CACHE_SIZE"
+DEFAULT_IMPORT_CACHE_SIZE = 256 * 1024**2
+
+# Fields holding nested statements, or handlers and match cases containing them.
+_STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
+def parse_import_records(source: bytes | str) -> list[list]:
+    """Imports of a module as [module, level, names] records."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    records = []
+    # Imports are statements, so only statement bodies are visited instead of
+    # every expression node, which makes this several times faster than walk().
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                records.append([alias.name, 0, []])
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names if alias.name != "*"]
+            records.append([node.module, node.level, names])
+        else:
+            for field_name in _STATEMENT_FIELDS:
+                pending.extend(getattr(node, field_name, ()))
+    records.reverse()
+    return records
+
+
+def _get_process_context():
+    # Forking the TUI would copy its threads' locks in whatever state they are.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _parse_file(path: str) -> tuple[str, list[list]]:
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return "", []
+    return hashlib.sha256(data).hexdigest(), parse_import_records(data)
+
+
+@dataclass
+class ImportGraph:
+    root: Path
+    # Local module file -> local module files it imports.
+    modules: dict[Path, list[Path]] = field(default_factory=dict)
+    # Top level names of everything imported that is not part of the project.
+    imports: set[str] = field(default_factory=set)
+    parsed_files: int = 0
+
+    @property
+    def external_imports(self) -> list[str]:
+        """Imports that are neither local nor part of the standard library."""
+        std_libs = set(sys.stdlib_module_names)
+        return sorted(self.imports - std_libs)
+
+
+class ImportGraphScanner:
+    """Follow the local imports of an entry script through the whole project.
+
+    Import records of every file are cached on disk with the file's (mtime,
+    size, hash), so a rescan only parses files that actually changed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        root_hash = hashlib.sha256(str(self.root).encode("utf-8")).hexdigest()
+        self.cache_path = get_cache_dir("imports") / f"{root_hash[:16]}.json"
+        self.cache: dict[str, list] = {}
+        self.cache_changed = False
+        self._module_files: dict[tuple[Path, tuple[str, ...]], Path | None] = {}
+
+    def _load_cache(self) -> None:
+        data = read_json(self.cache_path)
+        if isinstance(data, dict) and data.get("version") == IMPORT_CACHE_VERSION:
+            self.cache = data.get("files", {})
+
+    def _save_cache(self) -> None:
+        if not self.cache_changed:
+            return
+        files = {
+            path: entry for path, entry in self.cache.items() if os.path.exists(path)
+        }
+        try:
+            write_json_atomic(
+                self.cache_path, {"version": IMPORT_CACHE_VERSION, "files": files}
+            )
+        except OSError:
+            return
+        prune_cache_files(
+            self.cache_path.parent,
+            get_cache_size_limit(IMPORT_CACHE_SIZE_VARIABLE, DEFAULT_IMPORT_CACHE_SIZE),
+            keep=self.cache_path,
+        )
+
+    def _cached_records(self, path: Path) -> list[list] | None:
+        entry = self.cache.get(str(path))
+        try:
+            stat = path.stat()
+        except OSError:
+            return []
+        if entry is None:
+            return None
+
+        mtime_ns, size, digest, records = entry
+        if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+            return records
+        # Touched but maybe not modified, e.g. by a checkout.
+        if (
+            size == stat.st_size
+            and hashlib.sha256(path.read_bytes()).hexdigest() == digest
+        ):
+            self._store(path, digest, records)
+            return records
+        return None
+
+    def _store(self, path: Path, digest: str, records: list[list]) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        self.cache[str(path)] = [stat.st_mtime_ns, stat.st_size, digest, records]
+        self.cache_changed = True
+
+    def _parse_files(self, paths: list[Path]) -> dict[Path, list[list]]:
+        if len(paths) >= PARALLEL_PARSE_THRESHOLD and get_cpu_count() > 1:
+            with ProcessPoolExecutor(
+                max_workers=get_cpu_count(), mp_context=_get_process_context()
+            ) as executor:
+                results = list(executor.map(_parse_file, map(str, paths), chunksize=16))
+        else:
+            results = [_parse_file(str(path)) for path in paths]
+
+        parsed = {}
+        for path, (digest, records) in zip(paths, results):
+            self._store(path, digest, records)
+            parsed[path] = records
+        return parsed
+
+    def _module_file(self, base: Path, parts: tuple[str, ...]) -> Path | None:
+        key = (base, parts)
+        if key not in self._module_files:
+            module_path = base.joinpath(*parts)
+            if (init_file := module_path / "__init__.py").is_file():
+                self._module_files[key] = init_file
+            elif (module_file := module_path.with_name(f"{parts[-1]}.py")).is_file():
+                self._module_files[key] = module_file
+            elif module_path.is_dir() and any(module_path.glob("*.py")):
+                # Namespace package, local but without code of its own.
+                self._module_files[key] = module_path
+            else:
+                self._module_files[key] = None
+        return self._module_files[key]
+
+    def _resolve_local(self, base: Path, parts: list[str]) -> list[Path] | None:
+        """Files of a module and its parent packages, None if it is not local."""
+        files = []
+        for index in range(1, len(parts) + 1):
+            module_file = self._module_file(base, tuple(parts[:index]))
+            if module_file is None:
+                # The first part decides whether the module is local at all.
+                return None if index == 1 else files
+            if module_file.suffix == ".py":
+                files.append(module_file)
+        return files
+
+    def _resolve_record(
+        self, importer: Path, module: str | None, level: int, names: list[str]
+    ) -> tuple[list[Path], str | None]:
+        """Local files a record imports, or the external top level name."""
+        parts = module.split(".") if module else []
+        if level:
+            base = importer.parent
+            for _ in range(level - 1):
+                base = base.parent
+        else:
+            base = self.root
+            if self._resolve_local(base, parts[:1]) is None:
+                return [], parts[0] if parts else None
+
+        files = (self._resolve_local(base, parts) or []) if parts else []
+        # "from package import name" may import a submodule as well.
+        for name in names:
+            submodule = self._resolve_local(base, [*parts, name])
+            if submodule:
+                files.append(submodule[-1])
+        return files, None
+
+    def scan(self, entry: Path) -> ImportGraph:
+        self._load_cache()
+        graph = ImportGraph(root=self.root)
+        entry = entry.resolve()
+        seen = {entry}
+        frontier = [entry]
+
+        while frontier:
+            records_by_file = {}
+            to_parse = []
+            for path in frontier:
+                records = self._cached_records(path)
+                if records is None:
+                    to_parse.append(path)
+                else:
+                    records_by_file[path] = records
+            records_by_file.update(self._parse_files(to_parse))
+            graph.parsed_files += len(to_parse)
+
+            next_frontier = []
+            for path in frontier:
+                local_files = []
+                for module, level, names in records_by_file.get(path, []):
+                    files, external = self._resolve_record(path, module, level, names)
+                    if external and external != "__future__":
+                        graph.imports.add(external)
+                    local_files.extend(files)
+                graph.modules[path] = list(dict.fromkeys(local_files))
+                for local_file in graph.modules[path]:
+                    if local_file not in seen:
+                        seen.add(local_file)
+                        next_frontier.append(local_file)
+            frontier = next_frontier
+
+        self._save_cache()
+        return graph
+
+
+def scan_project_imports(entry: Path, root: Path | None = None) -> ImportGraph:
+    """Import graph of ``entry`` and the local modules it reaches."""
+    return ImportGraphScanner(root or entry.resolve().parent).scan(entry)
+
+
+__all__ = [
+    "ImportGraph",
+    "ImportGraphScanner",
+    "parse_import_records",
+    "scan_project_imports",
+]
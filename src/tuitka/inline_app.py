@@ -1,12 +1,18 @@
+import time
 from pathlib import Path
 from textual.app import App, ComposeResult
 from textual.containers import Vertical
 from textual.reactive import reactive
+from textual.widgets import Static
 from tuitka.constants import PYTHON_VERSION
 from textual import on
 
 from tuitka.assets import STYLE_INLINE_APP
 from tuitka.widgets.nuitka_header import NuitkaHeader
+from tuitka.artifacts import ArtifactCacheEntry, find_artifacts, get_output_dir
+from tuitka.build_dirs import BuildDirectory
+from tuitka.build_phases import PhaseTracker, get_trace_path
+from tuitka.plugins import describe_plugin_decisions
 from tuitka.utils import prepare_nuitka_command
 from textual_tty.widgets import TextualTerminal
 
@@ -17,29 +23,124 @@ class InlineCompilationApp(App):
     compilation_finished: reactive[bool] = reactive(False, init=False)
 
     def __init__(
-        self, python_file: Path, python_version: str = PYTHON_VERSION, **nuitka_options
+        self,
+        python_file: Path,
+        python_version: str = PYTHON_VERSION,
+        *,
+        isolated: bool = False,
+        reuse_build: bool = False,
+        artifact_cache: bool = True,
+        startup_profile=None,
+        **nuitka_options,
     ):
         super().__init__()
+        self.startup_profile = startup_profile
         self.python_file = python_file
         self.python_version = python_version
+        self.build_directory = None
+        if reuse_build:
+            self.build_directory = BuildDirectory.for_build(
+                python_file, python_version, nuitka_options
+            )
+            nuitka_options = self.build_directory.apply(nuitka_options)
         self.nuitka_options = nuitka_options
         self.terminal = None
         self.nuitka_command, self.deps_metadata = prepare_nuitka_command(
-            python_file, python_version, **nuitka_options
+            python_file, python_version, isolated=isolated, **nuitka_options
         )
+        self.phases = PhaseTracker(title=python_file.name)
+        self.started_at = time.time()
+
+        self.cache_entry = None
+        self.restored_artifacts = None
+        # Programs the build produced, or restored.
+        self.artifacts: list[Path] = []
+        if artifact_cache:
+            self.cache_entry = ArtifactCacheEntry(
+                python_file,
+                python_version,
+                nuitka_options,
+                self.deps_metadata,
+                isolated=isolated,
+            )
+            self.restored_artifacts = self.cache_entry.restore(
+                python_file.parent
+                if self.build_directory is not None
+                else get_output_dir(python_file, nuitka_options)
+            )
 
     def compose(self) -> ComposeResult:
         with Vertical(id="terminal-container"):
             yield NuitkaHeader()
+            if self.restored_artifacts is not None:
+                names = ", ".join(path.name for path in self.restored_artifacts)
+                yield Static(
+                    f"Restored {names} from the artifact cache, nothing changed "
+                    f"since it was built.\nFingerprint: "
+                    f"{self.cache_entry.fingerprint.digest}",
+                    id="cache_status",
+                )
+                return
+            resource_profile = self.deps_metadata.resource_profile
+            if resource_profile and resource_profile.options:
+                yield Static(resource_profile.describe(), id="resource_profile")
+            if self.deps_metadata.plugin_decisions:
+                yield Static(
+                    describe_plugin_decisions(self.deps_metadata.plugin_decisions),
+                    id="plugin_decisions",
+                )
+            if self.deps_metadata.unresolved_imports:
+                yield Static(
+                    self.deps_metadata.describe_unresolved_imports(),
+                    id="unresolved_imports",
+                )
             yield TextualTerminal(
                 id="compilation_terminal", command=self.nuitka_command
             )
+            yield Static(id="phase_summary")
 
     def on_mount(self) -> None:
+        if self.restored_artifacts is not None:
+            if self.build_directory is not None:
+                self.build_directory.release()
+            self.artifacts = self.restored_artifacts
+            self.compilation_finished = True
+            self.set_timer(5.0, self.exit)
+            return
+        # File systems may store modification times coarser than time.time().
+        self.started_at = time.time() - 1
         self.terminal = self.query_one("#compilation_terminal", TextualTerminal)
 
+    def on_ready(self) -> None:
+        if self.startup_profile is not None:
+            self.startup_profile.mark("first paint")
+
+    @on(TextualTerminal.PTYDataMessage)
+    def on_pty_data(self, event: TextualTerminal.PTYDataMessage) -> None:
+        self.phases.feed(event.data)
+
     @on(TextualTerminal.ProcessExited)
     def on_process_exited(self, event: TextualTerminal.ProcessExited) -> None:
+        self.phases.finish(event.exit_code)
+        trace_path = self.phases.write_chrome_trace(get_trace_path(self.python_file))
+        summary = self.query_one("#phase_summary", Static)
+        summary.update(
+            self.phases.format_breakdown()
+            + (f"\nTrace: {trace_path}" if trace_path else "")
+        )
+        summary.display = True
+        artifacts = []
+        if self.build_directory is not None:
+            if event.exit_code == 0:
+                artifacts = self.build_directory.restore_outputs()
+            self.build_directory.release()
+        elif event.exit_code == 0:
+            artifacts = find_artifacts(
+                self.python_file, self.nuitka_options, self.started_at
+            )
+        if self.cache_entry is not None and event.exit_code == 0:
+            self.cache_entry.store(artifacts)
+        self.artifacts = artifacts
         self.compilation_finished = True
         if not self.compilation_finished:
             return
@@ -0,0 +1,147 @@
+"""Lock files pinning the dependencies of a project's builds.
+
+Each set of requirements is resolved once into a requirements file below the
+project, keyed like the build environments, and every later build installs
+exactly those pins. Lock files are meant to be committed with the project.
+"""
+
+import hashlib
+import os
+import subprocess
+from pathlib import Path
+
+from tuitka.cache import cache_lock
+from tuitka.environments import get_environment_key, normalize_requirement
+from tuitka.wheelhouse import get_offline_args
+
+LOCK_DIR = Path(".tuitka") / "locks"
+LOCK_SUFFIX = ".txt"
+
+
+def get_lock_path(
+    project_dir: Path, requirements: list[str], python_version: str
+) -> Path:
+    key = get_environment_key(requirements, python_version)
+    return project_dir / LOCK_DIR / f"{key}{LOCK_SUFFIX}"
+
+
+def get_script_lock_path(
+    script: Path, requirements: list[str], python_version: str
+) -> Path:
+    """Lock file of a script's build, its project being the script's folder."""
+    return get_lock_path(script.resolve().parent, requirements, python_version)
+
+
+def read_lock(lock_path: Path) -> list[str] | None:
+    """Pinned requirements of a lock file, None if there is none."""
+    try:
+        lines = lock_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    return [
+        normalize_requirement(line)
+        for line in (line.strip() for line in lines)
+        if line and not line.startswith("#")
+    ]
+
+
+def get_lock_digest(lock_path: Path) -> str:
+    return hashlib.sha256(lock_path.read_bytes()).hexdigest()
+
+
+def _format_header(requirements: list[str], python_version: str) -> str:
+    lines = [f"# Locked by tuitka for Python {python_version} from:"]
+    lines.extend(f"#   {requirement}" for requirement in sorted(requirements))
+    lines.append("# Run `tuitka lock --upgrade` on the script to resolve again.")
+    return "\n".join(lines) + "\n"
+
+
+def resolve_lock(
+    lock_path: Path,
+    requirements: list[str],
+    python_version: str,
+    wheelhouse: Path | None = None,
+) -> Path:
+    """Resolve ``requirements`` to the newest matching pins, on every platform.
+
+    Offline, only the packages in ``wheelhouse`` are considered.
+    """
+    result = subprocess.run(
+        [
+            "uv",
+            "pip",
+            "compile",
+            "-",
+            "--universal",
+            "--python-version",
+            python_version,
+            "--no-header",
+            "--quiet",
+            *get_offline_args(wheelhouse),
+        ],
+        input="\n".join(requirements) + "\n",
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    # Written next to the lock file and renamed, builds never see half of it.
+    temp_path = lock_path.with_name(f".{lock_path.name}.{os.getpid()}")
+    try:
+        temp_path.write_text(
+            _format_header(requirements, python_version) + result.stdout,
+            encoding="utf-8",
+        )
+        os.replace(temp_path, lock_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return lock_path
+
+
+def ensure_lock(
+    lock_path: Path,
+    requirements: list[str],
+    python_version: str,
+    upgrade: bool = False,
+    wheelhouse: Path | None = None,
+) -> Path:
+    """Return the lock file for ``requirements``, resolving it once."""
+    with cache_lock(lock_path):
+        if lock_path.exists() and not upgrade:
+            print(f"Using lock file {lock_path}", flush=True)
+            return lock_path
+        print(f"Resolving dependencies into {lock_path}", flush=True)
+        return resolve_lock(lock_path, requirements, python_version, wheelhouse)
+
+
+def run_lock_cli(
+    scripts: list[Path], python_version: str, upgrade: bool = False
+) -> int:
+    """Lock the dependencies of each script's builds, as a build would."""
+    from tuitka.environments import get_nuitka_requirement
+    from tuitka.utils import parse_dependencies
+
+    for script in scripts:
+        metadata = parse_dependencies(script)
+        requirements = [*metadata.dependencies, get_nuitka_requirement()]
+        lock_path = get_script_lock_path(script, requirements, python_version)
+        try:
+            ensure_lock(lock_path, requirements, python_version, upgrade=upgrade)
+        except subprocess.CalledProcessError as error:
+            return error.returncode or 1
+        pins = read_lock(lock_path) or []
+        print(f"{script.name}: {len(pins)} pinned packages in {lock_path}")
+    return 0
+
+
+__all__ = [
+    "LOCK_DIR",
+    "ensure_lock",
+    "get_lock_digest",
+    "get_lock_path",
+    "get_script_lock_path",
+    "read_lock",
+    "resolve_lock",
+    "run_lock_cli",
+]
@@ -0,0 +1,326 @@
+import hashlib
+import importlib.metadata
+import importlib.util
+import re
+from bisect import bisect_left
+from dataclasses import astuple, dataclass
+from functools import cache
+from pathlib import Path
+
+from tuitka.cache import get_cache_dir, read_json, write_json_atomic
+from tuitka.constants import PYTHON_VERSION
+
+# Bump whenever the layout of NuitkaOption or of the cache file changes.
+OPTIONS_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class NuitkaOption:
+    flag: str
+    names: tuple[str, ...]
+    help: str = ""
+    action: str | None = None
+    type: str | None = None
+    default: object = None
+    choices: tuple[str, ...] | None = None
+    metavar: str | None = None
+    dest: str | None = None
+
+    @classmethod
+    def from_config(cls, flag: str, config: dict) -> "NuitkaOption":
+        choices = config.get("choices")
+        return cls(
+            flag=flag,
+            names=tuple(config.get("names") or (flag,)),
+            help=config.get("help") or "",
+            action=config.get("action"),
+            type=config.get("type"),
+            default=_normalize_default(config.get("default")),
+            choices=tuple(str(choice) for choice in choices) if choices else None,
+            metavar=config.get("metavar"),
+            dest=config.get("dest"),
+        )
+
+    @classmethod
+    def from_row(cls, row: list) -> "NuitkaOption":
+        flag, names, help_text, action, type_, default, choices, metavar, dest = row
+        return cls(
+            flag=flag,
+            names=tuple(names),
+            help=help_text,
+            action=action,
+            type=type_,
+            default=tuple(default) if isinstance(default, list) else default,
+            choices=tuple(choices) if choices else None,
+            metavar=metavar,
+            dest=dest,
+        )
+
+    def to_row(self) -> list:
+        return list(astuple(self))
+
+
+def _normalize_default(default):
+    if default is None or isinstance(default, (bool, int, float, str)):
+        return default
+    if isinstance(default, (list, tuple)):
+        return tuple(str(item) for item in default)
+    return str(default)
+
+
+@cache
+def get_nuitka_version() -> str | None:
+    # Looked up once, the metadata search walks sys.path on every call.
+    try:
+        return importlib.metadata.version("nuitka")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _get_nuitka_plugin_names() -> list[str]:
+    spec = importlib.util.find_spec("nuitka")
+    if spec is None or not spec.submodule_search_locations:
+        return []
+    names = []
+    for location in spec.submodule_search_locations:
+        plugins_dir = Path(location) / "plugins"
+        for kind in ("standard", "commercial"):
+            kind_dir = plugins_dir / kind
+            if kind_dir.is_dir():
+                names.extend(
+                    f"{kind}/{entry.name}"
+                    for entry in kind_dir.iterdir()
+                    if entry.suffix == ".py" or entry.is_dir()
+                    if entry.name != "__pycache__"
+                )
+    return sorted(names)
+
+
+def get_options_cache_key() -> str | None:
+    """Identify the option schema without importing Nuitka itself."""
+    nuitka_version = get_nuitka_version()
+    if nuitka_version is None:
+        return None
+    digest = hashlib.sha256()
+    for part in (
+        str(OPTIONS_CACHE_VERSION),
+        PYTHON_VERSION,
+        nuitka_version,
+        *_get_nuitka_plugin_names(),
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _get_options_cache_path(key: str) -> Path:
+    return (
+        get_cache_dir("nuitka-options") / f"options-v{OPTIONS_CACHE_VERSION}-{key}.json"
+    )
+
+
+def _build_options() -> dict[str, dict[str, NuitkaOption]]:
+    from tuitka.utils import create_nuitka_options_dict
+
+    return {
+        group: {
+            flag: NuitkaOption.from_config(flag, config)
+            for flag, config in options.items()
+        }
+        for group, options in create_nuitka_options_dict().items()
+    }
+
+
+def _read_options_cache(path: Path) -> dict[str, dict[str, NuitkaOption]] | None:
+    data = read_json(path)
+    if not isinstance(data, dict) or data.get("version") != OPTIONS_CACHE_VERSION:
+        return None
+    try:
+        return {
+            group: {row[0]: NuitkaOption.from_row(row) for row in rows}
+            for group, rows in data["groups"]
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_options_cache(
+    path: Path, options: dict[str, dict[str, NuitkaOption]]
+) -> None:
+    data = {
+        "version": OPTIONS_CACHE_VERSION,
+        "nuitka": get_nuitka_version(),
+        # A list of pairs keeps the group order stable across JSON readers.
+        "groups": [
+            [group, [option.to_row() for option in group_options.values()]]
+            for group, group_options in options.items()
+        ],
+    }
+    try:
+        write_json_atomic(path, data)
+    except OSError:
+        return
+
+    # Drop schemas of Nuitka versions that are no longer installed.
+    for stale in path.parent.glob("options-*.json"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+@cache
+def load_nuitka_options() -> dict[str, dict[str, NuitkaOption]]:
+    """Return the Nuitka option schema grouped by option group title.
+
+    Extracting the schema from Nuitka's option parser is slow, so the result is
+    stored on disk keyed by the installed Nuitka version and plugin set, and only
+    rebuilt when either of them changes.
+    """
+    key = get_options_cache_key()
+    if key is None:
+        return _build_options()
+
+    cache_path = _get_options_cache_path(key)
+    options = _read_options_cache(cache_path)
+    if options is None:
+        options = _build_options()
+        _write_options_cache(cache_path, options)
+    return options
+
+
+_TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_REGEX.findall(text.lower())
+
+
+class OptionSearchIndex:
+    """Prefix index over the flag names and help texts of the option schema.
+
+    Matches on the flag name rank above matches in the help text. When a query
+    extends the previous one, only the previous matches are searched again,
+    unless its last word now matches differently.
+    """
+
+    SCORE_EXACT = 8
+    SCORE_FLAG_TOKEN = 4
+    SCORE_FLAG_SUBSTRING = 2
+    SCORE_HELP = 1
+
+    def __init__(self, options: dict[str, dict[str, NuitkaOption]]):
+        self.flags: list[str] = []
+        self.flag_texts: list[str] = []
+        self.help_texts: list[str] = []
+        seen = set()
+        for group_options in options.values():
+            for flag, option in group_options.items():
+                if flag not in seen:
+                    seen.add(flag)
+                    self.flags.append(flag)
+                    self.flag_texts.append(flag.lower())
+                    self.help_texts.append(option.help.lower())
+
+        self.flag_postings = self._build_postings(self.flag_texts)
+        self.help_postings = self._build_postings(self.help_texts)
+        self.flag_tokens = sorted(self.flag_postings)
+        self.help_tokens = sorted(self.help_postings)
+
+        self.last_query = ""
+        self.last_matches: set[int] = set(range(len(self.flags)))
+
+    @staticmethod
+    def _build_postings(texts: list[str]) -> dict[str, set[int]]:
+        postings: dict[str, set[int]] = {}
+        for index, text in enumerate(texts):
+            for token in _tokenize(text):
+                postings.setdefault(token, set()).add(index)
+        return postings
+
+    @staticmethod
+    def _prefix_lookup(
+        tokens: list[str], postings: dict[str, set[int]], prefix: str
+    ) -> set[int]:
+        found = set()
+        position = bisect_left(tokens, prefix)
+        while position < len(tokens) and tokens[position].startswith(prefix):
+            found |= postings[tokens[position]]
+            position += 1
+        return found
+
+    def _score_word(self, word: str, candidates: set[int]) -> dict[int, int]:
+        scores = {}
+        bare_word = word.lstrip("-")
+        word_tokens = _tokenize(word)
+
+        if len(word_tokens) == 1:
+            token = word_tokens[0]
+            flag_hits = self._prefix_lookup(self.flag_tokens, self.flag_postings, token)
+            help_hits = self._prefix_lookup(self.help_tokens, self.help_postings, token)
+            for index in help_hits & candidates:
+                scores[index] = self.SCORE_HELP
+        else:
+            flag_hits = set()
+            for index in candidates:
+                if word in self.help_texts[index]:
+                    scores[index] = self.SCORE_HELP
+
+        for index in candidates:
+            flag = self.flag_texts[index]
+            if bare_word and flag.lstrip("-") == bare_word:
+                scores[index] = self.SCORE_EXACT
+            elif index in flag_hits:
+                scores[index] = self.SCORE_FLAG_TOKEN
+            elif word in flag:
+                scores[index] = self.SCORE_FLAG_SUBSTRING
+        return scores
+
+    def _extends_last_query(self, query: str) -> bool:
+        if not self.last_query or not query.startswith(self.last_query):
+            return False
+        last_words = self.last_query.split()
+        word = query.split()[len(last_words) - 1]
+        # Single token words match token prefixes, other words substrings. A
+        # word switching between the two may match options the last did not.
+        return (len(_tokenize(last_words[-1])) == 1) == (len(_tokenize(word)) == 1)
+
+    def search(self, query: str) -> list[str]:
+        """Return the flags matching every word of the query, best match first."""
+        query = query.lower().strip()
+        if not query:
+            self.last_query = ""
+            self.last_matches = set(range(len(self.flags)))
+            return list(self.flags)
+
+        if self._extends_last_query(query):
+            candidates = self.last_matches
+        else:
+            candidates = set(range(len(self.flags)))
+
+        totals = dict.fromkeys(candidates, 0)
+        for word in query.split():
+            scores = self._score_word(word, set(totals))
+            totals = {
+                index: total + scores[index]
+                for index, total in totals.items()
+                if index in scores
+            }
+
+        self.last_query = query
+        self.last_matches = set(totals)
+        ranked = sorted(totals, key=lambda index: (-totals[index], index))
+        return [self.flags[index] for index in ranked]
+
+
+@cache
+def load_option_search_index() -> OptionSearchIndex:
+    return OptionSearchIndex(load_nuitka_options())
+
+
+__all__ = [
+    "NuitkaOption",
+    "OptionSearchIndex",
+    "get_nuitka_version",
+    "get_options_cache_key",
+    "load_nuitka_options",
+    "load_option_search_index",
+]
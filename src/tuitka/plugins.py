@@ -0,0 +1,251 @@
+from dataclasses import dataclass
+from functools import cache
+
+# Standalone, onefile and app builds carry their own copy of everything.
+PACKAGED = "packaged"
+# Builds that use the installed Python and packages at run time.
+ACCELERATED = "accelerated"
+
+ALL_MODES = frozenset({PACKAGED, ACCELERATED})
+PACKAGED_ONLY = frozenset({PACKAGED})
+
+
+@dataclass(frozen=True)
+class PluginRule:
+    """When a Nuitka plugin is needed, matched against top level import names."""
+
+    plugin: str
+    imports: tuple[str, ...]
+    reason: str
+    modes: frozenset[str] = ALL_MODES
+    # Nuitka enables the plugin by itself, nothing needs to be passed.
+    automatic: bool = False
+    # Nuitka refuses several plugins of a group, the first matching rule wins.
+    group: str | None = None
+
+
+# The plugins Nuitka ships that are tied to imports, in order of precedence.
+# Plugins for other purposes (anti-bloat, upx, no-qt, data-files, ...) are
+# chosen through the build options instead.
+PLUGIN_RULES = (
+    PluginRule(
+        "pyside6",
+        ("PySide6",),
+        "Qt plugins and DLLs of PySide6",
+        modes=PACKAGED_ONLY,
+        group="qt",
+    ),
+    PluginRule(
+        "pyqt6",
+        ("PyQt6",),
+        "Qt plugins and DLLs of PyQt6",
+        modes=PACKAGED_ONLY,
+        group="qt",
+    ),
+    PluginRule(
+        "pyside2",
+        ("PySide2",),
+        "Qt plugins and DLLs of PySide2",
+        modes=PACKAGED_ONLY,
+        group="qt",
+    ),
+    PluginRule(
+        "pyqt5",
+        ("PyQt5",),
+        "Qt plugins and DLLs of PyQt5",
+        modes=PACKAGED_ONLY,
+        group="qt",
+    ),
+    PluginRule(
+        "tk-inter",
+        ("tkinter", "Tkinter", "_tkinter", "turtle", "idlelib"),
+        "Tcl/Tk runtime files",
+        modes=PACKAGED_ONLY,
+    ),
+    PluginRule(
+        "pmw-freezer",
+        ("Pmw",),
+        "freezing of Pmw's lazy loader",
+        modes=PACKAGED_ONLY,
+    ),
+    PluginRule(
+        "dill-compat",
+        ("dill", "cloudpickle"),
+        "pickling of compiled functions",
+    ),
+    PluginRule(
+        "multiprocessing",
+        ("multiprocessing", "concurrent"),
+        "child processes",
+        automatic=True,
+    ),
+    PluginRule("matplotlib", ("matplotlib",), "backends and data", automatic=True),
+    PluginRule("kivy", ("kivy",), "Kivy providers", automatic=True),
+    PluginRule("gevent", ("gevent",), "gevent's hubs", automatic=True),
+    PluginRule("eventlet", ("eventlet",), "monkey patched DNS", automatic=True),
+    PluginRule("gi", ("gi",), "GI typelibs", automatic=True),
+    PluginRule("glfw", ("glfw", "OpenGL"), "OpenGL libraries", automatic=True),
+    PluginRule("pywebview", ("webview",), "webview backends", automatic=True),
+    PluginRule("spacy", ("spacy",), "spaCy models", automatic=True),
+    PluginRule("transformers", ("transformers",), "lazy model imports", automatic=True),
+    PluginRule("playwright", ("playwright",), "browser drivers", automatic=True),
+    PluginRule("pbr-compat", ("pbr",), "pbr's version lookup", automatic=True),
+    PluginRule(
+        "pkg-resources", ("pkg_resources",), "pkg_resources lookups", automatic=True
+    ),
+)
+
+
+@dataclass(frozen=True)
+class PluginDecision:
+    plugin: str
+    # "enable" passes the plugin to Nuitka. "automatic" ones Nuitka enables by
+    # itself, "configured" ones the build options name already, "skip" ones
+    # are not used.
+    action: str
+    reason: str
+    imports: tuple[str, ...] = ()
+
+    @property
+    def flag(self) -> str:
+        return f"--enable-plugin={self.plugin}"
+
+    def describe(self) -> str:
+        found = f"imports {', '.join(self.imports)}" if self.imports else ""
+        if self.action == "enable":
+            return f"{self.plugin}: {self.reason} ({found})"
+        if self.action == "automatic":
+            return f"{self.plugin}: enabled by Nuitka ({found})"
+        if self.action == "configured":
+            return f"{self.plugin}: {self.reason}"
+        return f"{self.plugin}: not enabled, {self.reason}"
+
+
+class PluginMatcher:
+    """Rules indexed by import name, so matching is linear in the imports."""
+
+    def __init__(self, rules: tuple[PluginRule, ...]) -> None:
+        self.rules = rules
+        self.index: dict[str, list[int]] = {}
+        for position, rule in enumerate(rules):
+            for name in rule.imports:
+                self.index.setdefault(name, []).append(position)
+
+    def match(self, imports, mode: str) -> list[PluginDecision]:
+        found: dict[int, list[str]] = {}
+        for name in imports:
+            for position in self.index.get(name, ()):
+                found.setdefault(position, []).append(name)
+
+        decisions = []
+        group_winners: dict[str, str] = {}
+        for position in sorted(found):
+            rule = self.rules[position]
+            names = tuple(sorted(found[position]))
+            if mode not in rule.modes:
+                decisions.append(
+                    PluginDecision(
+                        rule.plugin, "skip", "only needed for standalone builds", names
+                    )
+                )
+            elif rule.automatic:
+                decisions.append(
+                    PluginDecision(rule.plugin, "automatic", rule.reason, names)
+                )
+            elif rule.group in group_winners:
+                decisions.append(
+                    PluginDecision(
+                        rule.plugin,
+                        "skip",
+                        f"conflicts with {group_winners[rule.group]}",
+                        names,
+                    )
+                )
+            else:
+                if rule.group is not None:
+                    group_winners[rule.group] = rule.plugin
+                decisions.append(
+                    PluginDecision(rule.plugin, "enable", rule.reason, names)
+                )
+        return decisions
+
+
+@cache
+def get_plugin_matcher() -> PluginMatcher:
+    return PluginMatcher(PLUGIN_RULES)
+
+
+def get_build_mode(nuitka_options: dict) -> str:
+    if (
+        nuitka_options.get("--standalone")
+        or nuitka_options.get("--onefile")
+        or nuitka_options.get("--mode") in ("standalone", "onefile", "app")
+    ):
+        return PACKAGED
+    return ACCELERATED
+
+
+def match_plugins(imports, mode: str) -> list[PluginDecision]:
+    return get_plugin_matcher().match(imports, mode)
+
+
+def _option_plugins(nuitka_options: dict, option: str) -> set[str]:
+    plugins = set()
+    for flag, value in nuitka_options.items():
+        name, _, inline_value = flag.partition("=")
+        if name not in (option, f"{option}s") or value in (None, False):
+            continue
+        values = [inline_value] if inline_value else value
+        if isinstance(values, str):
+            values = [values]
+        elif not isinstance(values, (list, tuple)):
+            continue
+        for item in values:
+            if isinstance(item, str):
+                plugins.update(part.strip() for part in item.split(",") if part)
+    return plugins
+
+
+def apply_build_options(
+    decisions: list[PluginDecision], nuitka_options: dict
+) -> list[PluginDecision]:
+    """Respect plugins the build options enable or disable already."""
+    enabled = _option_plugins(nuitka_options, "--enable-plugin")
+    disabled = _option_plugins(nuitka_options, "--disable-plugin")
+    result = []
+    for decision in decisions:
+        if decision.action == "enable" and decision.plugin in disabled:
+            decision = PluginDecision(
+                decision.plugin,
+                "skip",
+                "disabled by the build options",
+                decision.imports,
+            )
+        elif decision.action == "enable" and decision.plugin in enabled:
+            decision = PluginDecision(
+                decision.plugin,
+                "configured",
+                "enabled by the build options",
+                decision.imports,
+            )
+        result.append(decision)
+    return result
+
+
+def describe_plugin_decisions(decisions: list[PluginDecision]) -> str:
+    return "Plugins: " + " · ".join(decision.describe() for decision in decisions)
+
+
+__all__ = [
+    "ACCELERATED",
+    "PACKAGED",
+    "PLUGIN_RULES",
+    "PluginDecision",
+    "PluginMatcher",
+    "PluginRule",
+    "apply_build_options",
+    "describe_plugin_decisions",
+    "get_build_mode",
+    "get_plugin_matcher",
+    "match_plugins",
+]
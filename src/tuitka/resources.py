@@ -0,0 +1,220 @@
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# Rough peak memory of one C compiler process on Nuitka's generated code.
+MEMORY_PER_COMPILE_JOB = 1024**3
+# Peak memory of linking a whole program with LTO, for small and large programs.
+LTO_MEMORY_SMALL = 2 * 1024**3
+LTO_MEMORY_LARGE = 8 * 1024**3
+# Below this many CPUs, LTO makes linking a large program too slow.
+LTO_MIN_CPUS_LARGE = 4
+# Programs with this much own code or this many compiled dependencies are large.
+LARGE_PROJECT_BYTES = 1024**2
+LARGE_PROJECT_DEPENDENCIES = 10
+
+# cgroup v1 reports "no limit" as a huge page aligned number.
+_CGROUP_V1_UNLIMITED = 1 << 60
+
+
+def _read_cgroup_file(controller: str, name: str) -> str | None:
+    """A cgroup file of this process, ``controller`` is empty for cgroup v2."""
+    candidates = []
+    try:
+        for line in Path("/proc/self/cgroup").read_text().splitlines():
+            hierarchy, controllers, path = line.split(":", 2)
+            if (hierarchy == "0" and not controller) or (
+                controller and controller in controllers.split(",")
+            ):
+                for mount in dict.fromkeys((controllers, controller)):
+                    base = CGROUP_ROOT / mount if mount else CGROUP_ROOT
+                    # Inside a container the own cgroup is usually the root.
+                    candidates += [base / path.lstrip("/") / name, base / name]
+    except (OSError, ValueError):
+        return None
+
+    for candidate in candidates:
+        try:
+            return candidate.read_text().strip()
+        except OSError:
+            continue
+    return None
+
+
+def get_cgroup_cpu_limit() -> float | None:
+    """CPUs the cgroup CPU quota allows, None without a quota."""
+    cpu_max = _read_cgroup_file("", "cpu.max")
+    try:
+        if cpu_max is not None:
+            quota, _, period = cpu_max.partition(" ")
+            if quota != "max":
+                return int(quota) / int(period or 100000)
+            return None
+
+        quota = _read_cgroup_file("cpu", "cpu.cfs_quota_us")
+        period = _read_cgroup_file("cpu", "cpu.cfs_period_us")
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+    except ValueError:
+        pass
+    return None
+
+
+def get_cgroup_available_memory() -> int | None:
+    """Memory left below the cgroup memory limit, None without a limit."""
+    try:
+        limit = _read_cgroup_file("", "memory.max")
+        if limit is not None:
+            if limit == "max":
+                return None
+            usage = int(_read_cgroup_file("", "memory.current") or 0)
+            # Reclaimable page cache counts towards the usage as well.
+            for line in (_read_cgroup_file("", "memory.stat") or "").splitlines():
+                if line.startswith("inactive_file "):
+                    usage -= int(line.split()[1])
+            return max(0, int(limit) - usage)
+
+        limit = _read_cgroup_file("memory", "memory.limit_in_bytes")
+        if limit is None or int(limit) >= _CGROUP_V1_UNLIMITED:
+            return None
+        usage = int(_read_cgroup_file("memory", "memory.usage_in_bytes") or 0)
+        return max(0, int(limit) - usage)
+    except ValueError:
+        return None
+
+
+def get_cpu_count() -> int:
+    """Number of CPUs this process may run on, as limited by its cgroup."""
+    if hasattr(os, "sched_getaffinity"):
+        cpu_count = max(1, len(os.sched_getaffinity(0)))
+    else:
+        cpu_count = os.cpu_count() or 1
+
+    cpu_limit = get_cgroup_cpu_limit()
+    if cpu_limit is not None:
+        cpu_count = min(cpu_count, max(1, int(cpu_limit)))
+    return cpu_count
+
+
+def get_available_memory() -> int | None:
+    """Memory in bytes that can be used without swapping, if it can be determined."""
+    if sys.platform.startswith("linux"):
+        available = None
+        try:
+            for line in Path("/proc/meminfo").read_text().splitlines():
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+
+        cgroup_available = get_cgroup_available_memory()
+        if cgroup_available is not None:
+            available = min(available or cgroup_available, cgroup_available)
+        if available is not None:
+            return available
+
+    if hasattr(os, "sysconf"):
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError):
+            pass
+
+    return None
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@dataclass
+class ResourceProfile:
+    """Nuitka options picked for the machine and project, with the reasons."""
+
+    cpu_count: int
+    available_memory: int | None
+    project_size: int
+    options: dict[str, str] = field(default_factory=dict)
+    reasons: dict[str, str] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        return "\n".join(
+            f"{flag}={value}: {self.reasons[flag]}"
+            for flag, value in self.options.items()
+        )
+
+
+def get_resource_profile(
+    nuitka_options: dict, project_size: int, dependency_count: int = 0
+) -> ResourceProfile:
+    """Pick --jobs and --lto unless they are set already.
+
+    ``project_size`` is the size in bytes of the project's own modules.
+    """
+    cpu_count = get_cpu_count()
+    cpu_limit = get_cgroup_cpu_limit()
+    available_memory = get_available_memory()
+    profile = ResourceProfile(cpu_count, available_memory, project_size)
+
+    if "--jobs" not in nuitka_options:
+        cpus = f"{cpu_count} CPU{'s' if cpu_count != 1 else ''}"
+        if cpu_limit is not None and int(cpu_limit) <= cpu_count:
+            cpus += " allowed by the cgroup quota"
+        jobs, reason = cpu_count, cpus
+        if available_memory is not None:
+            memory_jobs = max(1, available_memory // MEMORY_PER_COMPILE_JOB)
+            if memory_jobs < cpu_count:
+                jobs = memory_jobs
+                reason = (
+                    f"{format_size(available_memory)} available memory for "
+                    f"C compilers on {cpus}"
+                )
+        profile.options["--jobs"] = str(jobs)
+        profile.reasons["--jobs"] = reason
+
+    if "--lto" not in nuitka_options and available_memory is not None:
+        # Dependencies are only compiled along with the program when standalone.
+        compiles_dependencies = any(
+            nuitka_options.get(flag) for flag in ("--standalone", "--onefile")
+        ) or nuitka_options.get("--mode") in ("standalone", "onefile", "app")
+        is_large = project_size >= LARGE_PROJECT_BYTES or (
+            compiles_dependencies and dependency_count >= LARGE_PROJECT_DEPENDENCIES
+        )
+        program = "a large program" if is_large else "a small program"
+        required_memory = LTO_MEMORY_LARGE if is_large else LTO_MEMORY_SMALL
+
+        if available_memory < required_memory:
+            lto = "no"
+            reason = (
+                f"{format_size(available_memory)} available memory, LTO of "
+                f"{program} needs about {format_size(required_memory)}"
+            )
+        elif is_large and cpu_count < LTO_MIN_CPUS_LARGE:
+            lto = "no"
+            reason = f"LTO of {program} would make linking slow on {cpu_count} CPUs"
+        else:
+            lto = "yes"
+            reason = (
+                f"{format_size(available_memory)} available memory is enough "
+                f"for LTO of {program}"
+            )
+        profile.options["--lto"] = lto
+        profile.reasons["--lto"] = reason
+
+    return profile
+
+
+__all__ = [
+    "ResourceProfile",
+    "format_size",
+    "get_available_memory",
+    "get_cgroup_available_memory",
+    "get_cgroup_cpu_limit",
+    "get_cpu_count",
+    "get_resource_profile",
+]
@@ -0,0 +1,398 @@
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from tuitka.resources import format_size
+
+# What the files of a program are, the main program holds the compiled Python
+# code of the script and of every package compiled into it.
+PROGRAM = "program"
+EXTENSION = "extension"
+LIBRARY = "library"
+DATA = "data"
+KIND_LABELS = {
+    PROGRAM: "Program and compiled Python code",
+    EXTENSION: "Extension modules",
+    LIBRARY: "Shared libraries",
+    DATA: "Data files",
+}
+
+SORT_KEYS = ("size", "name")
+
+# Nuitka appends the onefile payload to the bootstrap binary: "KA", then "X"
+# for plain or "Y" for zstd compressed files, the files and their size last.
+_PAYLOAD_MAGIC = b"KA"
+_PAYLOAD_SIZE = struct.Struct("<Q")
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_FILE_SIZE = struct.Struct("<Q")
+_CHECKSUM = struct.Struct("<I")
+_SYMLINK_FLAG = 2
+# Longer names are a sign of reading the payload with the wrong layout.
+_MAX_NAME_BYTES = 4096
+_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class SizeNode:
+    """A file of a program, or a folder with the summed size of its files."""
+
+    name: str
+    size: int = 0
+    kind: str | None = None
+    children: dict[str, "SizeNode"] = field(default_factory=dict)
+
+    @property
+    def is_folder(self) -> bool:
+        return self.kind is None
+
+    def add(self, parts: tuple[str, ...], size: int, kind: str) -> None:
+        self.size += size
+        node = self
+        for name in parts[:-1]:
+            node = node.children.setdefault(name, SizeNode(name))
+            node.size += size
+        node.children[parts[-1]] = SizeNode(parts[-1], size, kind)
+
+    def sorted_children(self, by: str = "size") -> list["SizeNode"]:
+        if by == "name":
+            return sorted(self.children.values(), key=lambda node: node.name.lower())
+        return sorted(
+            self.children.values(), key=lambda node: (-node.size, node.name.lower())
+        )
+
+    def walk(self):
+        for child in self.children.values():
+            yield child
+            yield from child.walk()
+
+    def to_dict(self) -> dict:
+        data = {"name": self.name, "size": self.size}
+        if self.is_folder:
+            data["children"] = [child.to_dict() for child in self.sorted_children()]
+        else:
+            data["kind"] = self.kind
+        return data
+
+
+@dataclass
+class SizeReport:
+    """Where the size of a built program goes."""
+
+    artifact: Path
+    # "folder" for standalone and app bundle builds, "onefile" for a binary
+    # with a payload, "file" for a program or module alone.
+    layout: str
+    root: SizeNode
+    disk_size: int
+    # The bootstrap binary and the payload as stored, for onefile programs.
+    bootstrap_size: int | None = None
+    payload_size: int | None = None
+    compressed: bool = False
+
+    @property
+    def kinds(self) -> dict[str, int]:
+        sizes = dict.fromkeys(KIND_LABELS, 0)
+        for node in self.root.walk():
+            if not node.is_folder:
+                sizes[node.kind] += node.size
+        return sizes
+
+    @property
+    def packages(self) -> dict[str, int]:
+        """Top level folders, the Python packages and the libraries they bring."""
+        return {
+            node.name: node.size
+            for node in self.root.sorted_children()
+            if node.is_folder
+        }
+
+    @property
+    def compression_ratio(self) -> float | None:
+        if not self.compressed or not self.root.size:
+            return None
+        return self.payload_size / self.root.size
+
+    def describe(self) -> str:
+        text = f"{self.artifact.name}: {format_size(self.disk_size)} on disk"
+        if self.layout == "onefile":
+            text += (
+                f", {format_size(self.root.size)} unpacked from a "
+                f"{format_size(self.payload_size)} payload"
+            )
+            if self.compression_ratio is not None:
+                text += f" ({self.compression_ratio:.0%} compressed)"
+        return text
+
+    def to_dict(self) -> dict:
+        return {
+            "artifact": str(self.artifact),
+            "layout": self.layout,
+            "disk_size": self.disk_size,
+            "unpacked_size": self.root.size,
+            "bootstrap_size": self.bootstrap_size,
+            "payload_size": self.payload_size,
+            "compressed": self.compressed,
+            "kinds": self.kinds,
+            "packages": self.packages,
+            "tree": self.root.to_dict(),
+        }
+
+    def make_kinds_table(self):
+        from rich.table import Table
+
+        table = Table(title=self.describe(), title_justify="left")
+        table.add_column("Kind")
+        table.add_column("Size", justify="right")
+        table.add_column("Share", justify="right")
+        for kind, size in sorted(self.kinds.items(), key=lambda item: -item[1]):
+            share = size / self.root.size if self.root.size else 0
+            table.add_row(KIND_LABELS[kind], format_size(size), f"{share:.1%}")
+        return table
+
+    def make_tree(self, depth: int = 2, by: str = "size"):
+        from rich.text import Text
+        from rich.tree import Tree
+
+        def add_children(branch, node: SizeNode, level: int) -> None:
+            for child in node.sorted_children(by):
+                sub_branch = branch.add(Text(format_node(child, self.root.size)))
+                if child.is_folder and level < depth:
+                    add_children(sub_branch, child, level + 1)
+
+        tree = Tree(Text(format_node(self.root, self.root.size)))
+        add_children(tree, self.root, 1)
+        return tree
+
+
+def format_node(node: SizeNode, total: int) -> str:
+    share = node.size / total if total else 0
+    label = f"{node.name}/" if node.is_folder else node.name
+    kind = "" if node.is_folder else f", {node.kind}"
+    return f"{label}  {format_size(node.size)} ({share:.1%}{kind})"
+
+
+def classify_file(path: PurePosixPath) -> str:
+    name = path.name.lower()
+    suffix = path.suffix.lower()
+    if (
+        suffix in (".dll", ".dylib")
+        or ".so." in name
+        or (suffix == ".so" and name.startswith("lib"))
+    ):
+        return LIBRARY
+    if suffix in (".pyd", ".so"):
+        return EXTENSION
+    return DATA
+
+
+class _PayloadStream:
+    """Reads the files of a payload exactly, decompressing them if needed."""
+
+    def __init__(self, file, limit: int, decompressor=None) -> None:
+        self.file = file
+        self.limit = limit
+        self.decompressor = decompressor
+        self.buffer = bytearray()
+
+    def _fill(self, size: int) -> bool:
+        while len(self.buffer) < size:
+            chunk = self.file.read(min(_CHUNK_SIZE, self.limit))
+            if not chunk:
+                return False
+            self.limit -= len(chunk)
+            if self.decompressor is not None:
+                chunk = self.decompressor.decompress(chunk)
+            self.buffer += chunk
+        return True
+
+    def read(self, size: int) -> bytes:
+        if not self._fill(size):
+            raise ValueError("the payload ends early")
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def read_name(self) -> str:
+        end = self.buffer.find(0)
+        while end == -1:
+            if len(self.buffer) > _MAX_NAME_BYTES or not self._fill(
+                len(self.buffer) + 1
+            ):
+                raise ValueError("a file name in the payload does not end")
+            end = self.buffer.find(0)
+        name = self.read(end + 1)[:-1]
+        return name.decode("utf-8")
+
+    def skip(self, size: int) -> None:
+        while size:
+            if not self._fill(1):
+                raise ValueError("the payload ends early")
+            step = min(size, len(self.buffer))
+            del self.buffer[:step]
+            size -= step
+
+    def at_end(self) -> bool:
+        return not self._fill(1)
+
+
+def _parse_payload_files(
+    stream: _PayloadStream, checksums: bool, archive: bool
+) -> list[tuple[str, int]]:
+    files = []
+    while name := stream.read_name():
+        flags = stream.read(1)[0]
+        if flags > 3:
+            raise ValueError(f"unknown flags for {name!r}")
+        if flags & _SYMLINK_FLAG:
+            stream.read_name()
+            continue
+        (size,) = _FILE_SIZE.unpack(stream.read(_FILE_SIZE.size))
+        if checksums:
+            stream.read(_CHECKSUM.size)
+        stored_size = size
+        if archive:
+            (stored_size,) = _CHECKSUM.unpack(stream.read(_CHECKSUM.size))
+        stream.skip(stored_size)
+        files.append((name, size))
+    if not files or not stream.at_end():
+        raise ValueError("the payload does not end after its last file")
+    return files
+
+
+def read_onefile_payload(path: Path) -> tuple[int, int, bool, list] | None:
+    """Start, size, compression and files of a onefile payload, None without one.
+
+    Files are unpacked to (name, size) pairs, the program to start first. Windows
+    programs keep their payload in a resource, those are not found.
+    """
+    with open(path, "rb") as file:
+        end = file.seek(0, os.SEEK_END) - _PAYLOAD_SIZE.size
+        if end < len(_PAYLOAD_MAGIC) + 1:
+            return None
+        file.seek(end)
+        (payload_size,) = _PAYLOAD_SIZE.unpack(file.read(_PAYLOAD_SIZE.size))
+        start = end - payload_size
+        if not 0 <= start < end:
+            return None
+        file.seek(start)
+        header = file.read(len(_PAYLOAD_MAGIC) + 1)
+        if header[:2] != _PAYLOAD_MAGIC or header[2:] not in (b"X", b"Y"):
+            return None
+        compressed = header[2:] == b"Y"
+        data_start = file.tell()
+        # Archives compress each file on its own, then the files are not a
+        # single zstd stream.
+        archive = compressed and file.read(len(_ZSTD_MAGIC)) != _ZSTD_MAGIC
+
+        errors = (ValueError, UnicodeDecodeError)
+        if compressed and not archive:
+            import zstandard
+
+            errors += (zstandard.ZstdError,)
+
+        # Whether files carry a checksum depends on Nuitka options that are
+        # not recorded, only one of both layouts reads to the end.
+        error = None
+        for checksums in (False, True):
+            file.seek(data_start)
+            decompressor = None
+            if compressed and not archive:
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+            stream = _PayloadStream(file, end - data_start, decompressor)
+            try:
+                files = _parse_payload_files(stream, checksums, archive)
+            except errors as parse_error:
+                error = parse_error
+                continue
+            return start, payload_size, compressed, files
+    raise ValueError(f"Can not read the onefile payload of {path}: {error}")
+
+
+def _analyze_folder(folder: Path) -> SizeNode:
+    from tuitka.benchmark import find_executable
+
+    program = find_executable(folder)
+    root = SizeNode(folder.name)
+    for directory, _, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            path = Path(directory, filename)
+            if path.is_symlink():
+                continue
+            relative = PurePosixPath(path.relative_to(folder).as_posix())
+            kind = PROGRAM if path == program else classify_file(relative)
+            root.add(relative.parts, path.stat().st_size, kind)
+    return root
+
+
+def analyze_artifact(artifact: Path) -> SizeReport:
+    """Break down the size of a build output by its files."""
+    artifact = artifact.resolve()
+    if artifact.is_dir():
+        root = _analyze_folder(artifact)
+        return SizeReport(artifact, "folder", root, disk_size=root.size)
+
+    disk_size = artifact.stat().st_size
+    payload = read_onefile_payload(artifact)
+    root = SizeNode(artifact.name)
+    if payload is None:
+        relative = PurePosixPath(artifact.name)
+        kind = PROGRAM if os.access(artifact, os.X_OK) else classify_file(relative)
+        root.add(relative.parts, disk_size, kind)
+        return SizeReport(artifact, "file", root, disk_size)
+
+    start, payload_size, compressed, files = payload
+    for index, (name, size) in enumerate(files):
+        relative = PurePosixPath(name)
+        kind = PROGRAM if index == 0 else classify_file(relative)
+        root.add(relative.parts, size, kind)
+    return SizeReport(
+        artifact,
+        "onefile",
+        root,
+        disk_size,
+        bootstrap_size=start,
+        payload_size=payload_size,
+        compressed=compressed,
+    )
+
+
+def analyze_artifacts(artifacts: list[Path]) -> list[SizeReport]:
+    return [analyze_artifact(artifact) for artifact in artifacts]
+
+
+def run_size_cli(
+    artifacts: list[Path], as_json: bool = False, depth: int = 2, by: str = "size"
+) -> None:
+    """Print where the size of each build output goes."""
+    reports = analyze_artifacts(artifacts)
+    if as_json:
+        import json
+
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+        return
+
+    from rich.console import Console
+
+    console = Console()
+    for report in reports:
+        console.print(report.make_kinds_table())
+        console.print(report.make_tree(depth, by))
+
+
+__all__ = [
+    "DATA",
+    "EXTENSION",
+    "KIND_LABELS",
+    "LIBRARY",
+    "PROGRAM",
+    "SORT_KEYS",
+    "SizeNode",
+    "SizeReport",
+    "analyze_artifact",
+    "analyze_artifacts",
+    "classify_file",
+    "format_node",
+    "read_onefile_payload",
+    "run_size_cli",
+]
@@ -0,0 +1,66 @@
+import sys
+import time
+
+# Taken when tuitka is first imported, before any of its other imports.
+STARTED = time.perf_counter()
+STARTED_MODULES = len(sys.modules)
+
+from dataclasses import dataclass, field  # noqa: E402
+
+
+@dataclass
+class StartupStep:
+    name: str
+    duration: float
+    modules: int
+
+
+@dataclass
+class StartupProfile:
+    """Time the steps from importing tuitka to the first frame on screen.
+
+    Each mark ends a step that began at the previous mark, or at ``started``
+    for the first one. The number of modules imported during a step is kept
+    as well, it is what usually makes a step slow.
+    """
+
+    started: float
+    started_modules: int = 0
+    mode: str = ""
+    steps: list[StartupStep] = field(default_factory=list)
+    last_mark: float = field(init=False)
+    last_modules: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.last_mark = self.started
+        self.last_modules = self.started_modules
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.steps.append(
+            StartupStep(name, now - self.last_mark, modules - self.last_modules)
+        )
+        self.last_mark = now
+        self.last_modules = modules
+
+    @property
+    def total(self) -> float:
+        return self.last_mark - self.started
+
+    def format_report(self) -> str:
+        width = max([len(step.name) for step in self.steps] + [len("total")])
+        lines = [f"tuitka startup ({self.mode})" if self.mode else "tuitka startup"]
+        for step in self.steps:
+            lines.append(
+                f"  {step.name:<{width}}  {step.duration * 1000:8.1f} ms"
+                f"  {step.modules:+5d} modules"
+            )
+        lines.append(
+            f"  {'total':<{width}}  {self.total * 1000:8.1f} ms"
+            f"  {self.last_modules - self.started_modules:+5d} modules"
+        )
+        return "\n".join(lines)
+
+
+__all__ = ["STARTED", "STARTED_MODULES", "StartupProfile", "StartupStep"]
@@ -3,7 +3,7 @@ from textual.reactive import reactive
 from textual.widgets import Footer, Header
 
 from tuitka.assets import STYLE_MAIN
-from tuitka.widgets.modals import SplashScreen, SupportNuitkaModal
+from tuitka.widgets.modals.splash import SplashScreen
 from tuitka.widgets.script_input import ScriptInputWidget
 
 
@@ -14,14 +14,45 @@ class NuitkaTUI(App):
 
     BINDINGS = [
         ("ctrl+s", "show_support", "Support Nuitka"),
+        ("ctrl+b", "toggle_build_queue", "Build queue"),
     ]
 
+    def __init__(self, *, startup_profile=None) -> None:
+        super().__init__()
+        self.startup_profile = startup_profile
+
     def on_mount(self) -> None:
         self.push_screen(SplashScreen())
 
+    def on_ready(self) -> None:
+        # Profiling startup ends with the first frame, nothing else is timed.
+        if self.startup_profile is not None:
+            self.startup_profile.mark("first paint")
+            self.exit()
+
     def action_show_support(self) -> None:
+        from tuitka.widgets.modals.support import SupportNuitkaModal
+
         self.push_screen(SupportNuitkaModal())
 
+    async def enqueue_build(self, job, label: str = "") -> None:
+        """Add a build to the queue panel, which is created by the first one."""
+        from tuitka.widgets.build_queue_panel import BuildQueuePanel
+
+        panels = self.query(BuildQueuePanel)
+        if panels:
+            panel = panels.first()
+        else:
+            panel = BuildQueuePanel(id="build_queue")
+            await self.mount(panel, before=self.query_one(Footer))
+        await panel.enqueue(job, label)
+
+    def action_toggle_build_queue(self) -> None:
+        panels = self.query("#build_queue")
+        if panels:
+            panel = panels.first()
+            panel.display = not panel.display
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         yield ScriptInputWidget()
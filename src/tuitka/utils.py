@@ -1,9 +1,19 @@
+import glob
 import os
 import re
 import toml
 import ast
 from contextlib import contextmanager
 from tuitka.constants import PYTHON_VERSION
+from tuitka.plugins import (
+    ACCELERATED,
+    PACKAGED,
+    PluginDecision,
+    apply_build_options,
+    get_build_mode,
+    match_plugins,
+)
+from tuitka.resources import ResourceProfile, get_resource_profile
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -28,6 +38,19 @@ def error(message: str, title: str = "Error", subtitle: Optional[str] = None):
     print(Panel.fit(message, **panel_kwargs))
 
 
+def expand_script_paths(patterns: list[str]) -> list[Path]:
+    """Resolve script arguments, expanding glob patterns the shell left alone."""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            paths.extend(Path(match).resolve() for match in matches)
+        else:
+            paths.append(Path(pattern).resolve())
+    # Keep the first occurrence of scripts matched by several patterns.
+    return list(dict.fromkeys(paths))
+
+
 @contextmanager
 def chdir_context(path: Path):
     original_cwd = Path.cwd()
@@ -43,6 +66,21 @@ class DependenciesMetadata:
     dependencies: list[str]
     requirements_path: Optional[Path] = None
     detected_imports: list[str] = field(default_factory=list)
+    # Detected imports no installed or known distribution could be found for.
+    unresolved_imports: list[str] = field(default_factory=list)
+    # The script and the local modules it imports.
+    local_modules: list[Path] = field(default_factory=list)
+    # Set by prepare_nuitka_command() when it picked --jobs or --lto.
+    resource_profile: ResourceProfile | None = None
+    # Set by prepare_nuitka_command(), why each plugin is used or not.
+    plugin_decisions: list[PluginDecision] = field(default_factory=list)
+
+    def describe_unresolved_imports(self) -> str:
+        return (
+            f"Unresolved imports: {', '.join(self.unresolved_imports)} · no "
+            "installed or known package provides them, declare their packages in "
+            "a PEP 723 block or requirements.txt"
+        )
 
     def to_pep_723(self) -> str:
         script_metadata = {"dependencies": self.dependencies}
@@ -96,6 +134,14 @@ class DependencyParser:
 
     def __init__(self, path: Path):
         self.path = path
+        self.local_modules = [path]
+        # Everything imported, including the standard library.
+        self.imports: list[str] = []
+        self.pep_723_block: str | None = None
+        # Files besides the script the result depends on, and candidates that
+        # would have changed it had they existed.
+        self.input_files: list[Path] = []
+        self.missing_files: list[Path] = []
 
     def parse_pep_723(self, script: str) -> list[str]:
         name = "script"
@@ -109,6 +155,7 @@ class DependencyParser:
             return []
         if len(matches) > 1:
             raise ValueError(f"Multiple {name} blocks found. You can write only one")
+        self.pep_723_block = matches[0].group(0)
         group = matches[0].groupdict()
         content = "".join(
             line[2:] for line in group["content"].splitlines(keepends=True)
@@ -142,7 +189,8 @@ class DependencyParser:
         if project_deps:
             deps += [d for d in project_deps if isinstance(d, str)]
 
-        return list(set(deps))
+        # Deduplicated in declaration order, so builds see a stable list.
+        return list(dict.fromkeys(deps))
 
     def scan_for_imports(self, script: str) -> list[str]:
         try:
@@ -160,12 +208,26 @@ class DependencyParser:
         except SyntaxError:
             return []
 
+    def scan_project_imports(self, script: str) -> list[str]:
+        """Third party imports of the script and the local modules it imports."""
+        from tuitka.import_graph import scan_project_imports
+
+        try:
+            graph = scan_project_imports(self.path)
+        except (OSError, RecursionError):
+            detected_imports = self.scan_for_imports(script)
+            self.imports = detected_imports
+            return detected_imports
+        self.local_modules = [path for path in graph.modules if path.is_file()]
+        self.imports = sorted(graph.imports)
+        return graph.external_imports
+
     def parse(self) -> DependenciesMetadata:
         if not self.path or not self.path.exists():
             return DependenciesMetadata(dependencies=[])
 
         script = self.path.read_text(encoding="utf-8")
-        detected_imports = self.scan_for_imports(script)
+        detected_imports = self.scan_project_imports(script)
 
         dependencies = self.parse_pep_723(script)
         if dependencies:
@@ -173,47 +235,82 @@ class DependencyParser:
                 dependencies=dependencies,
                 requirements_path=self.path,
                 detected_imports=detected_imports,
+                local_modules=self.local_modules,
             )
 
-        detected_imports = []
-        script = self.path.read_text(encoding="utf-8")
-        detected_imports = self.scan_for_imports(script)
-
         search_dir = self.path.parent
 
         # Try pyproject.toml first
         pyproject_candidate = search_dir / "pyproject.toml"
         if pyproject_candidate.exists():
+            self.input_files.append(pyproject_candidate)
             dependencies = self.parse_pyproject_toml(pyproject_candidate)
             return DependenciesMetadata(
                 dependencies=dependencies,
                 requirements_path=pyproject_candidate,
                 detected_imports=detected_imports,
+                local_modules=self.local_modules,
             )
 
         # Fallback to requirements.txt
         requirements_candidate = search_dir / "requirements.txt"
+        self.missing_files.append(pyproject_candidate)
         if requirements_candidate.exists():
+            self.input_files.append(requirements_candidate)
             dependencies = self.parse_requirements_txt(requirements_candidate)
             return DependenciesMetadata(
                 dependencies=dependencies,
                 requirements_path=requirements_candidate,
                 detected_imports=detected_imports,
+                local_modules=self.local_modules,
             )
 
-        return DependenciesMetadata(dependencies=[], detected_imports=detected_imports)
+        # Without any declared dependencies, infer them from the imports.
+        from tuitka.distributions import resolve_distributions
+
+        self.missing_files.append(requirements_candidate)
+        dependencies, unresolved_imports = resolve_distributions(detected_imports)
+        return DependenciesMetadata(
+            dependencies=dependencies,
+            detected_imports=detected_imports,
+            unresolved_imports=unresolved_imports,
+            local_modules=self.local_modules,
+        )
 
 
 def parse_dependencies(_path: str | Path) -> DependenciesMetadata:
+    from tuitka.analysis import analyze_script
+
     path = Path(_path) if isinstance(_path, str) else _path
-    parser = DependencyParser(path)
-    return parser.parse()
+    analysis = analyze_script(path)
+    if analysis is None:
+        return DependencyParser(path).parse()
+    return analysis.to_metadata()
 
 
 def prepare_nuitka_command(
-    script_path: Path, python_version: str = PYTHON_VERSION, **nuitka_options
+    script_path: Path,
+    python_version: str = PYTHON_VERSION,
+    *,
+    isolated: bool = False,
+    **nuitka_options,
 ) -> tuple[list[str], DependenciesMetadata]:
-    dependencies_metadata = parse_dependencies(script_path)
+    """Build the command compiling ``script_path``.
+
+    Dependencies are installed from the project's lock file, resolved by the
+    first build of a set of requirements. By default Nuitka runs in a cached
+    build environment that is reused by later builds with the same dependencies,
+    with ``isolated`` a throwaway environment is created by ``uv run
+    --isolated`` instead. With ``TUITKA_OFFLINE`` set, everything is installed
+    from the wheelhouse and Nuitka is not allowed to download.
+    """
+    from tuitka.analysis import analyze_script
+
+    analysis = analyze_script(script_path)
+    if analysis is not None:
+        dependencies_metadata = analysis.to_metadata()
+    else:
+        dependencies_metadata = DependencyParser(script_path).parse()
     original_is_standalone = nuitka_options.get("--standalone", False)
     original_is_onefile = nuitka_options.get("--onefile", False)
     
@@ -223,50 +320,62 @@ def prepare_nuitka_command(
             nuitka_options.pop("--standalone", None)
             nuitka_options["--mode"] = "app"
 
-    is_standalone = nuitka_options.get("--standalone", False)
-    is_onefile = nuitka_options.get("--onefile", False)
-    is_app_mode = nuitka_options.get("--mode") == "app"
+    mode = get_build_mode(nuitka_options)
+    if analysis is not None:
+        plugin_decisions = analysis.get_plugin_decisions(mode)
+    else:
+        plugin_decisions = match_plugins(dependencies_metadata.detected_imports, mode)
+    plugin_decisions = apply_build_options(plugin_decisions, nuitka_options)
+    for decision in plugin_decisions:
+        if decision.action == "enable":
+            nuitka_options[decision.flag] = True
+    dependencies_metadata.plugin_decisions = plugin_decisions
+
+    project_size = sum(
+        path.stat().st_size
+        for path in dependencies_metadata.local_modules
+        if path.exists()
+    )
+    resource_profile = get_resource_profile(
+        nuitka_options, project_size, len(dependencies_metadata.dependencies)
+    )
+    nuitka_options.update(resource_profile.options)
+    dependencies_metadata.resource_profile = resource_profile
+
+    from tuitka.wheelhouse import get_offline_wheelhouse
 
-    if dependencies_metadata.detected_imports:
-        auto_plugins = apply_plugins(
-            dependencies_metadata.detected_imports,
-            is_standalone=is_standalone,
-            is_onefile=is_onefile,
-            is_app_mode=is_app_mode,
-        )
-        for plugin_flag, enabled in auto_plugins.items():
-            if plugin_flag not in nuitka_options:
-                nuitka_options[plugin_flag] = enabled
-
-    cmd = [
-        "uv",
-        "--python-preference",
-        "system",
-        "run",
-        "--no-project",
-        "--python",
-        python_version,
-        "--isolated",
-    ]
-    if dependencies_metadata.dependencies:
-        for dependency in dependencies_metadata.dependencies:
-            cmd.extend(["--with", dependency])
-    cmd.extend(["--with", "nuitka", "-m", "nuitka"])
+    wheelhouse = get_offline_wheelhouse()
+    if wheelhouse is not None:
+        # Offline, Nuitka must not try to fetch its tools either.
+        nuitka_options.pop("--assume-yes-for-downloads", None)
 
+    nuitka_args = []
     for flag, value in nuitka_options.items():
         if value is None:
             continue
         if isinstance(value, bool) and value:
-            cmd.append(flag)
+            nuitka_args.append(flag)
         elif isinstance(value, str) and value.strip():
-            cmd.append(f"{flag}={value.strip()}")
+            nuitka_args.append(f"{flag}={value.strip()}")
         elif isinstance(value, (list, tuple)) and value:
             for item in value:
                 if isinstance(item, str) and item.strip():
-                    cmd.append(f"{flag}={item.strip()}")
+                    nuitka_args.append(f"{flag}={item.strip()}")
+
+    nuitka_args.append(script_path.as_posix())
 
-    cmd.append(script_path.as_posix())
+    from tuitka.environments import build_environment_command, get_nuitka_requirement
+    from tuitka.locks import get_script_lock_path
 
+    requirements = [*dependencies_metadata.dependencies, get_nuitka_requirement()]
+    cmd = build_environment_command(
+        requirements,
+        python_version,
+        nuitka_args,
+        lock_path=get_script_lock_path(script_path, requirements, python_version),
+        isolated=isolated,
+        wheelhouse=wheelhouse,
+    )
     return cmd, dependencies_metadata
 
 
@@ -337,30 +446,13 @@ def create_nuitka_options_dict() -> dict[str, dict[str, dict]]:
 def apply_plugins(
     imports: list[str], is_standalone: bool = False, is_onefile: bool = False, is_app_mode: bool = False
 ) -> dict[str, bool]:
-    plugins = {}
-
-    imports_str = " ".join(imports).lower()
-
-    qt_frameworks = {
-        "pyside6": ["pyside6"],
-        "pyside2": ["pyside2"],
-        "pyqt6": ["pyqt6"],
-        "pyqt5": ["pyqt5"],
+    mode = PACKAGED if is_standalone or is_onefile or is_app_mode else ACCELERATED
+    return {
+        decision.flag: True
+        for decision in match_plugins(imports, mode)
+        if decision.action == "enable"
     }
 
-    if is_standalone or is_onefile or is_app_mode:
-        for plugin_name, patterns in qt_frameworks.items():
-            if any(pattern in imports_str for pattern in patterns):
-                plugins[f"--enable-plugin={plugin_name}"] = True
-
-    if any("tkinter" in imp.lower() for imp in imports):
-        plugins["--enable-plugin=tk-inter"] = True
-
-    if any("multiprocessing" in imp.lower() for imp in imports):
-        plugins["--enable-plugin=multiprocessing"] = True
-
-    return plugins
-
 
 def get_default_shell() -> str:
     """Get the default shell command for the current platform."""
@@ -383,6 +475,7 @@ def get_default_shell() -> str:
 
 
 __all__ = [
+    "expand_script_paths",
     "prepare_nuitka_command",
     "create_nuitka_options_dict",
     "DependenciesMetadata",
@@ -0,0 +1,353 @@
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import replace
+from pathlib import Path
+
+from tuitka.batch import BuildJob, run_build
+from tuitka.build_output import get_log_path
+
+# Quiet time after the last change before rebuilding, so a burst of saves, an
+# editor writing several files or a formatter running on save, builds once.
+DEBOUNCE_SECONDS = 0.3
+# Files that never stop changing still get built after this long.
+MAX_DEBOUNCE_SECONDS = 2.0
+# How often files are stat'ed without inotify, and stop requests checked.
+POLL_INTERVAL = 0.5
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_ONLYDIR = 0x01000000
+# Directories are watched instead of files, as editors often save by
+# replacing the file, which would end a watch on the file itself.
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _get_digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _get_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _PollingBackend:
+    name = "polling"
+
+    def __init__(self) -> None:
+        self.stamps: dict[Path, tuple[int, int] | None] = {}
+
+    def watch(self, paths: set[Path]) -> None:
+        self.stamps = {
+            path: self.stamps[path] if path in self.stamps else _get_stamp(path)
+            for path in paths
+        }
+
+    def read(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, stamp in self.stamps.items():
+                if (current := _get_stamp(path)) != stamp:
+                    self.stamps[path] = current
+                    changed.add(path)
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyBackend:
+    name = "inotify"
+
+    def __init__(self, libc) -> None:
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: set[Path] = set()
+        self.directories: dict[int, Path] = {}
+
+    @classmethod
+    def create(cls) -> "_InotifyBackend | None":
+        """The backend, or None where inotify is not available."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            return cls(libc)
+        except (OSError, AttributeError):
+            return None
+
+    def watch(self, paths: set[Path]) -> None:
+        self.paths = set(paths)
+        watched = set(self.directories.values())
+        for directory in {path.parent for path in paths} - watched:
+            descriptor = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), _WATCH_MASK
+            )
+            # Missing directories are not watched, their files can not change.
+            if descriptor >= 0:
+                self.directories[descriptor] = directory
+
+    def read(self, timeout: float) -> set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        with contextlib.suppress(BlockingIOError):
+            while data := os.read(self.fd, 65536):
+                offset = 0
+                while offset < len(data):
+                    descriptor, mask, _, length = _EVENT_HEADER.unpack_from(
+                        data, offset
+                    )
+                    offset += _EVENT_HEADER.size
+                    name = data[offset : offset + length].rstrip(b"\0")
+                    offset += length
+                    if mask & _IN_Q_OVERFLOW:
+                        # Events were dropped, any file may have changed.
+                        changed.update(self.paths)
+                    elif descriptor in self.directories and name:
+                        path = self.directories[descriptor] / os.fsdecode(name)
+                        if path in self.paths:
+                            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Report content changes of a set of files.
+
+    Changes are noticed through inotify where available and by polling the
+    files otherwise. Files that were saved without their content changing,
+    or touched, do not count as changed.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        debounce: float = DEBOUNCE_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        self.debounce = debounce
+        self.backend = (_InotifyBackend.create() if use_inotify else None) or (
+            _PollingBackend()
+        )
+        self.digests: dict[Path, str | None] = {}
+        self.set_paths(paths)
+
+    @property
+    def paths(self) -> set[Path]:
+        return set(self.digests)
+
+    def set_paths(self, paths: Iterable[Path]) -> None:
+        """Watch ``paths`` instead, for example after the imports changed.
+
+        Files may be missing, creating them counts as a change.
+        """
+        paths = {Path(path).absolute() for path in paths}
+        self.digests = {
+            path: self.digests[path] if path in self.digests else _get_digest(path)
+            for path in paths
+        }
+        self.backend.watch(paths)
+
+    def wait(self, should_stop: Callable[[], bool] | None = None) -> set[Path]:
+        """Block until files changed and stayed unchanged for the debounce time.
+
+        Returns the changed files, or an empty set once ``should_stop`` is true.
+        """
+        while should_stop is None or not should_stop():
+            candidates = self.backend.read(POLL_INTERVAL)
+            if not candidates:
+                continue
+            burst_end = time.monotonic() + MAX_DEBOUNCE_SECONDS
+            while time.monotonic() < burst_end:
+                if not (more := self.backend.read(self.debounce)):
+                    break
+                candidates |= more
+            if changed := self._confirm_changes(candidates):
+                return changed
+        return set()
+
+    def _confirm_changes(self, candidates: set[Path]) -> set[Path]:
+        changed = set()
+        for path in candidates:
+            digest = _get_digest(path)
+            if digest != self.digests.get(path):
+                self.digests[path] = digest
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def get_watched_files(script: Path) -> set[Path]:
+    """The script, its local modules and the files declaring its dependencies.
+
+    Dependency files that do not exist yet are included, as creating one
+    changes the build.
+    """
+    from tuitka.analysis import analyze_script
+
+    script = Path(script).resolve()
+    analysis = analyze_script(script)
+    if analysis is None:
+        return {script}
+    return {
+        script,
+        *map(Path, analysis.local_modules),
+        *map(Path, analysis.inputs),
+        *map(Path, analysis.missing),
+    }
+
+
+async def watch_builds(
+    job: BuildJob,
+    watcher: FileWatcher,
+    on_event: Callable[[str, object], None],
+    on_output: Callable[[bytes], None] | None = None,
+) -> None:
+    """Build ``job``, and build it again whenever one of its sources changed.
+
+    A change arriving while a build runs cancels that build. ``on_event`` is
+    called with ("started", changed files), ("finished", result) and
+    ("cancelled", changed files). Runs until cancelled.
+    """
+    stopped = threading.Event()
+
+    def next_changes() -> set[Path]:
+        # New imports bring new files to watch.
+        watcher.set_paths(get_watched_files(job.script))
+        return watcher.wait(should_stop=stopped.is_set)
+
+    changed: set[Path] = set()
+    try:
+        while True:
+            on_event("started", changed)
+            build = asyncio.create_task(
+                run_build(job, get_log_path(job.script), on_output)
+            )
+            changes = asyncio.create_task(asyncio.to_thread(next_changes))
+            await asyncio.wait({build, changes}, return_when=asyncio.FIRST_COMPLETED)
+            if not build.done():
+                build.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await build
+                on_event("cancelled", changes.result())
+            else:
+                on_event("finished", build.result())
+            changed = await changes
+    finally:
+        stopped.set()
+
+
+def make_watch_job(job: BuildJob) -> BuildJob:
+    """``job`` keeping its build directory, so each rebuild reuses the last."""
+    return replace(job, reuse_build=True)
+
+
+def run_watch_cli(
+    script: Path,
+    nuitka_options: dict,
+    isolated: bool = False,
+    artifact_cache: bool = True,
+) -> None:
+    from rich.console import Console
+
+    console = Console()
+    job = make_watch_job(
+        BuildJob(
+            script, nuitka_options, isolated=isolated, artifact_cache=artifact_cache
+        )
+    )
+    watcher = FileWatcher(get_watched_files(script))
+    stdout = sys.stdout.buffer
+
+    def on_output(chunk: bytes) -> None:
+        stdout.write(chunk)
+        stdout.flush()
+
+    def describe(paths) -> str:
+        return ", ".join(sorted(path.name for path in paths))
+
+    def on_event(kind: str, item) -> None:
+        if kind == "started":
+            if item:
+                console.print(f"[dim]{describe(item)} changed, rebuilding...[/dim]")
+            else:
+                console.print(
+                    f"[dim]Compiling[/dim] {script}, watching "
+                    f"{len(watcher.paths)} files ({watcher.backend.name})"
+                )
+        elif kind == "cancelled":
+            console.print(f"[yellow]Build cancelled,[/yellow] {describe(item)} changed")
+        elif item.cached:
+            console.print(
+                f"[green]✓[/green] {script} [dim](restored from the artifact "
+                f"cache in {item.duration:.1f}s)[/dim]"
+            )
+        elif item.success:
+            console.print(
+                f"[green]✓[/green] {script} [dim]({item.duration:.1f}s, "
+                f"{item.phases.format_breakdown()})[/dim]"
+            )
+        else:
+            console.print(
+                f"[red]✗[/red] {script} [dim]exit code {item.exit_code}, "
+                f"see {item.log_path}[/dim]"
+            )
+        if kind == "finished":
+            console.print("[dim]Waiting for changes, Ctrl+C to stop.[/dim]")
+
+    try:
+        asyncio.run(watch_builds(job, watcher, on_event, on_output))
+    except KeyboardInterrupt:
+        console.print("Stopped watching.")
+    finally:
+        watcher.close()
+
+
+__all__ = [
+    "DEBOUNCE_SECONDS",
+    "FileWatcher",
+    "get_watched_files",
+    "make_watch_job",
+    "run_watch_cli",
+    "watch_builds",
+]
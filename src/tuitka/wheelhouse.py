@@ -0,0 +1,218 @@
+"""Offline builds, installing every package from a local wheelhouse directory.
+
+With ``TUITKA_OFFLINE`` set, uv never touches the network: lock files are
+resolved and environments installed from the wheels and source archives in
+``TUITKA_WHEELHOUSE``. ``tuitka wheelhouse`` fills that directory on a machine
+with network access.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+OFFLINE_VARIABLE = "TUITKA_OFFLINE"
+WHEELHOUSE_VARIABLE = "TUITKA_WHEELHOUSE"
+
+
+def get_wheelhouse() -> Path | None:
+    """The configured wheelhouse, whether or not builds are offline."""
+    wheelhouse = os.environ.get(WHEELHOUSE_VARIABLE)
+    return Path(wheelhouse).resolve() if wheelhouse else None
+
+
+def get_offline_wheelhouse() -> Path | None:
+    """The wheelhouse builds install from, None unless they are offline."""
+    if os.environ.get(OFFLINE_VARIABLE, "").lower() in ("", "0", "false", "no"):
+        return None
+    return get_wheelhouse()
+
+
+def enable_offline(wheelhouse: Path) -> None:
+    """Make this process and the builds it starts install from ``wheelhouse``."""
+    os.environ[OFFLINE_VARIABLE] = "1"
+    os.environ[WHEELHOUSE_VARIABLE] = str(wheelhouse.resolve())
+
+
+def get_offline_args(wheelhouse: Path | None) -> list[str]:
+    """uv options keeping it off the network and on the wheelhouse."""
+    if wheelhouse is None:
+        return []
+    return ["--offline", "--no-index", "--find-links", str(wheelhouse)]
+
+
+def _can_resolve(
+    requirements: list[str], wheelhouse: Path, python_version: str, no_deps: bool
+) -> bool:
+    cmd = [
+        "uv",
+        "pip",
+        "compile",
+        "-",
+        "--python-version",
+        python_version,
+        "--no-header",
+        "--quiet",
+        *get_offline_args(wheelhouse),
+    ]
+    if no_deps:
+        cmd.append("--no-deps")
+    result = subprocess.run(
+        cmd,
+        input="\n".join(requirements) + "\n",
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=False,
+    )
+    return result.returncode == 0
+
+
+def find_missing(
+    requirements: list[str],
+    wheelhouse: Path,
+    python_version: str,
+    locked: bool = False,
+) -> list[str]:
+    """Requirements the wheelhouse can not satisfy on this platform.
+
+    Pins of a lock file are complete, each is only looked up. Other
+    requirements need their dependencies to be in the wheelhouse as well.
+    """
+    if _can_resolve(requirements, wheelhouse, python_version, no_deps=locked):
+        return []
+    # uv stops at the first conflict, asking one by one lists all of them.
+    return [
+        requirement
+        for requirement in requirements
+        if not _can_resolve([requirement], wheelhouse, python_version, locked)
+    ]
+
+
+def check_wheelhouse(
+    requirements: list[str],
+    wheelhouse: Path,
+    python_version: str,
+    locked: bool = False,
+) -> bool:
+    """Pre-flight check of an offline build, printing what is missing."""
+    print(f"Checking wheelhouse {wheelhouse}", flush=True)
+    if not wheelhouse.is_dir():
+        print(f"The wheelhouse {wheelhouse} does not exist.", flush=True)
+        return False
+    missing = find_missing(requirements, wheelhouse, python_version, locked)
+    if missing:
+        print(
+            f"The wheelhouse lacks {len(missing)} of the build's packages, "
+            "add them with `tuitka wheelhouse` where the network is available:",
+            flush=True,
+        )
+        for requirement in missing:
+            print(f"  {requirement}", flush=True)
+    return not missing
+
+
+def get_environment_requirements(python: str | None = None) -> list[str]:
+    """Exact versions of the packages in the current (or ``python``'s) environment."""
+    cmd = ["uv", "pip", "freeze", "--exclude-editable"]
+    if python is not None:
+        cmd.extend(["--python", python])
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True)
+    # Packages installed from a path or URL have no version to download.
+    return [
+        line.strip()
+        for line in result.stdout.splitlines()
+        if line.strip() and not line.startswith("#") and " @ " not in line
+    ]
+
+
+def _get_pip_command() -> list[str]:
+    if importlib.util.find_spec("pip") is not None:
+        return [sys.executable, "-m", "pip"]
+    # tuitka installed as a uv tool comes without pip.
+    return ["uvx", "pip"]
+
+
+def download_to_wheelhouse(
+    requirements: list[str], wheelhouse: Path, python_version: str
+) -> None:
+    """Download exactly ``requirements``, already resolved, into the wheelhouse."""
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        requirements_file = Path(temp_dir) / "requirements.txt"
+        requirements_file.write_text("\n".join(requirements) + "\n", encoding="utf-8")
+        subprocess.run(
+            [
+                *_get_pip_command(),
+                "download",
+                "--no-deps",
+                "--prefer-binary",
+                "--python-version",
+                python_version,
+                "--dest",
+                str(wheelhouse),
+                "--requirement",
+                str(requirements_file),
+            ],
+            check=True,
+        )
+
+
+def run_wheelhouse_cli(
+    sources: list[Path],
+    wheelhouse: Path,
+    python_version: str,
+    from_environment: bool = False,
+    check_only: bool = False,
+) -> int:
+    """Fill the wheelhouse for scripts, lock files or the current environment."""
+    from tuitka.environments import get_nuitka_requirement
+    from tuitka.locks import ensure_lock, get_script_lock_path, read_lock
+    from tuitka.utils import parse_dependencies
+
+    pins = []
+    try:
+        for source in sources:
+            if source.suffix == ".py":
+                metadata = parse_dependencies(source)
+                requirements = [*metadata.dependencies, get_nuitka_requirement()]
+                lock_path = get_script_lock_path(source, requirements, python_version)
+                if not check_only:
+                    ensure_lock(lock_path, requirements, python_version)
+                source = lock_path
+            locked = read_lock(source)
+            if locked is None:
+                print(f"{source} is not a lock file, run `tuitka lock` first.")
+                return 1
+            pins.extend(locked)
+        if from_environment:
+            pins.extend(get_environment_requirements())
+        pins = list(dict.fromkeys(pins))
+
+        if not check_only:
+            print(f"Downloading {len(pins)} packages into {wheelhouse}", flush=True)
+            download_to_wheelhouse(pins, wheelhouse, python_version)
+    except subprocess.CalledProcessError as error:
+        return error.returncode or 1
+
+    if not check_wheelhouse(pins, wheelhouse, python_version, locked=True):
+        return 1
+    print(f"The wheelhouse {wheelhouse} has all {len(pins)} packages.")
+    return 0
+
+
+__all__ = [
+    "OFFLINE_VARIABLE",
+    "WHEELHOUSE_VARIABLE",
+    "check_wheelhouse",
+    "download_to_wheelhouse",
+    "enable_offline",
+    "find_missing",
+    "get_environment_requirements",
+    "get_offline_args",
+    "get_offline_wheelhouse",
+    "get_wheelhouse",
+    "run_wheelhouse_cli",
+]
@@ -0,0 +1,223 @@
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.widgets import (
+    Button,
+    DataTable,
+    Input,
+    Label,
+    Static,
+    TabbedContent,
+    TabPane,
+)
+
+from tuitka.batch import BuildJob, get_worker_count
+from tuitka.build_queue import (
+    CACHED,
+    CANCELLED,
+    FAILED,
+    PASSED,
+    QUEUED,
+    RUNNING,
+    BuildQueue,
+    QueueEntry,
+)
+from tuitka.resources import get_cpu_count
+from tuitka.widgets.build_view import BuildView
+
+# Builds run at once unless changed, if CPUs and memory allow that many.
+DEFAULT_MAX_CONCURRENCY = 4
+
+STATE_ICONS = {
+    QUEUED: "…",
+    RUNNING: "⟳",
+    PASSED: "✓",
+    CACHED: "✓",
+    FAILED: "✗",
+    CANCELLED: "⊘",
+}
+
+
+class BuildQueuePanel(Vertical):
+    """Queued builds, each in its own tab, and a summary of all of them."""
+
+    DEFAULT_CSS = """
+    BuildQueuePanel {
+        display: none;
+        height: 2fr;
+        border: round $panel-lighten-2;
+        padding: 0 1;
+    }
+
+    BuildQueuePanel #queue_controls {
+        height: 1;
+    }
+
+    BuildQueuePanel #queue_title {
+        width: auto;
+        text-style: bold;
+        margin-right: 2;
+    }
+
+    BuildQueuePanel #queue_counts {
+        width: 1fr;
+        color: $text-muted;
+    }
+
+    BuildQueuePanel #concurrency_input {
+        width: 8;
+        height: 1;
+        border: none;
+        padding: 0 1;
+    }
+
+    BuildQueuePanel #queue_tabs {
+        height: 1fr;
+    }
+
+    BuildQueuePanel TabPane {
+        padding: 1 0 0 0;
+    }
+
+    BuildQueuePanel #queue_table {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.queue = BuildQueue(get_worker_count(DEFAULT_MAX_CONCURRENCY))
+
+    def compose(self) -> ComposeResult:
+        with Horizontal(id="queue_controls"):
+            yield Static("Build queue", id="queue_title")
+            yield Static(id="queue_counts")
+            yield Label("Parallel builds ")
+            yield Input(
+                str(self.queue.concurrency),
+                type="integer",
+                id="concurrency_input",
+                tooltip="How many builds run at once, the others wait their turn.",
+            )
+        with (
+            TabbedContent(id="queue_tabs"),
+            TabPane("Summary", id="queue_summary"),
+        ):
+            yield DataTable(id="queue_table", cursor_type="row", zebra_stripes=True)
+
+    def on_mount(self) -> None:
+        table = self.query_one("#queue_table", DataTable)
+        table.add_column("#", key="id")
+        table.add_column("Script", key="script")
+        table.add_column("Preset", key="preset")
+        table.add_column("Status", key="status")
+        table.add_column("Duration", key="duration")
+        table.add_column("Exit code", key="exit_code")
+
+    async def enqueue(self, job: BuildJob, label: str = "") -> QueueEntry:
+        """Queue ``job`` and start it right away if a build slot is free."""
+        entry = self.queue.add(job, label)
+        self.display = True
+        self.query_one("#queue_table", DataTable).add_row(
+            str(entry.id),
+            job.script.name,
+            label,
+            entry.state,
+            "",
+            "",
+            key=str(entry.id),
+        )
+        tabs = self.query_one("#queue_tabs", TabbedContent)
+        pane = TabPane(
+            self.get_tab_label(entry),
+            BuildView(job, autostart=False, close_label="Close tab"),
+            id=f"build_{entry.id}",
+        )
+        await tabs.add_pane(pane)
+        self.start_ready(focus=entry)
+        return entry
+
+    def get_tab_label(self, entry: QueueEntry) -> str:
+        return f"{STATE_ICONS[entry.state]} {entry.id} {entry.job.script.name}"
+
+    def has_pane(self, pane_id: str) -> bool:
+        return bool(self.query(f"TabPane#{pane_id}"))
+
+    def get_view(self, entry: QueueEntry) -> BuildView | None:
+        views = self.query(f"#build_{entry.id} BuildView")
+        return views.first(BuildView) if views else None
+
+    def start_ready(self, focus: QueueEntry | None = None) -> None:
+        # Builds whose tab is still being added start once it is.
+        for entry in self.queue.take_ready(lambda entry: self.get_view(entry)):
+            view = self.get_view(entry)
+            if self.queue.concurrency > 1 and "--jobs" not in entry.job.nuitka_options:
+                # Share the CPUs between the builds instead of oversubscribing them.
+                entry.job.nuitka_options = {
+                    **entry.job.nuitka_options,
+                    "--jobs": str(max(1, get_cpu_count() // self.queue.concurrency)),
+                }
+            view.start()
+            self.update_entry(entry)
+        if focus is not None and focus.state == RUNNING:
+            self.query_one("#queue_tabs", TabbedContent).active = f"build_{focus.id}"
+        self.update_counts()
+
+    def update_entry(self, entry: QueueEntry) -> None:
+        table = self.query_one("#queue_table", DataTable)
+        row_key = str(entry.id)
+        table.update_cell(row_key, "status", entry.state)
+        if entry.is_finished and entry.duration is not None:
+            table.update_cell(row_key, "duration", f"{entry.duration:.1f}s")
+        if entry.exit_code is not None:
+            table.update_cell(row_key, "exit_code", str(entry.exit_code))
+        if self.has_pane(f"build_{entry.id}"):
+            tabs = self.query_one("#queue_tabs", TabbedContent)
+            tabs.get_tab(f"build_{entry.id}").label = self.get_tab_label(entry)
+
+    def update_counts(self) -> None:
+        self.query_one("#queue_counts", Static).update(self.queue.format_counts())
+
+    @on(BuildView.Finished)
+    def on_build_finished(self, event: BuildView.Finished) -> None:
+        entry = self.find_entry(event.view)
+        if entry is None:
+            return
+        self.queue.finish(entry, event.view.state, event.view.exit_code)
+        self.update_entry(entry)
+        self.start_ready()
+
+    def find_entry(self, view: BuildView) -> QueueEntry | None:
+        pane = view.parent
+        if pane is None or not pane.id or not pane.id.startswith("build_"):
+            return None
+        return self.queue.get(int(pane.id.removeprefix("build_")))
+
+    @on(Button.Pressed, "#btn_close")
+    def close_tab(self, event: Button.Pressed) -> None:
+        event.stop()
+        view = event.button.query_ancestor(BuildView)
+        entry = self.find_entry(view)
+        if entry is not None and entry.is_finished:
+            self.query_one("#queue_tabs", TabbedContent).remove_pane(
+                f"build_{entry.id}"
+            )
+
+    @on(Input.Changed, "#concurrency_input")
+    def on_concurrency_changed(self, event: Input.Changed) -> None:
+        try:
+            concurrency = int(event.value)
+        except ValueError:
+            return
+        if concurrency >= 1:
+            self.queue.concurrency = concurrency
+            self.start_ready()
+
+    @on(DataTable.RowSelected, "#queue_table")
+    def on_row_selected(self, event: DataTable.RowSelected) -> None:
+        pane_id = f"build_{event.row_key.value}"
+        if self.has_pane(pane_id):
+            self.query_one("#queue_tabs", TabbedContent).active = pane_id
+
+
+__all__ = ["BuildQueuePanel"]
@@ -0,0 +1,424 @@
+import time
+
+from rich.text import Text
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.message import Message
+from textual.widgets import Button, RichLog, Static
+from textual_tty.widgets import TextualTerminal
+
+from tuitka.artifacts import ArtifactCacheEntry, find_artifacts, get_output_dir
+from tuitka.batch import BuildJob
+from tuitka.build_dirs import BuildDirectory
+from tuitka.build_output import BuildLog, classify_line, get_log_path
+from tuitka.build_phases import PhaseTracker, get_trace_path
+from tuitka.build_queue import CACHED, CANCELLED, FAILED, PASSED, QUEUED, RUNNING
+from tuitka.plugins import describe_plugin_decisions
+from tuitka.utils import chdir_context, prepare_nuitka_command
+
+# Lines of the log shown before the first error, and in total.
+LOG_CONTEXT_BEFORE = 20
+LOG_VIEW_LINES = 400
+
+
+class BuildTerminal(TextualTerminal):
+    """Terminal starting its process in ``cwd`` instead of tuitka's directory.
+
+    The process is spawned before ``start_process`` first awaits anything, so
+    the directory change is never seen by other builds starting meanwhile.
+    """
+
+    def __init__(self, cwd, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cwd = cwd
+
+    async def start_process(self) -> None:
+        with chdir_context(self.cwd):
+            await super().start_process()
+
+
+class BuildView(Vertical):
+    """One build of a script: its live terminal, build log and result."""
+
+    DEFAULT_CSS = """
+    BuildView {
+        height: 1fr;
+        width: 1fr;
+    }
+
+    BuildView .resource-profile {
+        height: auto;
+        color: $text-muted;
+        margin: 0 0 1 0;
+    }
+
+    BuildView .unresolved-imports {
+        color: $warning;
+    }
+
+    BuildView #compilation_terminal {
+        height: 1fr;
+        margin: 0 0 1 0;
+    }
+
+    BuildView .cache-status {
+        height: 1fr;
+        content-align: center middle;
+        text-align: center;
+        color: $success;
+    }
+
+    BuildView .log-view {
+        display: none;
+        height: 1fr;
+        margin: 0 0 1 0;
+        border: solid $error;
+    }
+
+    BuildView .compilation-status {
+        height: 1;
+        text-align: center;
+        margin: 0 0 1 0;
+    }
+
+    BuildView .phase-summary {
+        display: none;
+        height: auto;
+        text-align: center;
+        color: $text-muted;
+        margin: 0 0 1 0;
+    }
+
+    BuildView .compilation-controls {
+        height: 3;
+        margin: 0;
+    }
+
+    BuildView .compilation-controls Button {
+        width: 1fr;
+        height: 3;
+    }
+
+    BuildView #btn_log, BuildView #btn_benchmark, BuildView #btn_sizes {
+        display: none;
+    }
+
+    BuildView .success {
+        color: $success;
+        text-style: bold;
+    }
+
+    BuildView .error {
+        color: $error;
+        text-style: bold;
+    }
+
+    BuildView .in-progress {
+        color: $warning;
+        text-style: bold;
+    }
+    """
+
+    class Finished(Message):
+        """Posted once the build ended, was restored or was cancelled."""
+
+        def __init__(self, view: "BuildView") -> None:
+            super().__init__()
+            self.view = view
+
+    def __init__(
+        self,
+        job: BuildJob,
+        *,
+        autostart: bool = True,
+        close_label: str = "Close",
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.job = job
+        self.autostart = autostart
+        self.close_label = close_label
+        self.state = QUEUED
+        self.exit_code: int | None = None
+        self.cancelling = False
+        self.nuitka_options = job.nuitka_options
+        self.build_directory = None
+        self.terminal = None
+        self.nuitka_command = None
+        self.deps_metadata = None
+        self.phases = PhaseTracker(title=job.script.name)
+        self.build_log = None
+        self.cache_entry = None
+        self.restored_artifacts = None
+        # Programs the build produced, or restored.
+        self.artifacts = []
+        self.started_at = time.time()
+
+    @property
+    def success(self) -> bool:
+        return self.state in (PASSED, CACHED)
+
+    def compose(self) -> ComposeResult:
+        yield Static(id="resource_profile", classes="resource-profile")
+        yield Static(id="plugin_decisions", classes="resource-profile")
+        yield Static(
+            id="unresolved_imports", classes="resource-profile unresolved-imports"
+        )
+        yield RichLog(id="log_view", classes="log-view", auto_scroll=False)
+        yield Static(
+            "Waiting for a free build slot...",
+            id="status_label",
+            classes="compilation-status in-progress",
+        )
+        yield Static(id="phase_summary", classes="phase-summary")
+        with Horizontal(classes="compilation-controls"):
+            yield Button(self.close_label, id="btn_close", disabled=True)
+            yield Button("Go to first error", variant="warning", id="btn_log")
+            yield Button("Benchmark", variant="primary", id="btn_benchmark")
+            yield Button("Sizes", variant="primary", id="btn_sizes")
+            yield Button("Cancel", variant="error", id="btn_cancel")
+
+    def on_mount(self) -> None:
+        for static_id in (
+            "#resource_profile",
+            "#plugin_decisions",
+            "#unresolved_imports",
+        ):
+            self.query_one(static_id).display = False
+        if self.autostart:
+            self.start()
+
+    def start(self) -> None:
+        """Prepare the build and start Nuitka, or restore it from the cache."""
+        if self.state != QUEUED:
+            return
+        self.state = RUNNING
+        script = self.job.script
+        self.query_one("#status_label", Static).update("Compilation in progress...")
+
+        # Relative paths in the options are relative to the script.
+        with chdir_context(script.parent):
+            nuitka_options = self.job.nuitka_options
+            if self.job.reuse_build:
+                self.build_directory = BuildDirectory.for_build(
+                    script, self.job.python_version, nuitka_options
+                )
+                nuitka_options = self.build_directory.apply(nuitka_options)
+            self.nuitka_options = nuitka_options
+            self.nuitka_command, self.deps_metadata = prepare_nuitka_command(
+                script,
+                self.job.python_version,
+                isolated=self.job.isolated,
+                **nuitka_options,
+            )
+            if self.job.artifact_cache:
+                self.cache_entry = ArtifactCacheEntry(
+                    script,
+                    self.job.python_version,
+                    nuitka_options,
+                    self.deps_metadata,
+                    isolated=self.job.isolated,
+                )
+                self.restored_artifacts = self.cache_entry.restore(
+                    script.parent
+                    if self.build_directory is not None
+                    else get_output_dir(script, nuitka_options).resolve()
+                )
+
+        resource_profile = self.deps_metadata.resource_profile
+        if resource_profile and resource_profile.options:
+            static = self.query_one("#resource_profile", Static)
+            static.update(resource_profile.describe())
+            static.display = True
+        if self.deps_metadata.plugin_decisions:
+            static = self.query_one("#plugin_decisions", Static)
+            static.update(
+                describe_plugin_decisions(self.deps_metadata.plugin_decisions)
+            )
+            static.display = True
+        if self.deps_metadata.unresolved_imports:
+            static = self.query_one("#unresolved_imports", Static)
+            static.update(self.deps_metadata.describe_unresolved_imports())
+            static.display = True
+
+        if self.restored_artifacts is not None:
+            if self.build_directory is not None:
+                self.build_directory.release()
+            names = ", ".join(path.name for path in self.restored_artifacts)
+            self.mount(
+                Static(
+                    f"Restored {names} from the artifact cache, nothing changed "
+                    f"since it was built.\nFingerprint: "
+                    f"{self.cache_entry.fingerprint.digest}",
+                    id="cache_status",
+                    classes="cache-status",
+                ),
+                before="#log_view",
+            )
+            self.artifacts = self.restored_artifacts
+            self.finish(CACHED, 0)
+            return
+
+        self.build_log = BuildLog(get_log_path(script))
+        # File systems may store modification times coarser than time.time().
+        self.started_at = time.time() - 1
+        self.terminal = BuildTerminal(
+            script.parent, id="compilation_terminal", command=self.nuitka_command
+        )
+        self.mount(self.terminal, before="#log_view")
+
+    def cancel(self) -> None:
+        if self.state == QUEUED:
+            self.finish(CANCELLED, None)
+        elif self.state == RUNNING and self.terminal is not None:
+            self.cancelling = True
+            self.terminal.stop_process()
+
+    def finish(self, state: str, exit_code: int | None) -> None:
+        self.state = state
+        self.exit_code = exit_code
+        self.query_one("#btn_close", Button).disabled = False
+        self.query_one("#btn_cancel", Button).disabled = True
+
+        status_label = self.query_one("#status_label", Static)
+        counts = self.build_log.format_counts() if self.build_log else ""
+        status_label.set_class(False, "in-progress")
+        if state == CACHED:
+            status_label.update("✓ Restored from the artifact cache!")
+            status_label.set_class(True, "success")
+        elif state == PASSED:
+            status_label.update(f"✓ Compilation completed successfully! ({counts})")
+            status_label.set_class(True, "success")
+        elif state == CANCELLED:
+            status_label.update("Compilation cancelled.")
+            status_label.set_class(True, "error")
+        else:
+            status_label.update(f"✗ Compilation failed! ({counts})")
+            status_label.set_class(True, "error")
+
+        if self.build_log is not None and (
+            self.build_log.error_count or state == FAILED
+        ):
+            log_btn = self.query_one("#btn_log", Button)
+            if self.build_log.first_error is None:
+                log_btn.label = "Show build log"
+            log_btn.display = True
+        if self.success and self.artifacts:
+            self.query_one("#btn_benchmark", Button).display = True
+            self.query_one("#btn_sizes", Button).display = True
+        self.post_message(self.Finished(self))
+
+    @on(Button.Pressed, "#btn_log")
+    def on_log_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        self.toggle_log_view()
+
+    @on(Button.Pressed, "#btn_benchmark")
+    def on_benchmark_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        from tuitka.widgets.modals.benchmark import BenchmarkScreen
+
+        self.app.push_screen(
+            BenchmarkScreen(self.job.script, self.artifacts, self.job.python_version)
+        )
+
+    @on(Button.Pressed, "#btn_sizes")
+    def on_sizes_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        from tuitka.widgets.modals.size_report import SizeReportScreen
+
+        self.app.push_screen(SizeReportScreen(self.artifacts))
+
+    @on(Button.Pressed, "#btn_cancel")
+    def on_cancel_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        self.cancel()
+
+    def toggle_log_view(self) -> None:
+        log_view = self.query_one("#log_view", RichLog)
+        log_btn = self.query_one("#btn_log", Button)
+        if log_view.display:
+            log_view.display = False
+            self.terminal.display = True
+            log_btn.label = (
+                "Go to first error" if self.build_log.first_error else "Show build log"
+            )
+            return
+
+        first_error = self.build_log.first_error
+        if first_error is not None:
+            start = max(0, first_error.line_number - LOG_CONTEXT_BEFORE)
+        else:
+            # No recognizable error, the end of the output tells why it failed.
+            start = max(0, self.build_log.line_count - LOG_VIEW_LINES)
+
+        log_view.clear()
+        for line in self.build_log.read_lines(start, LOG_VIEW_LINES):
+            kind = classify_line(line)
+            style = {"error": "bold red", "warning": "yellow"}.get(kind, "")
+            log_view.write(Text(line, style=style))
+
+        self.terminal.display = False
+        log_view.display = True
+        log_btn.label = "Show terminal"
+        if first_error is not None:
+            log_view.call_after_refresh(
+                log_view.scroll_to,
+                y=first_error.line_number - start,
+                animate=False,
+            )
+
+    def on_unmount(self) -> None:
+        if self.build_log is not None:
+            self.build_log.close()
+        # A build closed while it runs leaves its directory to the next one.
+        if self.build_directory is not None:
+            self.build_directory.release()
+
+    @on(TextualTerminal.PTYDataMessage)
+    def on_pty_data(self, event: TextualTerminal.PTYDataMessage) -> None:
+        self.phases.feed(event.data)
+        self.build_log.feed(event.data)
+
+    def show_phase_summary(self) -> None:
+        trace_path = self.phases.write_chrome_trace(get_trace_path(self.job.script))
+        summary = self.query_one("#phase_summary", Static)
+        summary.update(
+            self.phases.format_breakdown()
+            + f"\nLog: {self.build_log.path}"
+            + (f"\nTrace: {trace_path}" if trace_path else "")
+        )
+        summary.display = True
+
+    @on(TextualTerminal.ProcessExited)
+    def on_process_exited(self, event: TextualTerminal.ProcessExited) -> None:
+        event.stop()
+        # The terminal reports its process once more when it is unmounted.
+        if self.state != RUNNING:
+            return
+        self.build_log.close()
+        if self.cancelling:
+            if self.build_directory is not None:
+                self.build_directory.release()
+            self.finish(CANCELLED, None)
+            return
+
+        self.phases.finish(event.exit_code)
+        self.show_phase_summary()
+        artifacts = []
+        script = self.job.script
+        with chdir_context(script.parent):
+            if self.build_directory is not None:
+                if event.exit_code == 0:
+                    artifacts = self.build_directory.restore_outputs()
+                self.build_directory.release()
+            elif event.exit_code == 0:
+                artifacts = find_artifacts(script, self.nuitka_options, self.started_at)
+            if self.cache_entry is not None and event.exit_code == 0:
+                self.cache_entry.store(artifacts)
+        self.artifacts = artifacts
+        self.finish(PASSED if event.exit_code == 0 else FAILED, event.exit_code)
+
+
+__all__ = ["BuildTerminal", "BuildView"]
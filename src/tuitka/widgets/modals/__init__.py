@@ -1,16 +1,31 @@
-from .compilation import CompilationScreen
-from .file_dialog import FileDialogScreen
-from .settings import NuitkaSettingsScreen
-from .settings_widgets import (
-    ModalBoolFlag,
-    ModalRadioFlag,
-    ModalSelectionFlag,
-    ModalStringFlag,
-)
-from .splash import SplashScreen
-from .support import SupportNuitkaModal
+from importlib import import_module
+
+# Modals are imported on first use, so starting the TUI does not pay for the
+# compilation screen (and its terminal emulator) until a build is started.
+_MODAL_MODULES = {
+    "BenchmarkScreen": "benchmark",
+    "CompilationScreen": "compilation",
+    "FileDialogScreen": "file_dialog",
+    "ModalBoolFlag": "settings_widgets",
+    "ModalRadioFlag": "settings_widgets",
+    "ModalSelectionFlag": "settings_widgets",
+    "ModalStringFlag": "settings_widgets",
+    "NuitkaSettingsScreen": "settings",
+    "SizeReportScreen": "size_report",
+    "SplashScreen": "splash",
+    "SupportNuitkaModal": "support",
+}
+
+
+def __getattr__(name: str):
+    if name in _MODAL_MODULES:
+        module = import_module(f"{__name__}.{_MODAL_MODULES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
+    "BenchmarkScreen",
     "CompilationScreen",
     "FileDialogScreen",
     "ModalBoolFlag",
@@ -18,6 +33,7 @@ __all__ = [
     "ModalSelectionFlag",
     "ModalStringFlag",
     "NuitkaSettingsScreen",
+    "SizeReportScreen",
     "SplashScreen",
     "SupportNuitkaModal",
 ]
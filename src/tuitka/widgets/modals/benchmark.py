@@ -0,0 +1,121 @@
+import shlex
+from pathlib import Path
+from typing import ClassVar
+
+from textual import on, work
+from textual.app import ComposeResult
+from textual.binding import BindingType
+from textual.containers import Horizontal, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Input, ProgressBar, Static
+from textual.worker import get_current_worker
+
+from tuitka.assets import STYLE_MODAL_BENCHMARK
+from tuitka.constants import DEFAULT_BENCHMARK_RUNS
+
+
+class BenchmarkScreen(ModalScreen):
+    """Run a build's program and its script under CPython, and compare them."""
+
+    CSS_PATH = STYLE_MODAL_BENCHMARK
+
+    BINDINGS: ClassVar[list[BindingType]] = [("escape", "dismiss", "Close")]
+
+    def __init__(
+        self, script: Path, artifacts: list[Path], python_version: str
+    ) -> None:
+        super().__init__()
+        self.script = script
+        self.artifacts = artifacts
+        self.python_version = python_version
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="benchmark_dialog"):
+            yield Static(
+                f"Benchmark {self.script.name} compiled against CPython",
+                classes="benchmark-header",
+            )
+            with Horizontal(id="benchmark_options"):
+                yield Input(
+                    placeholder="Arguments for both programs",
+                    id="benchmark_args",
+                )
+                yield Input(
+                    str(DEFAULT_BENCHMARK_RUNS),
+                    type="integer",
+                    id="benchmark_runs",
+                    tooltip="Cold and warm runs of each program.",
+                )
+                yield Button("Run", variant="success", id="btn_run")
+            yield ProgressBar(id="benchmark_progress", show_eta=False)
+            yield Static(id="benchmark_results")
+            with Horizontal(classes="benchmark-controls"):
+                yield Button("Close", variant="primary", id="btn_close_benchmark")
+
+    def on_mount(self) -> None:
+        self.query_one("#benchmark_progress").display = False
+
+    @on(Button.Pressed, "#btn_run")
+    @on(Input.Submitted)
+    def start_benchmark(self) -> None:
+        runs_input = self.query_one("#benchmark_runs", Input)
+        runs = int(runs_input.value) if runs_input.value.isdigit() else 0
+        if runs < 2:
+            self.notify(
+                "A confidence interval needs at least 2 runs.", severity="error"
+            )
+            return
+        try:
+            arguments = shlex.split(self.query_one("#benchmark_args", Input).value)
+        except ValueError as error:
+            self.notify(f"Invalid arguments: {error}", severity="error")
+            return
+
+        self.query_one("#btn_run", Button).disabled = True
+        self.query_one("#benchmark_results", Static).update("")
+        progress = self.query_one("#benchmark_progress", ProgressBar)
+        progress.update(progress=0, total=None)
+        progress.display = True
+        self.run_benchmark(arguments, runs)
+
+    @work(thread=True, exclusive=True, group="benchmark")
+    def run_benchmark(self, arguments: list[str], runs: int) -> None:
+        from tuitka.benchmark import benchmark_build
+
+        worker = get_current_worker()
+        try:
+            report = benchmark_build(
+                self.script,
+                self.artifacts,
+                self.python_version,
+                arguments,
+                runs,
+                lambda done, total: self.app.call_from_thread(
+                    self.show_progress, done, total
+                ),
+                should_stop=lambda: worker.is_cancelled,
+            )
+        except OSError as error:
+            report = f"The benchmark could not run the programs: {error}"
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_report, report)
+
+    def show_progress(self, done: int, total: int) -> None:
+        self.query_one("#benchmark_progress", ProgressBar).update(
+            progress=done, total=total
+        )
+
+    def show_report(self, report) -> None:
+        self.query_one("#benchmark_progress").display = False
+        self.query_one("#btn_run", Button).disabled = False
+        results = self.query_one("#benchmark_results", Static)
+        if report is None:
+            results.update("The build produced no program to run.")
+        elif isinstance(report, str):
+            results.update(report)
+        else:
+            results.update(report.make_table())
+
+    @on(Button.Pressed, "#btn_close_benchmark")
+    def on_close_pressed(self) -> None:
+        self.dismiss()
@@ -1,87 +1,122 @@
 from pathlib import Path
 
-from textual import on
+from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
-from textual.reactive import reactive
 from textual.screen import ModalScreen
-from textual.widgets import Button, Static
-from tuitka.constants import PYTHON_VERSION
-from textual_tty.widgets import TextualTerminal
-from tuitka.utils import prepare_nuitka_command
+from textual.widgets import Button, Checkbox, Static
+from textual.worker import get_current_worker
+
 from tuitka.assets import STYLE_MODAL_COMPILATION
-import os
+from tuitka.batch import BuildJob
+from tuitka.build_queue import RUNNING
+from tuitka.constants import PYTHON_VERSION
+from tuitka.watch import make_watch_job
+from tuitka.widgets.build_view import BuildView
 
 
 class CompilationScreen(ModalScreen):
     CSS_PATH = STYLE_MODAL_COMPILATION
 
-    compilation_finished: reactive[bool] = reactive(False, init=False)
-    compilation_success: reactive[bool] = reactive(False, init=False)
-
-    def __init__(self, python_version: str = PYTHON_VERSION, **nuitka_options) -> None:
-        self.cwd = Path.cwd()
-        os.chdir(self.app.script.parent)
+    def __init__(
+        self,
+        python_version: str = PYTHON_VERSION,
+        *,
+        script: str | Path | None = None,
+        reuse_build: bool = False,
+        artifact_cache: bool = True,
+        watch: bool = False,
+        **nuitka_options,
+    ) -> None:
         super().__init__()
-        self.python_version = python_version
-        self.nuitka_options = nuitka_options
-        self.terminal = None
-        self.nuitka_command = None
-        self.deps_metadata = None
+        self.job = BuildJob(
+            Path(script or self.app.script).resolve(),
+            nuitka_options,
+            python_version,
+            reuse_build=reuse_build,
+            artifact_cache=artifact_cache,
+        )
+        self.watching = watch
+        if watch:
+            self.job = make_watch_job(self.job)
+        # Files whose change cancelled the running build, to build next.
+        self.pending_changes: set[Path] | None = None
 
     def compose(self) -> ComposeResult:
-        self.nuitka_command, self.deps_metadata = prepare_nuitka_command(
-            self.app.script, self.python_version, **self.nuitka_options
-        )
+        with Vertical(id="compilation_dialog"):
+            with Horizontal(id="watch_controls"):
+                yield Checkbox(
+                    "Rebuild on change",
+                    self.watching,
+                    id="watch_toggle",
+                    tooltip="Compile again whenever the script or a local module "
+                    "it imports changes, reusing the previous build directory.",
+                )
+                yield Static(id="watch_status")
+            yield BuildView(self.job, id="build_view")
 
-        with Vertical():
-            yield TextualTerminal(
-                id="compilation_terminal", command=self.nuitka_command
-            )
-            yield Static(
-                "Compilation in progress...",
-                id="status_label",
-                classes="compilation-status in-progress",
-            )
-            with Horizontal(classes="compilation-controls"):
-                yield Button("Close", variant="default", id="btn_close", disabled=True)
-                yield Button("Cancel", variant="error", id="btn_cancel")
+    def on_mount(self) -> None:
+        if self.watching:
+            self.watch_sources()
 
-    @on(Button.Pressed)
-    def handle_button_press(self, event: Button.Pressed) -> None:
-        if event.button.id == "btn_close":
-            self.dismiss()
-        elif event.button.id == "btn_cancel":
-            self.cancel_compilation()
+    @on(Button.Pressed, "#btn_close")
+    def close(self) -> None:
+        self.dismiss()
+
+    @on(BuildView.Finished)
+    async def on_build_finished(self, event: BuildView.Finished) -> None:
+        if self.pending_changes is not None:
+            await self.restart_build(self.pending_changes)
+        elif event.view.cancelling:
             self.dismiss()
 
-    def watch_compilation_finished(self, finished: bool) -> None:
-        if finished:
-            close_btn = self.query_one("#btn_close", Button)
-            cancel_btn = self.query_one("#btn_cancel", Button)
-            status_label = self.query_one("#status_label", Static)
+    @on(Checkbox.Changed, "#watch_toggle")
+    def on_watch_toggled(self, event: Checkbox.Changed) -> None:
+        self.watching = event.value
+        if self.watching:
+            self.job = make_watch_job(self.job)
+            self.watch_sources()
+        else:
+            self.workers.cancel_group(self, "watch")
+            self.show_watch_status("")
 
-            close_btn.disabled = False
-            cancel_btn.disabled = True
+    @work(thread=True, exclusive=True, group="watch")
+    def watch_sources(self) -> None:
+        from tuitka.watch import FileWatcher, get_watched_files
 
-            if self.compilation_success:
-                status_label.update("✓ Compilation completed successfully!")
-                status_label.set_class(True, "success")
-                status_label.set_class(False, "in-progress")
-            else:
-                status_label.update("✗ Compilation failed!")
-                status_label.set_class(True, "error")
-                status_label.set_class(False, "in-progress")
+        worker = get_current_worker()
+        watcher = FileWatcher(get_watched_files(self.job.script))
+        try:
+            while not worker.is_cancelled:
+                self.app.call_from_thread(
+                    self.show_watch_status,
+                    f"Watching {len(watcher.paths)} files ({watcher.backend.name})",
+                )
+                changed = watcher.wait(should_stop=lambda: worker.is_cancelled)
+                if changed and not worker.is_cancelled:
+                    self.app.call_from_thread(self.on_sources_changed, changed)
+                # New imports bring new files to watch.
+                watcher.set_paths(get_watched_files(self.job.script))
+        finally:
+            watcher.close()
 
-    def on_mount(self) -> None:
-        self.terminal = self.query_one("#compilation_terminal", TextualTerminal)
+    async def on_sources_changed(self, changed: set[Path]) -> None:
+        view = self.query_one(BuildView)
+        if view.state == RUNNING:
+            # Restarted once the cancelled build reported its end.
+            self.pending_changes = changed
+            view.cancel()
+        else:
+            await self.restart_build(changed)
 
-    def cancel_compilation(self) -> None:
-        if self.terminal:
-            self.terminal.stop_process()
+    async def restart_build(self, changed: set[Path]) -> None:
+        self.pending_changes = None
+        await self.query_one(BuildView).remove()
+        await self.query_one("#compilation_dialog").mount(
+            BuildView(self.job, id="build_view")
+        )
+        names = ", ".join(sorted(path.name for path in changed))
+        self.show_watch_status(f"{names} changed, rebuilding")
 
-    @on(TextualTerminal.ProcessExited)
-    def on_process_exited(self, event: TextualTerminal.ProcessExited) -> None:
-        self.compilation_success = event.exit_code == 0
-        self.compilation_finished = True
-        os.chdir(self.cwd)
+    def show_watch_status(self, text: str) -> None:
+        self.query_one("#watch_status", Static).update(text)
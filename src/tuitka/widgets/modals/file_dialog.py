@@ -1,20 +1,28 @@
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Iterable
 
-from textual import on
+from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.reactive import reactive
 from textual.screen import ModalScreen
-from textual.widgets import Button, DirectoryTree, Input
+from textual.widgets import Button, DirectoryTree, Input, OptionList, Static
+from textual.worker import get_current_worker
 
 from tuitka.assets import STYLE_MODAL_FILEDIALOG
+from tuitka.file_index import FileIndex, is_excluded_directory
+
+SEARCH_RESULTS_LIMIT = 200
 
 
 class CustomDirectoryTree(DirectoryTree):
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
-        exclude_patterns = (".", "__pycache__")
-        return [path for path in paths if not path.name.startswith(exclude_patterns)]
+        return [
+            path
+            for path in paths
+            if not path.name.startswith(".")
+            and not (path.is_dir() and is_excluded_directory(path))
+        ]
 
 
 class FileDialogScreen(ModalScreen[str | None]):
@@ -23,8 +31,15 @@ class FileDialogScreen(ModalScreen[str | None]):
     dir_root: reactive[Path] = reactive(Path.cwd(), init=False)
     selected_py_file: reactive[str] = reactive("", init=False)
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.file_index: FileIndex | None = None
+        self.search_results: list[str] = []
+
     def on_mount(self) -> None:
         self.query_one(Input).focus()
+        self.query_one("#search_results").display = False
+        self.index_directory(self.dir_root)
 
     def compose(self) -> ComposeResult:
         with Vertical():
@@ -39,7 +54,13 @@ class FileDialogScreen(ModalScreen[str | None]):
                     "📁", variant="default", id="btn_cwd", tooltip="Current Dir"
                 )
 
+            yield Input(
+                placeholder="Find a Python file below this directory",
+                id="search_input",
+            )
+            yield Static(id="index_status", classes="index-status")
             yield CustomDirectoryTree(path=self.dir_root, id="file_tree")
+            yield OptionList(id="search_results")
 
             with Horizontal(id="horizontal-navigation"):
                 yield Button(
@@ -69,6 +90,69 @@ class FileDialogScreen(ModalScreen[str | None]):
         except (OSError, ValueError):
             pass
 
+    @work(thread=True, exclusive=True, group="file_index")
+    def index_directory(self, root: Path) -> None:
+        """Show the persisted index of ``root`` at once, then bring it up to date."""
+        worker = get_current_worker()
+        file_index = FileIndex.load(root)
+        if len(file_index):
+            self.app.call_from_thread(self.show_index, file_index, False)
+        else:
+            self.app.call_from_thread(
+                self.query_one("#index_status", Static).update,
+                "Indexing Python files...",
+            )
+        if file_index.refresh(should_stop=lambda: worker.is_cancelled):
+            file_index.save()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_index, file_index, True)
+
+    def show_index(self, file_index: FileIndex, complete: bool) -> None:
+        if file_index.root != self.dir_root.resolve():
+            return
+        self.file_index = file_index
+        count = len(file_index)
+        self.query_one("#index_status", Static).update(
+            f"{count:,} Python file{'s' if count != 1 else ''}"
+            + ("" if complete else ", updating...")
+        )
+        self.search(self.query_one("#search_input", Input).value)
+
+    @on(Input.Changed, "#search_input")
+    def on_search_changed(self, event: Input.Changed) -> None:
+        self.search(event.value)
+
+    def search(self, query: str) -> None:
+        searching = bool(query.strip())
+        self.query_one("#file_tree").display = not searching
+        results = self.query_one("#search_results", OptionList)
+        results.display = searching
+        if not searching or self.file_index is None:
+            return
+        self.search_results = self.file_index.search(query, SEARCH_RESULTS_LIMIT)
+        results.clear_options()
+        results.add_options(self.search_results)
+        if self.search_results:
+            results.highlighted = 0
+
+    @on(Input.Submitted, "#search_input")
+    def on_search_submitted(self) -> None:
+        results = self.query_one("#search_results", OptionList)
+        if results.display and results.highlighted is not None:
+            self.dismiss(result=self.get_result_path(results.highlighted))
+
+    def get_result_path(self, index: int) -> str:
+        return (self.file_index.root / self.search_results[index]).as_posix()
+
+    @on(OptionList.OptionHighlighted, "#search_results")
+    def on_result_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        self.selected_py_file = self.get_result_path(event.option_index)
+        self.query_one("#btn_select").disabled = False
+
+    @on(OptionList.OptionSelected, "#search_results")
+    def on_result_selected(self, event: OptionList.OptionSelected) -> None:
+        self.dismiss(result=self.get_result_path(event.option_index))
+
     @on(DirectoryTree.FileSelected)
     def handle_file_selection(self, event: DirectoryTree.FileSelected) -> None:
         if event.path.suffix == ".py":
@@ -82,6 +166,8 @@ class FileDialogScreen(ModalScreen[str | None]):
         if self.dir_root.exists() and self.dir_root.is_dir():
             self.query_one("#file_tree", CustomDirectoryTree).path = self.dir_root
             self.query_one("#path_input", Input).value = self.dir_root.as_posix()
+            self.file_index = None
+            self.index_directory(self.dir_root)
 
     def _set_directory(self, path: Path) -> None:
         self.dir_root = path
@@ -1,11 +1,23 @@
-from textual import on
+from asyncio import gather
+from functools import partial
+from pathlib import Path
+
+from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Horizontal, ScrollableContainer
 from textual.screen import ModalScreen
+from textual.widget import AwaitMount
 from textual.widgets import Button, Collapsible, Input, Static
 
-from tuitka.utils import create_nuitka_options_dict
+from tuitka.nuitka_options import (
+    NuitkaOption,
+    load_nuitka_options,
+    load_option_search_index,
+)
 from tuitka.assets import STYLE_MODAL_SETTINGS
+from tuitka.bloat import BloatRecommendation, analyze_bloat, apply_recommendations
+from tuitka.constants import PYTHON_VERSION
+from tuitka.resources import format_size, get_cpu_count
 from .settings_widgets import (
     ModalBoolFlag,
     ModalStringFlag,
@@ -13,6 +25,8 @@ from .settings_widgets import (
     ModalRadioFlag,
 )
 
+SEARCH_DEBOUNCE_SECONDS = 0.15
+
 
 class NuitkaSettingsScreen(ModalScreen[dict | None]):
     CSS_PATH = STYLE_MODAL_SETTINGS
@@ -24,7 +38,21 @@ class NuitkaSettingsScreen(ModalScreen[dict | None]):
             ModalBoolFlag | ModalStringFlag | ModalSelectionFlag | ModalRadioFlag
         ] = []
 
-        self.nuitka_options = create_nuitka_options_dict()
+        self.nuitka_options = load_nuitka_options()
+        # Flag rows are only mounted once their group is expanded, so opening
+        # the screen stays cheap no matter how many options Nuitka has.
+        self.pending_groups: dict[str, list[tuple[str, NuitkaOption]]] = {}
+        self.group_flags: dict[str, frozenset[str]] = {}
+        self.all_flags: set[str] = set()
+        self.widgets_by_flag: dict[
+            str, ModalBoolFlag | ModalStringFlag | ModalSelectionFlag | ModalRadioFlag
+        ] = {}
+
+        self.search_index = load_option_search_index()
+        self.search_timer = None
+        # None means no filter is active and every row is visible.
+        self.visible_flags: set[str] | None = None
+        self.bloat_recommendations: list[BloatRecommendation] = []
 
     def compose(self) -> ComposeResult:
         yield Static("Nuitka Settings", classes="settings-header")
@@ -34,23 +62,34 @@ class NuitkaSettingsScreen(ModalScreen[dict | None]):
                 id="search_input",
                 classes="filter-input",
             )
+            yield Static("", id="search_status", classes="filter-label")
+        with Horizontal(id="bloat-controls"):
+            yield Button("Find bloat", id="bloat_button")
+            yield Button("Apply", variant="primary", id="apply_bloat_button")
+        yield Static("", id="bloat_report", classes="bloat-report")
         with ScrollableContainer(id="settings-container"):
-            for category, options in self.nuitka_options.items():
-                with Collapsible(title=category):
-                    for flag, config in options.items():
-                        if self.should_skip_flag(flag, config):
-                            continue
+            for index, (category, options) in enumerate(self.nuitka_options.items()):
+                group_options = [
+                    (flag, option)
+                    for flag, option in options.items()
+                    if not self.should_skip_flag(flag, option)
+                ]
+                if not group_options:
+                    continue
 
-                        widget = self._create_flag_widget(flag, config)
-                        if widget:
-                            self.flag_widgets.append(widget)
-                            yield widget
+                group_id = f"settings_group_{index}"
+                self.pending_groups[group_id] = group_options
+                self.group_flags[group_id] = frozenset(
+                    flag for flag, _ in group_options
+                )
+                self.all_flags.update(self.group_flags[group_id])
+                yield Collapsible(title=category, id=group_id)
 
         with Horizontal(classes="settings-controls"):
             yield Button("Save", variant="success", id="save_button")
             yield Button("Cancel", variant="error", id="cancel_button")
 
-    def should_skip_flag(self, flag: str, config: dict) -> bool:
+    def should_skip_flag(self, flag: str, option: NuitkaOption) -> bool:
         skip_flags = {
             "--help",
             "-h",
@@ -63,21 +102,40 @@ class NuitkaSettingsScreen(ModalScreen[dict | None]):
         if flag in skip_flags:
             return True
 
-        if config.get("action") == "help":
+        if option.action == "help":
             return True
 
-        if config.get("help") == "SUPPRESSHELP":
-            return True
+        return option.help == "SUPPRESSHELP"
+
+    @on(Collapsible.Expanded)
+    async def on_group_expanded(self, event: Collapsible.Expanded) -> None:
+        await_mount = self.populate_group(event.collapsible)
+        if await_mount is not None:
+            await await_mount
 
-        return False
+    def populate_group(self, collapsible: Collapsible) -> AwaitMount | None:
+        group_options = self.pending_groups.pop(collapsible.id, None)
+        if not group_options:
+            return None
 
-    def _create_flag_widget(self, flag: str, config: dict):
-        action = config.get("action", "store")
-        flag_type = config.get("type")
-        choices = config.get("choices")
-        default = config.get("default")
-        help_text = config.get("help", "")
-        metavar = config.get("metavar", "")
+        widgets = []
+        for flag, option in group_options:
+            widget = self._create_flag_widget(flag, option)
+            if widget:
+                if self.visible_flags is not None:
+                    widget.display = flag in self.visible_flags
+                self.widgets_by_flag[flag] = widget
+                widgets.append(widget)
+        self.flag_widgets.extend(widgets)
+        return collapsible.query_one(Collapsible.Contents).mount_all(widgets)
+
+    def _create_flag_widget(self, flag: str, option: NuitkaOption):
+        action = option.action or "store"
+        flag_type = option.type
+        choices = option.choices
+        default = option.default
+        help_text = option.help
+        metavar = option.metavar or ""
 
         current_value = self.current_settings.get(flag)
 
@@ -119,50 +177,144 @@ class NuitkaSettingsScreen(ModalScreen[dict | None]):
 
     @on(Input.Changed, "#search_input")
     def on_search_changed(self, event: Input.Changed) -> None:
+        if self.search_timer is not None:
+            self.search_timer.stop()
         search_term = event.value.lower().strip()
-        self.filter_settings(search_term)
+        self.search_timer = self.set_timer(
+            SEARCH_DEBOUNCE_SECONDS, partial(self.filter_settings, search_term)
+        )
+
+    async def filter_settings(self, search_term: str) -> None:
+        self.search_timer = None
+        matches = None
+        if search_term:
+            matches = [
+                flag
+                for flag in self.search_index.search(search_term)
+                if flag in self.all_flags
+            ]
 
-    def filter_settings(self, search_term: str) -> None:
-        query_selector = (
-            "ModalBoolFlag, ModalStringFlag, ModalSelectionFlag, ModalRadioFlag"
+        previous_visible = (
+            self.all_flags if self.visible_flags is None else self.visible_flags
         )
-        all_widgets = self.query(query_selector)
-        all_collapsibles = self.query(Collapsible)
-
-        if not search_term:
-            for widget in all_widgets:
-                widget.display = True
-            for collapsible in all_collapsibles:
-                collapsible.display = True
+        self.visible_flags = None if matches is None else set(matches)
+        visible = self.all_flags if self.visible_flags is None else self.visible_flags
+        mounted_widgets = dict(self.widgets_by_flag)
+        pending_mounts = []
+
+        for group_id, group_flags in self.group_flags.items():
+            collapsible = self.query_one(f"#{group_id}", Collapsible)
+            group_visible = not visible.isdisjoint(group_flags)
+            if collapsible.display != group_visible:
+                collapsible.display = group_visible
+            if matches is None:
                 collapsible.collapsed = True
-            self.query_one("#settings-container", ScrollableContainer).scroll_home(
-                animate=False
+            elif group_visible:
+                await_mount = self.populate_group(collapsible)
+                if await_mount is not None:
+                    pending_mounts.append(await_mount)
+                collapsible.collapsed = False
+
+        # Only rows whose visibility flipped are touched, newly mounted rows
+        # already got the right visibility in populate_group.
+        for flag in previous_visible ^ visible:
+            widget = mounted_widgets.get(flag)
+            if widget is not None:
+                widget.display = flag in visible
+
+        status = self.query_one("#search_status", Static)
+        status.update("" if matches is None else f"{len(matches)} matches")
+
+        if pending_mounts:
+            await gather(*pending_mounts)
+
+        container = self.query_one("#settings-container", ScrollableContainer)
+        best_match = self.widgets_by_flag.get(matches[0]) if matches else None
+        if best_match is not None:
+            self.call_after_refresh(
+                container.scroll_to_widget, best_match, animate=False, top=True
             )
+        else:
+            container.scroll_home(animate=False)
+
+    @on(Button.Pressed, "#bloat_button")
+    def on_bloat_pressed(self) -> None:
+        report = self.query_one("#bloat_report", Static)
+        report.display = True
+        script = Path(self.app.script) if getattr(self.app, "script", None) else None
+        if script is None or not script.is_file():
+            report.update("Choose the script to compile first.")
             return
+        report.update(f"Looking for heavy modules {script.name} does not use...")
+        self.find_bloat(script)
 
-        for collapsible in all_collapsibles:
-            collapsible.display = False
+    @work(thread=True, exclusive=True, group="bloat")
+    def find_bloat(self, script: Path) -> None:
+        recommendations = analyze_bloat(script, PYTHON_VERSION)
+        self.app.call_from_thread(self.show_bloat, recommendations)
 
-        for widget in all_widgets:
-            match = (
-                search_term in widget.flag.lower()
-                or search_term in widget.help_text.lower()
-            )
-            widget.display = match
-            if match:
-                parent = widget.parent
-                while parent is not None and not isinstance(parent, Collapsible):
-                    parent = parent.parent
-                if parent is not None:
-                    parent.display = True
-                    parent.collapsed = False
-        self.query_one("#settings-container", ScrollableContainer).scroll_home(
-            animate=False
+    def show_bloat(self, recommendations: list[BloatRecommendation]) -> None:
+        self.bloat_recommendations = recommendations
+        report = self.query_one("#bloat_report", Static)
+        self.query_one("#apply_bloat_button", Button).display = bool(recommendations)
+        if not recommendations:
+            report.update("No heavy unused modules found.")
+            return
+
+        jobs = get_cpu_count()
+        seconds = sum(item.estimate_seconds(jobs) for item in recommendations)
+        size = sum(item.estimate_binary_bytes() for item in recommendations)
+        lines = [item.describe(jobs) for item in recommendations]
+        lines.append(
+            f"Together about {seconds:.0f} s of compilation on {jobs} CPU"
+            f"{'s' if jobs != 1 else ''} and {format_size(size)} of program "
+            "saved in standalone and onefile builds."
         )
+        report.update("\n".join(lines))
+
+    @on(Button.Pressed, "#apply_bloat_button")
+    async def on_apply_bloat_pressed(self) -> None:
+        flags = {flag for item in self.bloat_recommendations for flag in item.options}
+        current = {flag: self.get_flag_value(flag) for flag in flags}
+        options = apply_recommendations(
+            {flag: value for flag, value in current.items() if value},
+            self.bloat_recommendations,
+        )
+        for flag in sorted(flags):
+            await self.set_flag_value(flag, options[flag])
+        self.query_one("#apply_bloat_button", Button).display = False
+
+    def get_flag_value(self, flag: str):
+        widget = self.widgets_by_flag.get(flag)
+        if widget is None:
+            return self.current_settings.get(flag)
+        return widget.get_value()
+
+    async def set_flag_value(self, flag: str, value) -> None:
+        """Show the row of ``flag`` with ``value``, mounting its group if needed."""
+        for group_id, group_flags in self.group_flags.items():
+            if flag not in group_flags:
+                continue
+            collapsible = self.query_one(f"#{group_id}", Collapsible)
+            await_mount = self.populate_group(collapsible)
+            if await_mount is not None:
+                await await_mount
+            collapsible.collapsed = False
+            break
+        widget = self.widgets_by_flag.get(flag)
+        if widget is not None:
+            widget.set_value(value)
+        else:
+            self.current_settings[flag] = value
 
     @on(Button.Pressed, "#save_button")
     def on_save_pressed(self) -> None:
-        settings = {}
+        # Rows of groups never expanded keep the settings the screen got.
+        settings = {
+            flag: value
+            for flag, value in self.current_settings.items()
+            if flag not in self.widgets_by_flag
+        }
 
         for widget in self.flag_widgets:
             value = widget.get_value()
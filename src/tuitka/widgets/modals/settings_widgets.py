@@ -31,6 +31,10 @@ class ModalBoolFlag(Grid):
         else:
             return switch.value if switch.value != self.default else None
 
+    def set_value(self, value: bool) -> None:
+        switch = self.query_one(f"#switch_{self.flag}", Switch)
+        switch.value = not value if self.action == "store_false" else value
+
     def is_changed(self) -> bool:
         return self.query_one(Switch).value != self.initial_value
 
@@ -60,6 +64,9 @@ class ModalStringFlag(Grid):
         value = input_widget.value.strip()
         return value if value and value != str(self.default) else None
 
+    def set_value(self, value: str) -> None:
+        self.query_one(f"#input_{self.flag}", Input).value = value
+
     def is_changed(self) -> bool:
         return self.query_one(Input).value != self.initial_value
 
@@ -93,6 +100,9 @@ class ModalSelectionFlag(Grid):
             else None
         )
 
+    def set_value(self, value) -> None:
+        self.query_one(f"#select_{self.flag}", Select).value = value
+
     def is_changed(self) -> bool:
         return self.query_one(Select).value != self.initial_value
 
@@ -127,6 +137,11 @@ class ModalRadioFlag(Grid):
             return selected_value if selected_value != self.default else None
         return None
 
+    def set_value(self, value: str) -> None:
+        radio_set = self.query_one(f"#radio_{self.flag}", RadioSet)
+        for button in radio_set.query(RadioButton):
+            button.value = str(button.label) == value
+
     def is_changed(self) -> bool:
         radio_set = self.query_one(RadioSet)
         if radio_set.pressed_button:
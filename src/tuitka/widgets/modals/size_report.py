@@ -0,0 +1,112 @@
+from pathlib import Path
+from typing import ClassVar
+
+from rich.console import Group
+from rich.text import Text
+from textual import on, work
+from textual.app import ComposeResult
+from textual.binding import BindingType
+from textual.containers import Horizontal, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Static, Tree
+from textual.widgets.tree import TreeNode
+from textual.worker import get_current_worker
+
+from tuitka.assets import STYLE_MODAL_SIZE_REPORT
+
+
+class SizeReportScreen(ModalScreen):
+    """Where the size of a build's outputs goes, as a tree sorted by size."""
+
+    CSS_PATH = STYLE_MODAL_SIZE_REPORT
+
+    BINDINGS: ClassVar[list[BindingType]] = [
+        ("escape", "dismiss", "Close"),
+        ("s", "toggle_sort", "Sort"),
+    ]
+
+    def __init__(self, artifacts: list[Path]) -> None:
+        super().__init__()
+        self.artifacts = artifacts
+        self.reports = []
+        self.sort_by = "size"
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="size_dialog"):
+            yield Static("Size of the build outputs", classes="size-header")
+            yield Static("Reading the build outputs...", id="size_summary")
+            tree = Tree("Build outputs", id="size_tree")
+            tree.show_root = False
+            yield tree
+            with Horizontal(classes="size-controls"):
+                yield Button("Sort by name", id="btn_sort", disabled=True)
+                yield Button("Close", variant="primary", id="btn_close_sizes")
+
+    def on_mount(self) -> None:
+        self.analyze()
+
+    @work(thread=True, exclusive=True, group="size_report")
+    def analyze(self) -> None:
+        from tuitka.size_report import analyze_artifacts
+
+        worker = get_current_worker()
+        try:
+            reports = analyze_artifacts(self.artifacts)
+        except (OSError, ValueError) as error:
+            reports = f"The build outputs could not be read: {error}"
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_reports, reports)
+
+    def show_reports(self, reports) -> None:
+        summary = self.query_one("#size_summary", Static)
+        if isinstance(reports, str):
+            summary.update(reports)
+            return
+        self.reports = reports
+        summary.update(Group(*(report.make_kinds_table() for report in reports)))
+        self.query_one("#btn_sort", Button).disabled = False
+        self.fill_tree()
+
+    def fill_tree(self) -> None:
+        tree = self.query_one("#size_tree", Tree)
+        tree.clear()
+        for report in self.reports:
+            node = tree.root.add(
+                self.make_label(report.root, report.root.size),
+                data=(report.root, report.root.size),
+            )
+            self.add_children(node)
+            node.expand()
+
+    def add_children(self, node: TreeNode) -> None:
+        size_node, total = node.data
+        for child in size_node.sorted_children(self.sort_by):
+            label = self.make_label(child, total)
+            if child.is_folder:
+                node.add(label, data=(child, total), allow_expand=bool(child.children))
+            else:
+                node.add_leaf(label, data=(child, total))
+
+    def make_label(self, node, total: int) -> Text:
+        from tuitka.size_report import format_node
+
+        return Text(format_node(node, total))
+
+    @on(Tree.NodeExpanded)
+    def on_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        # Folders are filled when first opened, large programs have many files.
+        if event.node.data is not None and not event.node.children:
+            self.add_children(event.node)
+
+    @on(Button.Pressed, "#btn_sort")
+    def action_toggle_sort(self) -> None:
+        if not self.reports:
+            return
+        self.sort_by = "name" if self.sort_by == "size" else "size"
+        other = "size" if self.sort_by == "name" else "name"
+        self.query_one("#btn_sort", Button).label = f"Sort by {other}"
+        self.fill_tree()
+
+    @on(Button.Pressed, "#btn_close_sizes")
+    def on_close_pressed(self) -> None:
+        self.dismiss()
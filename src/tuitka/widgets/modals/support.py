@@ -4,11 +4,7 @@ from textual.containers import Horizontal, Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Button, Markdown, TabbedContent, TabPane
 
-from tuitka.assets import (
-    STYLE_MODAL_SUPPORT,
-    CONTENT_SUPPORT_NUITKA,
-    CONTENT_COMMERCIAL,
-)
+from tuitka.assets import STYLE_MODAL_SUPPORT, get_asset_content
 
 
 class SupportNuitkaModal(ModalScreen):
@@ -24,10 +20,10 @@ class SupportNuitkaModal(ModalScreen):
         with Vertical(id="support-dialog"):
             with TabbedContent(initial="support"):
                 with TabPane("Support Nuitka", id="support"):
-                    yield Markdown(CONTENT_SUPPORT_NUITKA)
+                    yield Markdown(get_asset_content("content/support_nuitka.md"))
 
                 with TabPane("Commercial", id="commercial"):
-                    yield Markdown(CONTENT_COMMERCIAL)
+                    yield Markdown(get_asset_content("content/commercial.md"))
 
             with Horizontal(classes="support-controls"):
                 yield Button("Close", variant="primary", id="close_button")
@@ -1,18 +1,12 @@
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Vertical, Center, Container
-from textual.widgets import Button, Input, Static
+from textual.widgets import Button, Checkbox, Input, Static
 from textual.widgets import RadioButton, RadioSet
 from tuitka.constants import PYTHON_VERSION
 from tuitka.widgets.nuitka_header import NuitkaHeader
 from pathlib import Path
 
-from tuitka.widgets.modals import (
-    CompilationScreen,
-    FileDialogScreen,
-    NuitkaSettingsScreen,
-)
-
 
 class ScriptInput(Input):
     def __init__(self, *args, **kwargs) -> None:
@@ -39,6 +33,7 @@ class ScriptInputWidget(Container):
         height: 1fr;
         align: center middle;
         padding: 1;
+        overflow-y: auto;
     }
 
     #main_container {
@@ -123,6 +118,13 @@ class ScriptInputWidget(Container):
         outline: none;
     }
 
+    #reuse_build_checkbox, #watch_checkbox {
+        width: auto;
+        margin-top: 1;
+        background: transparent;
+        border: none;
+    }
+
     #compile_button_container {
         width: 1fr;
         height: auto;
@@ -156,6 +158,19 @@ class ScriptInputWidget(Container):
                     yield RadioButton("Onefile", id="onefile_preset", value=True)
                     yield RadioButton("Standalone", id="standalone_preset")
                     yield RadioButton("Custom", id="custom_settings")
+                with Center():
+                    yield Checkbox(
+                        "Reuse build directory",
+                        id="reuse_build_checkbox",
+                        tooltip="Keep the build directory in tuitka's cache, so "
+                        "rebuilds after small edits are faster.",
+                    )
+                    yield Checkbox(
+                        "Rebuild on change",
+                        id="watch_checkbox",
+                        tooltip="Compile again whenever the script or a local "
+                        "module it imports changes, instead of queueing one build.",
+                    )
 
                 # Python version selection temporarily disabled - using current Python version
                 # yield Static("Python Version", classes="sub_title")
@@ -199,6 +214,8 @@ class ScriptInputWidget(Container):
     def on_radio_changed(self, event: RadioSet.Changed) -> None:
         selected_button = event.radio_set.pressed_button
         if selected_button and selected_button.id == "custom_settings":
+            from tuitka.widgets.modals.settings import NuitkaSettingsScreen
+
             self.app.push_screen(
                 NuitkaSettingsScreen(self.custom_settings), self._handle_custom_settings
             )
@@ -207,10 +224,12 @@ class ScriptInputWidget(Container):
 
     @on(Button.Pressed, "#browse_button")
     def open_file_dialog(self) -> None:
+        from tuitka.widgets.modals.file_dialog import FileDialogScreen
+
         self.app.push_screen(FileDialogScreen(), callback=self._handle_file_selection)
 
     @on(Button.Pressed, "#compile_button")
-    def start_compilation(self) -> None:
+    async def start_compilation(self) -> None:
         script_input = self.query_one("#script_input", ScriptInput)
         if script_input.value.strip():
             radioset = self.query_one("#settings_radioset", RadioSet)
@@ -232,7 +251,30 @@ class ScriptInputWidget(Container):
             elif selected_preset.id == "custom_settings" and self.custom_settings:
                 nuitka_options = self.custom_settings
 
-            self.app.push_screen(CompilationScreen(python_version, **nuitka_options))
+            reuse_build = self.query_one("#reuse_build_checkbox", Checkbox).value
+            if self.query_one("#watch_checkbox", Checkbox).value:
+                from tuitka.widgets.modals.compilation import CompilationScreen
+
+                self.app.push_screen(
+                    CompilationScreen(
+                        python_version,
+                        script=script_input.value.strip(),
+                        reuse_build=reuse_build,
+                        watch=True,
+                        **nuitka_options,
+                    )
+                )
+                return
+
+            from tuitka.batch import BuildJob
+
+            job = BuildJob(
+                Path(script_input.value.strip()).resolve(),
+                dict(nuitka_options),
+                python_version,
+                reuse_build=reuse_build,
+            )
+            await self.app.enqueue_build(job, str(selected_preset.label))
 
     def _handle_file_selection(self, selected_file: str | None) -> None:
         if selected_file:
@@ -0,0 +1,69 @@
+import pytest
+
+from tuitka.analysis import analyze_script, clear_analysis_memo
+from tuitka.utils import DependencyParser, prepare_nuitka_command
+
+
+@pytest.fixture
+def project(tmp_path):
+    clear_analysis_memo()
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "main.py").write_text("import helpers\nimport tkinter\n")
+    (root / "helpers.py").write_text("import yaml\n")
+    (root / "pyproject.toml").write_text('[project]\ndependencies = ["PyYAML"]\n')
+    yield root
+    clear_analysis_memo()
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    parse = DependencyParser.parse
+
+    def counting_parse(self):
+        calls.append(self.path)
+        return parse(self)
+
+    monkeypatch.setattr(DependencyParser, "parse", counting_parse)
+    return calls
+
+
+def test_analysis_is_reused_across_runs(project, parse_calls):
+    script = project / "main.py"
+    analysis = analyze_script(script)
+    assert analysis.dependencies == ["PyYAML"]
+    assert analysis.requirements_path == str(project / "pyproject.toml")
+    assert "tkinter" in analysis.imports
+    assert analysis.detected_imports == ["yaml"]
+
+    # A new process only finds the persisted analysis.
+    clear_analysis_memo()
+    assert analyze_script(script) == analysis
+    _, metadata = prepare_nuitka_command(script, "3.12", **{"--onefile": True})
+    assert metadata.dependencies == ["PyYAML"]
+    assert len(parse_calls) == 1
+
+    # Build output next to the script does not invalidate it.
+    (project / "main.build").mkdir()
+    (project / "main.bin").write_text("binary")
+    analyze_script(script)
+    assert len(parse_calls) == 1
+
+
+def test_analysis_follows_project_changes(project, parse_calls):
+    script = project / "main.py"
+    analyze_script(script)
+
+    (project / "helpers.py").write_text("import yaml\nimport requests\n")
+    assert "requests" in analyze_script(script).detected_imports
+
+    (project / "pyproject.toml").unlink()
+    (project / "requirements.txt").write_text("PyYAML\nrequests\n")
+    analysis = analyze_script(script)
+    assert analysis.dependencies == ["PyYAML", "requests"]
+
+    # A local module now shadows the third party one.
+    (project / "requests.py").write_text("")
+    assert "requests" not in analyze_script(script).detected_imports
+    assert len(parse_calls) == 4
@@ -0,0 +1,75 @@
+import pytest
+
+from tuitka.artifacts import ArtifactCacheEntry
+from tuitka.fingerprint import get_build_fingerprint
+from tuitka.utils import DependencyParser, prepare_nuitka_command
+
+OPTIONS = {"--onefile": True, "--jobs": "2", "--lto": "no"}
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "main.py").write_text("import helpers\n")
+    (root / "helpers.py").write_text("import yaml\n")
+    (root / "pyproject.toml").write_text(
+        '[project]\ndependencies = ["requests", "PyYAML", "attrs", "requests"]\n'
+    )
+    return root
+
+
+def fingerprint(script, **options):
+    _, metadata = prepare_nuitka_command(script, "3.12", **{**OPTIONS, **options})
+    return get_build_fingerprint(script, "3.12", {**OPTIONS, **options}, metadata)
+
+
+def test_pyproject_dependencies_keep_declaration_order(project):
+    parser = DependencyParser(project / "main.py")
+    dependencies = parser.parse_pyproject_toml(project / "pyproject.toml")
+    assert dependencies == ["requests", "PyYAML", "attrs"]
+
+
+def test_fingerprint_tracks_build_inputs(project):
+    script = project / "main.py"
+    digest = fingerprint(script).digest
+    assert digest == fingerprint(script).digest
+    assert digest == fingerprint(script, **{"--jobs": "8"}).digest
+    assert digest != fingerprint(script, **{"--lto": "yes"}).digest
+
+    (project / "helpers.py").write_text("import yaml\nimport json\n")
+    assert digest != fingerprint(script).digest
+
+
+@pytest.mark.parametrize("lto", ["yes", "no"])
+def test_fingerprint_ignores_picked_resources(project, lto):
+    script = project / "main.py"
+    options = {"--onefile": True}
+    _, metadata = prepare_nuitka_command(script, "3.12", **options)
+    digest = get_build_fingerprint(script, "3.12", options, metadata).digest
+
+    # The LTO picked depends on the memory free at the time of the build.
+    metadata.resource_profile.options["--lto"] = lto
+    assert digest == get_build_fingerprint(script, "3.12", options, metadata).digest
+    assert digest != get_build_fingerprint(
+        script, "3.12", {**options, "--lto": lto}, metadata
+    ).digest
+
+
+def test_artifact_cache_restores_stored_programs(project, tmp_path):
+    script = project / "main.py"
+    _, metadata = prepare_nuitka_command(script, "3.12", **OPTIONS)
+    entry = ArtifactCacheEntry(script, "3.12", OPTIONS, metadata)
+    assert entry.restore(project) is None
+
+    (project / "main.bin").write_text("binary")
+    (project / "main.dist").mkdir()
+    (project / "main.dist" / "lib.so").write_text("library")
+    entry.store([project / "main.bin", project / "main.dist"])
+
+    destination = tmp_path / "elsewhere"
+    destination.mkdir()
+    entry = ArtifactCacheEntry(script, "3.12", OPTIONS, metadata)
+    restored = entry.restore(destination)
+    assert restored == [destination / "main.bin", destination / "main.dist"]
+    assert (destination / "main.dist" / "lib.so").read_text() == "library"
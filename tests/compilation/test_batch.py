@@ -0,0 +1,40 @@
+import asyncio
+import sys
+
+import tuitka.batch as batch
+from tuitka.batch import BuildJob, get_worker_count, run_batch
+from tuitka.utils import expand_script_paths
+
+
+def test_worker_count_bounded_by_memory(monkeypatch):
+    monkeypatch.setattr(batch, "get_cpu_count", lambda: 64)
+    monkeypatch.setattr(batch, "get_available_memory", lambda: 5 * 1024**3)
+    assert get_worker_count(10) == 2
+    assert get_worker_count(1) == 1
+    assert get_worker_count(10, max_workers=1) == 1
+
+
+def test_expand_script_paths(tmp_path):
+    (tmp_path / "a.py").write_text("")
+    (tmp_path / "b.py").write_text("")
+    paths = expand_script_paths([str(tmp_path / "*.py"), str(tmp_path / "a.py")])
+    assert [path.name for path in paths] == ["a.py", "b.py"]
+
+
+def test_run_batch_uses_script_directories(tmp_path, monkeypatch):
+    def fake_command(script_path, python_version, **nuitka_options):
+        code = "import os, sys; print(os.getcwd()); sys.exit(os.path.basename(os.getcwd()) == 'bad')"
+        return [sys.executable, "-c", code], None
+
+    monkeypatch.setattr(batch, "prepare_nuitka_command", fake_command)
+
+    jobs = []
+    for name in ("good", "bad"):
+        (tmp_path / name).mkdir()
+        script = tmp_path / name / "main.py"
+        script.write_text("")
+        jobs.append(BuildJob(script))
+
+    results = asyncio.run(run_batch(jobs, workers=2))
+    assert [result.success for result in results] == [True, False]
+    assert results[0].log_path.read_text().strip() == str(tmp_path / "good")
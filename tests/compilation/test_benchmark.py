@@ -0,0 +1,89 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import tuitka.benchmark
+from tuitka.benchmark import (
+    Estimate,
+    benchmark_build,
+    find_executable,
+    measure_run,
+)
+
+
+def make_program(path, code):
+    path.write_text(f"#!{sys.executable}\n{code}")
+    path.chmod(0o755)
+    return path
+
+
+def test_estimate_confidence_interval():
+    estimate = Estimate.from_samples([1.0, 2.0, 3.0])
+    assert estimate.mean == 2.0
+    assert estimate.margin == pytest.approx(4.303 / 3**0.5)
+    assert estimate.format("seconds") == "2.00 s ± 2.48 s"
+    assert Estimate.from_samples([0.5]).format("seconds") == "500.0 ms"
+    assert Estimate.from_samples([]) is None
+
+
+def test_find_executable(tmp_path):
+    dist = tmp_path / "main.dist"
+    dist.mkdir()
+    (dist / "libpython3.so").write_text("")
+    (dist / "libpython3.so").chmod(0o755)
+    program = make_program(dist / "main.bin", "")
+    assert find_executable(dist) == program
+
+    (tmp_path / "main.pyi").write_text("")
+    assert find_executable(tmp_path / "main.pyi") is None
+
+
+def test_measure_run_reports_first_output(tmp_path):
+    sample = measure_run(
+        [sys.executable, "-c", "import time; print('ready', flush=True); time.sleep(0.3)"],
+        tmp_path,
+    )
+    assert sample.exit_code == 0
+    assert sample.startup < sample.wall - 0.2
+    if sys.platform == "linux":
+        assert sample.peak_rss > 1024**2
+
+
+def test_cold_runs_drop_the_interpreter_files(tmp_path):
+    import os
+    import sysconfig
+
+    files = set(tuitka.benchmark._get_interpreter_files(Path(sys.executable)))
+    assert Path(os.path.realpath(sys.executable)) in files
+    assert Path(sysconfig.get_paths()["stdlib"]) / "os.py" in files
+    assert not tuitka.benchmark._get_interpreter_files(tmp_path / "missing")
+
+
+def test_benchmark_build_saves_report_next_to_program(tmp_path, monkeypatch):
+    monkeypatch.setattr(tuitka.benchmark, "get_script_python", lambda *args: sys.executable)
+    script = tmp_path / "main.py"
+    script.write_text("import sys; print(sys.argv[1:]); sys.exit(len(sys.argv) > 2)\n")
+    program = make_program(tmp_path / "main.bin", script.read_text())
+
+    progress = []
+    report = benchmark_build(
+        script,
+        [program],
+        "3.11",
+        ["--fast"],
+        runs=3,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+    assert progress[-1] == (14, 14)
+    assert len(report.compiled.warm) == len(report.interpreted.cold) == 3
+    assert report.compiled.failed_runs == report.interpreted.failed_runs == 0
+    assert report.path == tmp_path / "main.bin.benchmark.json"
+    data = json.loads(report.path.read_text())
+    assert data["compiled"]["command"] == [str(program), "--fast"]
+    assert data["interpreted"]["estimates"]["wall"]["samples"] == 3
+    assert report.speedup > 0
+
+    assert benchmark_build(script, [script.with_suffix(".pyi")], "3.11") is None
+    assert benchmark_build(script, [program], "3.11", runs=3, should_stop=lambda: True) is None
@@ -0,0 +1,42 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_PATH = Path(__file__).parents[2] / "benchmarks" / "core.py"
+
+
+@pytest.fixture(scope="module")
+def core():
+    spec = importlib.util.spec_from_file_location("benchmarks_core", BENCHMARKS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_every_benchmark_has_a_baseline(core):
+    baseline = core.read_baseline(core.BASELINE_PATH)
+    assert sorted(baseline) == sorted(benchmark.name for benchmark in core.BENCHMARKS)
+
+
+def test_benchmarks_run(core, tmp_path):
+    # Each benchmark is called once, so the suite keeps up with the code.
+    for benchmark in core.BENCHMARKS:
+        directory = tmp_path / benchmark.name
+        directory.mkdir()
+        benchmark.setup(directory)()
+
+
+def test_regressions_fail_the_run(core, tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    benchmark = core.Benchmark("noop", lambda directory: lambda: None)
+    monkeypatch.setattr(core, "BENCHMARKS", (benchmark,))
+    monkeypatch.setattr(core, "measure", lambda function, repeat: 1.0)
+
+    assert core.main(["--baseline", str(baseline), "--update"]) == 0
+    assert json.loads(baseline.read_text())["benchmarks"] == {"noop": 1.0}
+
+    baseline.write_text(json.dumps({"benchmarks": {"noop": 0.5}}))
+    assert core.main(["--baseline", str(baseline)]) == 1
+    assert core.main(["--baseline", str(baseline), "--threshold", "1.5"]) == 0
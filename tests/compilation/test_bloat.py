@@ -0,0 +1,70 @@
+import importlib.metadata
+from pathlib import Path
+
+from tuitka.bloat import apply_recommendations, find_bloat, get_dependency_closure
+
+
+def make_distribution(site, name, files, requires=()):
+    dist_info = site / f"{name}-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    metadata = [f"Name: {name}", "Version: 1.0"]
+    metadata += [f"Requires-Dist: {requirement}" for requirement in requires]
+    (dist_info / "METADATA").write_text("\n".join(metadata) + "\n")
+    record = []
+    for path, size in files.items():
+        target = site / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("x" * size)
+        record.append(f"{path},,{size}")
+    (dist_info / "RECORD").write_text("\n".join(record) + "\n")
+
+
+def test_find_bloat_recommends_unused_heavy_modules(tmp_path):
+    site = tmp_path / "site"
+    make_distribution(
+        site,
+        "app-lib",
+        {
+            "app_lib/__init__.py": 1000,
+            "app_lib/tests/__init__.py": 300_000,
+            "app_lib/tests/data.bin": 50_000,
+        },
+        requires=["pytest", "docs-lib; extra == 'docs'"],
+    )
+    make_distribution(site, "pytest", {"_pytest/main.py": 400_000, "pytest.py": 10})
+    make_distribution(site, "docs-lib", {"docs_lib/big.py": 900_000})
+    make_distribution(site, "unrelated", {"unrelated/big.py": 900_000})
+
+    distributions = get_dependency_closure(
+        ["App_Lib>=1"], list(importlib.metadata.distributions(path=[str(site)]))
+    )
+    names = [distribution.metadata["Name"] for distribution in distributions]
+    assert names == ["app-lib", "pytest"]
+
+    recommendations = find_bloat(["app_lib"], [Path("main.py")], distributions)
+    by_title = {item.title: item for item in recommendations}
+    tests = by_title["Test suites of dependencies"]
+    assert tests.options == {"--nofollow-import-to": "*.tests"}
+    assert tests.modules == ["app_lib.tests"]
+    assert (tests.source_bytes, tests.other_bytes) == (300_000, 50_000)
+    assert by_title["pytest"].options == {"--noinclude-pytest-mode": "nofollow"}
+    assert by_title["pytest"].modules == ["_pytest.main", "pytest"]
+
+    # Modules the project imports itself are never excluded.
+    assert "pytest" not in {
+        item.title for item in find_bloat(["pytest"], [], distributions)
+    }
+
+
+def test_apply_recommendations_merges_exclusions(tmp_path):
+    site = tmp_path / "site"
+    make_distribution(site, "lib", {"lib/tests/test_big.py": 300_000})
+    distributions = list(importlib.metadata.distributions(path=[str(site)]))
+    recommendations = find_bloat([], [], distributions)
+
+    options = apply_recommendations(
+        {"--nofollow-import-to": "docs", "--noinclude-pydoc-mode": "allow"},
+        recommendations,
+    )
+    assert options["--nofollow-import-to"] == "docs,*.tests"
+    assert options["--noinclude-pydoc-mode"] == "allow"
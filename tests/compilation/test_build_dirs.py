@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+from tuitka.build_dirs import BuildDirectory, get_build_key, prune_build_dirs
+
+
+def test_build_key_ignores_output_location(tmp_path):
+    script = tmp_path / "main.py"
+    options = {"--onefile": True, "--remove-output": True}
+    key = get_build_key(script, "3.12", options)
+    assert key == get_build_key(
+        script, "3.12", {"--onefile": True, "--output-dir": "x"}
+    )
+    assert key != get_build_key(script, "3.12", {"--standalone": True})
+
+
+def test_build_directory_restores_outputs(tmp_path, monkeypatch):
+    script = tmp_path / "main.py"
+    script.write_text("")
+
+    build_directory = BuildDirectory.for_build(script, "3.12", {"--onefile": True})
+    options = build_directory.apply({"--onefile": True, "--remove-output": True})
+    assert options == {"--onefile": True, "--output-dir": str(build_directory.path)}
+
+    (build_directory.path / "main.build").mkdir()
+    (build_directory.path / "main.dist").mkdir()
+    (build_directory.path / "main.bin").write_text("binary")
+    restored = build_directory.restore_outputs()
+    assert restored == [tmp_path / "main.bin"]
+
+    build_directory.release()
+    assert build_directory.path.exists()
+    monkeypatch.setenv("TUITKA_BUILD_CACHE_SIZE", "0")
+    assert prune_build_dirs() == [build_directory.path]
+
+
+def test_build_directories_in_use_are_not_pruned(tmp_path, monkeypatch):
+    monkeypatch.setenv("TUITKA_BUILD_CACHE_SIZE", "0")
+    first = BuildDirectory.for_build(tmp_path / "first.py", "3.12", {})
+    second = BuildDirectory.for_build(tmp_path / "second.py", "3.12", {})
+    for build_directory in (first, second):
+        (build_directory.path / "main.build").mkdir()
+        (build_directory.path / "main.build" / "module.o").write_bytes(bytes(1000))
+
+    assert prune_build_dirs() == []
+    first.release()
+    assert first.path.exists() and second.path.exists()
+    second.release()
+    second.release()
+    assert not first.path.exists() and second.path.exists()
+
+
+def test_build_directory_of_dead_process_is_reused(tmp_path):
+    script = tmp_path / "main.py"
+    build_directory = BuildDirectory.for_build(script, "3.12", {})
+    finished = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lock_path = build_directory.path.with_name(f"{build_directory.path.name}.lock")
+    (lock_path / "owner").write_text(finished.stdout.strip())
+
+    assert BuildDirectory.for_build(script, "3.12", {}).path == build_directory.path
@@ -0,0 +1,42 @@
+import tuitka.build_output as build_output
+from tuitka.build_output import BuildLog, LineSplitter, classify_line
+
+
+def test_line_splitter_handles_partial_lines_and_progress():
+    splitter = LineSplitter()
+    assert splitter.feed("Nuitka: Start") == []
+    assert splitter.feed("ing\r\n\x1b[32m10%\r50%\r100%\x1b[0m\r\nrest") == [
+        "Nuitka: Starting",
+        "100%",
+    ]
+    assert splitter.flush() == ["rest"]
+
+
+def test_classify_line():
+    assert classify_line("Nuitka-Scons:WARNING: You are not using ccache.") == "warning"
+    assert classify_line("FATAL: Error, needs a C compiler.") == "error"
+    assert classify_line("module.c:12:5: error: expected ';'") == "error"
+    assert classify_line("  × No solution found when resolving dependencies") == "error"
+    assert classify_line("Nuitka: Successfully created 'a.bin'.") is None
+
+
+def test_build_log_indexes_errors_and_spills_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_output, "CHECKPOINT_LINES", 16)
+    build_log = BuildLog(tmp_path / "build.log", recent_lines=10)
+    for number in range(100):
+        if number == 42:
+            build_log.feed("x.c:1:2: error: boom\r\n")
+        elif number % 30 == 0:
+            build_log.feed("Nuitka:WARNING: careful\r\n")
+        else:
+            build_log.feed(f"line {number}\r\n")
+    build_log.close()
+
+    assert len(build_log.recent_lines) == 10
+    assert build_log.format_counts() == "1 error, 4 warnings"
+    assert build_log.first_error.line_number == 42
+    assert build_log.read_lines(41, 3) == ["line 41", "x.c:1:2: error: boom", "line 43"]
+    assert build_log.read_lines(95, 10) == [
+        f"line {number}" for number in range(95, 100)
+    ]
+    assert (tmp_path / "build.log").read_text().count("\n") == 100
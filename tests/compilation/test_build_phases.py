@@ -0,0 +1,51 @@
+from tuitka.build_phases import PhaseTracker
+
+BUILD_OUTPUT = [
+    "Creating build environment /cache/environments/6b5f8e7a7d8af330",
+    "Using CPython 3.11.7 interpreter at: /usr/bin/python3.11",
+    "Using Python 3.11.7 environment at: /cache/environments/6b5f8e7a7d8af330",
+    "Resolved 3 packages in 3.67s",
+    "Installed 3 packages in 9ms",
+    "Nuitka-Options: Used command line options:",
+    "Nuitka: Starting Python compilation with:",
+    "Nuitka: Completed Python level compilation and optimization.",
+    "Nuitka: Generating source code for C backend compiler.",
+    "Nuitka: Running C compilation via Scons.",
+    "Nuitka-Scons: Backend C compiler: gcc (gcc 12).",
+    "Nuitka-Scons: Backend C linking with 7 files.",
+    "Nuitka-Scons:WARNING: You are not using ccache.",
+    "Nuitka-Postprocessing: Creating single file from dist folder.",
+    "Nuitka-Onefile: Running bootstrap binary compilation via Scons.",
+    "Nuitka-Scons: Onefile C compiler: gcc (gcc 12).",
+    "Nuitka: Successfully created 'a.bin'.",
+]
+
+
+def test_phase_tracker_times_build_phases(tmp_path):
+    # One second passes per output line.
+    now = [0.0]
+    tracker = PhaseTracker(title="a.py", clock=lambda: now[0])
+    for line in BUILD_OUTPUT:
+        tracker.feed(line + "\r\n")
+        now[0] += 1
+    tracker.finish(0)
+
+    assert [phase.name for phase in tracker.phases] == [
+        "environment",
+        "dependencies",
+        "python",
+        "c-source",
+        "c-compile",
+        "link",
+        "onefile",
+    ]
+    assert tracker.phases[0].duration == 2
+    assert tracker.slowest_phase().name == "onefile"
+    assert tracker.duration == len(BUILD_OUTPUT)
+    assert len(tracker.warnings) == 1
+
+    trace = tracker.to_chrome_trace()["traceEvents"]
+    spans = [event for event in trace if event["ph"] == "X"]
+    assert spans[0]["name"] == "a.py"
+    assert spans[0]["dur"] == sum(span["dur"] for span in spans[1:])
+    assert tracker.write_chrome_trace(tmp_path / "trace.json").exists()
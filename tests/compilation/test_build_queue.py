@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from tuitka.batch import BuildJob
+from tuitka.build_queue import CANCELLED, FAILED, PASSED, QUEUED, RUNNING, BuildQueue
+
+
+def make_queue(concurrency, *scripts):
+    queue = BuildQueue(concurrency)
+    entries = [queue.add(BuildJob(Path(script)), "Onefile") for script in scripts]
+    return queue, entries
+
+
+def test_builds_start_in_order_within_the_limit():
+    queue, (first, second, third) = make_queue(2, "a.py", "b.py", "c.py")
+    assert queue.take_ready() == [first, second]
+    assert third.state == QUEUED
+    assert queue.take_ready() == []
+
+    queue.finish(first, FAILED, 1)
+    assert first.exit_code == 1 and first.duration is not None
+    assert queue.take_ready() == [third]
+    assert queue.format_counts() == "2 running, 1 failed"
+
+
+def test_builds_of_one_script_never_overlap():
+    queue, (first, second, third) = make_queue(3, "a.py", "a.py", "b.py")
+    assert queue.take_ready() == [first, third]
+
+    queue.finish(first, PASSED, 0)
+    assert queue.take_ready() == [second]
+    assert second.state == RUNNING
+
+
+def test_held_back_builds_keep_their_place():
+    queue, (first, second) = make_queue(1, "a.py", "b.py")
+    assert queue.take_ready(lambda entry: entry is not first) == [second]
+    assert first.state == QUEUED
+
+    queue.finish(second, CANCELLED, None)
+    queue.concurrency = 2
+    assert queue.take_ready() == [first]
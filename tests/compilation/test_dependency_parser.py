@@ -35,3 +35,12 @@ def test_dependency_parser_with_pyproject_toml(tmp_path):
     parser = DependencyParser(p)
     deps = parser.parse()
     assert sorted(deps.dependencies) == ["requests", "textual"]
+
+
+def test_dependency_parser_infers_deps_from_imports(tmp_path):
+    p = tmp_path / "script.py"
+    p.write_text("import os\nimport yaml\nimport PIL.Image\nimport not_a_known_module\n")
+    parser = DependencyParser(p)
+    deps = parser.parse()
+    assert [dep.lower() for dep in deps.dependencies] == ["pillow", "pyyaml"]
+    assert deps.unresolved_imports == ["not_a_known_module"]
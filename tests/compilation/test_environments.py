@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+from tuitka.cache import acquire_lease, is_leased, release_lease, write_json_atomic
+from tuitka.environments import (
+    ENVIRONMENT_MARKER,
+    get_environment_dir,
+    get_environment_key,
+    normalize_requirement,
+    prune_environments,
+)
+from tuitka.utils import prepare_nuitka_command
+
+
+def test_normalize_requirement():
+    assert normalize_requirement("PyYAML >= 6.0") == "pyyaml>=6.0"
+    assert normalize_requirement("typing_extensions") == "typing-extensions"
+    assert normalize_requirement("Foo [bar] >= 1 , < 2") == "foo[bar]>=1,<2"
+    assert normalize_requirement("six ; python_version < '3.8'") == (
+        "six; python_version<'3.8'"
+    )
+    assert normalize_requirement("pkg@https://x/pkg.whl") == "pkg @ https://x/pkg.whl"
+
+
+def test_environment_key_ignores_order_and_spelling():
+    key = get_environment_key(["requests", "PyYAML>=6"], "3.12")
+    assert key == get_environment_key(["pyyaml>=6", "Requests"], "3.12")
+    assert key == get_environment_key(["requests", "PyYAML >= 6"], "3.12")
+    assert key != get_environment_key(["requests", "PyYAML>=6"], "3.11")
+    assert key != get_environment_key(["requests"], "3.12")
+
+
+def test_prepare_nuitka_command_uses_environment_cache(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("print('hello')\n")
+
+    cmd, metadata = prepare_nuitka_command(script, "3.12", **{"--onefile": True})
+    assert cmd[:3] == [sys.executable, "-m", "tuitka.environments"]
+    tuned = [
+        f"{flag}={value}" for flag, value in metadata.resource_profile.options.items()
+    ]
+    assert cmd[cmd.index("--") + 1 :] == ["--onefile", *tuned, script.as_posix()]
+
+    cmd, _ = prepare_nuitka_command(script, "3.12", isolated=True)
+    assert cmd[:3] == [sys.executable, "-m", "tuitka.environments"]
+    assert "--isolated" in cmd[: cmd.index("--")]
+
+
+def test_environments_in_use_are_not_pruned(tmp_path, monkeypatch):
+    monkeypatch.setenv("TUITKA_ENV_CACHE_SIZE", "0")
+    used = get_environment_dir(["requests"], "3.12")
+    unused = get_environment_dir(["rich"], "3.12")
+    for environment_dir in (used, unused):
+        write_json_atomic(environment_dir / ENVIRONMENT_MARKER, {"size": 1000})
+
+    # Only a build running from it keeps a recently used environment.
+    acquire_lease(used)
+    assert prune_environments() == [unused]
+    release_lease(used)
+    assert prune_environments() == [used]
+
+
+def test_leases_of_exited_processes_are_stale(tmp_path):
+    environment_dir = get_environment_dir(["requests"], "3.12")
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    leases_path = environment_dir.with_name(f"{environment_dir.name}.leases")
+    leases_path.mkdir(parents=True)
+    (leases_path / str(process.pid)).touch()
+
+    assert not is_leased(environment_dir)
+    assert not leases_path.exists()
@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+import tuitka.file_index
+from tuitka.file_index import FileIndex, IgnoreRules
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    files = {
+        "app/helpers.py": "",
+        "app/main.py": "",
+        "app/__main__.py": "",
+        "tools/make_mainline.py": "",
+        "tools/release.py": "# /// script\n# dependencies = []\n# ///\n",
+        "generated/models.py": "",
+        "app/data/cache_1.py": "",
+        "app/data/keep_1.py": "",
+        "venv/lib/module.py": "",
+        "node_modules/pkg/setup.py": "",
+        "main.build/main.py": "",
+        ".git/hooks/hook.py": "",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (root / "venv" / "pyvenv.cfg").write_text("")
+    (root / ".gitignore").write_text("/generated/\n")
+    (root / "app" / "data" / ".gitignore").write_text("*_1.py\n!keep_*.py\n")
+    return root
+
+
+def test_index_honours_gitignore_and_skips_environments(repo):
+    index = FileIndex.load(repo)
+    assert index.refresh()
+    assert sorted(index.paths) == [
+        "app/__main__.py",
+        "app/data/keep_1.py",
+        "app/helpers.py",
+        "app/main.py",
+        "tools/make_mainline.py",
+        "tools/release.py",
+    ]
+
+
+def test_entry_points_rank_first(repo):
+    index = FileIndex.load(repo)
+    index.refresh()
+    assert index.search("")[:3] == [
+        "app/__main__.py",
+        "app/main.py",
+        "tools/release.py",
+    ]
+    # File names starting with the query come first, then entry points.
+    assert index.search("main") == [
+        "app/main.py",
+        "app/__main__.py",
+        "tools/make_mainline.py",
+    ]
+    assert index.search("tlsrel") == ["tools/release.py"]
+    assert index.search("app help") == ["app/helpers.py"]
+    assert index.search("zzz") == []
+
+
+def test_refresh_only_lists_changed_directories(repo, monkeypatch):
+    index = FileIndex.load(repo)
+    index.refresh()
+    index.save()
+
+    listed = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(os.path.relpath(path, repo))
+        return scandir(path)
+
+    monkeypatch.setattr(tuitka.file_index.os, "scandir", counting_scandir)
+    index = FileIndex.load(repo)
+    assert "app/main.py" in index.paths
+    assert not index.refresh()
+    assert listed == []
+
+    (repo / "tools" / "new_tool.py").write_text("")
+    assert index.refresh()
+    assert listed == ["tools"]
+    assert "tools/new_tool.py" in index.search("new")
+
+
+def test_ignore_rules():
+    rules = IgnoreRules().child("", "build/\n*.log\n/top.py\ndocs/**/gen_*.py\n")
+    rules = rules.child("src", "!important.log\n")
+    assert rules.is_ignored("build", True)
+    assert not rules.is_ignored("build", False)
+    assert rules.is_ignored("a/b/debug.log", False)
+    assert not rules.is_ignored("src/important.log", False)
+    assert rules.is_ignored("top.py", False)
+    assert not rules.is_ignored("src/top.py", False)
+    assert rules.is_ignored("docs/a/b/gen_api.py", False)
+    assert rules.is_ignored("docs/gen_api.py", False)
+
+
+def test_search_after_refresh_uses_the_new_paths(repo):
+    index = FileIndex.load(repo)
+    index.refresh()
+    assert index.search("hel") == ["app/helpers.py"]
+
+    (repo / "app" / "a_helpers.py").write_text("")
+    assert index.refresh()
+    assert sorted(index.search("help")) == ["app/a_helpers.py", "app/helpers.py"]
+
+
+def test_index_caches_are_evicted(tmp_path, repo, monkeypatch):
+    monkeypatch.setenv("TUITKA_FILE_INDEX_CACHE_SIZE", "0")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "main.py").write_text("")
+
+    first = FileIndex.load(repo)
+    first.refresh()
+    first.save()
+    second = FileIndex.load(other)
+    second.refresh()
+    second.save()
+    assert FileIndex.load(other).paths == ["main.py"]
+    assert FileIndex.load(repo).paths == []
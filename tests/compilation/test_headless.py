@@ -0,0 +1,52 @@
+import io
+import json
+import sys
+
+import tuitka.batch as batch
+from tuitka.headless import run_headless
+from tuitka.utils import DependenciesMetadata
+
+
+def test_run_headless_reports_json(tmp_path, monkeypatch):
+    def fake_command(script_path, python_version, **nuitka_options):
+        code = (
+            "import pathlib; print('Nuitka: Starting Python compilation with:'); "
+            "pathlib.Path('main.bin').write_text('binary')"
+        )
+        return [sys.executable, "-c", code], None
+
+    monkeypatch.setattr(batch, "prepare_nuitka_command", fake_command)
+    script = tmp_path / "main.py"
+    script.write_text("")
+
+    stdout, stderr = io.StringIO(), io.BytesIO()
+    assert run_headless([script], {"--onefile": True}, stdout=stdout, stderr=stderr)
+
+    assert b"Nuitka: Starting Python compilation" in stderr.getvalue()
+    result = json.loads(stdout.getvalue())
+    assert result["success"]
+    (build,) = result["builds"]
+    assert build["exit_code"] == 0
+    assert build["command"][0] == sys.executable
+    assert build["artifacts"] == [str(tmp_path / "main.bin")]
+    assert set(build["phases"]) == {"environment", "python"}
+
+
+def test_run_headless_reports_unresolved_imports_first(tmp_path, monkeypatch):
+    def fake_command(script_path, python_version, **nuitka_options):
+        metadata = DependenciesMetadata([], unresolved_imports=["frobnicate"])
+        return [sys.executable, "-c", "print('Nuitka: Starting')"], metadata
+
+    monkeypatch.setattr(batch, "prepare_nuitka_command", fake_command)
+    script = tmp_path / "main.py"
+    script.write_text("import frobnicate\n")
+
+    stdout, stderr = io.StringIO(), io.BytesIO()
+    assert run_headless(
+        [script], {}, artifact_cache=False, stdout=stdout, stderr=stderr
+    )
+
+    output = stderr.getvalue().decode()
+    assert output.index("Unresolved imports: frobnicate") < output.index("Nuitka:")
+    (build,) = json.loads(stdout.getvalue())["builds"]
+    assert build["unresolved_imports"] == ["frobnicate"]
@@ -0,0 +1,69 @@
+import pytest
+
+import tuitka.import_graph
+from tuitka.import_graph import ImportGraphScanner, scan_project_imports
+from tuitka.utils import DependencyParser
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "app" / "ui").mkdir(parents=True)
+    (root / "main.py").write_text("import os\nimport helpers\nfrom app import ui\n")
+    (root / "helpers.py").write_text("import yaml\n")
+    (root / "app" / "__init__.py").write_text("")
+    (root / "app" / "ui" / "__init__.py").write_text("from .window import Window\n")
+    (root / "app" / "ui" / "window.py").write_text(
+        "from PySide6.QtWidgets import QWidget\nfrom .. import models\n"
+    )
+    (root / "app" / "models.py").write_text("import sqlalchemy.orm\n")
+    (root / "unused.py").write_text("import numpy\n")
+    return root
+
+
+def test_scan_follows_local_imports(project):
+    graph = scan_project_imports(project / "main.py")
+    assert graph.external_imports == ["PySide6", "sqlalchemy", "yaml"]
+    assert project / "unused.py" not in graph.modules
+    assert graph.parsed_files == 6
+
+
+def test_rescan_only_parses_changed_files(project):
+    scan_project_imports(project / "main.py")
+    assert scan_project_imports(project / "main.py").parsed_files == 0
+
+    (project / "helpers.py").write_text("import yaml\nimport requests\n")
+    graph = scan_project_imports(project / "main.py")
+    assert graph.parsed_files == 1
+    assert "requests" in graph.external_imports
+
+
+def test_dependency_parser_detects_imports_of_local_modules(project):
+    metadata = DependencyParser(project / "main.py").parse()
+    assert "PySide6" in metadata.detected_imports
+
+
+def test_parallel_parse_matches_serial_parse(project, monkeypatch):
+    serial = scan_project_imports(project / "main.py")
+    monkeypatch.setattr(tuitka.import_graph, "PARALLEL_PARSE_THRESHOLD", 1)
+    monkeypatch.setattr(tuitka.import_graph, "get_cpu_count", lambda: 2)
+    (project / "helpers.py").write_text("import yaml\nimport requests\n")
+    (project / "app" / "models.py").write_text("import sqlalchemy.orm\n# edited\n")
+
+    graph = scan_project_imports(project / "main.py")
+    assert graph.parsed_files == 2
+    assert graph.external_imports == sorted([*serial.external_imports, "requests"])
+
+
+def test_import_caches_are_evicted(tmp_path, project, monkeypatch):
+    monkeypatch.setenv("TUITKA_IMPORT_CACHE_SIZE", "0")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "main.py").write_text("import yaml\n")
+
+    first = ImportGraphScanner(project)
+    first.scan(project / "main.py")
+    assert first.cache_path.exists()
+    second = ImportGraphScanner(other)
+    second.scan(other / "main.py")
+    assert second.cache_path.exists() and not first.cache_path.exists()
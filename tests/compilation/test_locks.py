@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+import tuitka.locks
+from tuitka.environments import get_nuitka_requirement
+from tuitka.fingerprint import get_build_fingerprint
+from tuitka.locks import ensure_lock, get_lock_path, get_script_lock_path, read_lock
+from tuitka.utils import prepare_nuitka_command
+
+LOCKED = "attrs==25.1.0\nrequests==2.32.3\n    # via -r -\nurllib3==2.3.0\n"
+
+
+@pytest.fixture
+def resolutions(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, input, **kwargs):
+        calls.append((cmd, input))
+        return subprocess.CompletedProcess(cmd, 0, stdout=LOCKED)
+
+    monkeypatch.setattr(tuitka.locks.subprocess, "run", fake_run)
+    return calls
+
+
+def test_lock_is_resolved_once_per_requirement_set(tmp_path, resolutions):
+    lock_path = get_lock_path(tmp_path, ["requests", "attrs"], "3.12")
+    assert lock_path == get_lock_path(tmp_path, ["Attrs", "requests"], "3.12")
+    assert lock_path != get_lock_path(tmp_path, ["requests"], "3.12")
+    assert read_lock(lock_path) is None
+
+    ensure_lock(lock_path, ["requests", "attrs"], "3.12")
+    ensure_lock(lock_path, ["requests", "attrs"], "3.12")
+    assert len(resolutions) == 1
+    cmd, requirements = resolutions[0]
+    assert cmd[:3] == ["uv", "pip", "compile"] and "--universal" in cmd
+    assert requirements.split() == ["requests", "attrs"]
+    assert read_lock(lock_path) == ["attrs==25.1.0", "requests==2.32.3", "urllib3==2.3.0"]
+
+    ensure_lock(lock_path, ["requests", "attrs"], "3.12", upgrade=True)
+    assert len(resolutions) == 2
+
+
+def test_builds_use_the_project_lock(tmp_path, resolutions):
+    script = tmp_path / "main.py"
+    script.write_text("print('hello')\n")
+    (tmp_path / "requirements.txt").write_text("requests\n")
+
+    cmd, metadata = prepare_nuitka_command(script, "3.12", isolated=True)
+    requirements = ["requests", get_nuitka_requirement()]
+    lock_path = get_script_lock_path(script, requirements, "3.12")
+    assert cmd[:3] == [sys.executable, "-m", "tuitka.environments"]
+    assert cmd[cmd.index("--lock") + 1] == str(lock_path)
+    assert "--isolated" in cmd[: cmd.index("--")]
+
+    # Locked pins decide the fingerprint, not the loose requirements.
+    loose = get_build_fingerprint(script, "3.12", {}, metadata, isolated=True)
+    ensure_lock(lock_path, requirements, "3.12")
+    locked = get_build_fingerprint(script, "3.12", {}, metadata, isolated=True)
+    assert loose.digest != locked.digest
+    assert locked.inputs["dependencies"] == read_lock(lock_path)
+    assert locked.digest == get_build_fingerprint(script, "3.12", {}, metadata).digest
@@ -0,0 +1,72 @@
+import pytest
+
+import tuitka.nuitka_options as nuitka_options
+from tuitka.nuitka_options import (
+    NuitkaOption,
+    OptionSearchIndex,
+    load_nuitka_options,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(cache_dir):
+    load_nuitka_options.cache_clear()
+    yield cache_dir
+    load_nuitka_options.cache_clear()
+
+
+def test_options_are_typed():
+    options = load_nuitka_options()
+    mode = options["General Options"]["--mode"]
+    assert isinstance(mode, NuitkaOption)
+    assert "onefile" in mode.choices
+
+
+def test_options_cache_is_reused(isolated_cache, monkeypatch):
+    first = load_nuitka_options()
+    assert list((isolated_cache / "nuitka-options").glob("options-*.json"))
+
+    def fail():
+        raise AssertionError("option schema was rebuilt")
+
+    monkeypatch.setattr(nuitka_options, "_build_options", fail)
+    load_nuitka_options.cache_clear()
+    assert load_nuitka_options() == first
+
+
+def test_options_cache_rebuilt_for_new_nuitka(isolated_cache, monkeypatch):
+    load_nuitka_options()
+    monkeypatch.setattr(nuitka_options, "get_nuitka_version", lambda: "0.0.1")
+    load_nuitka_options.cache_clear()
+    load_nuitka_options()
+    assert len(list((isolated_cache / "nuitka-options").glob("options-*.json"))) == 1
+
+
+def test_search_ranks_flag_matches_first():
+    options = {
+        "Group": {
+            "--show-progress": NuitkaOption("--show-progress", ("--show-progress",)),
+            "--quiet": NuitkaOption(
+                "--quiet", ("--quiet",), help="Do not show progress information."
+            ),
+            "--lto": NuitkaOption(
+                "--lto", ("--lto",), help="Use link time optimizations."
+            ),
+        }
+    }
+    index = OptionSearchIndex(options)
+    assert index.search("progress") == ["--show-progress", "--quiet"]
+    assert index.search("progress quiet") == ["--quiet"]
+    assert index.search("lto") == ["--lto"]
+    assert index.search("") == ["--show-progress", "--quiet", "--lto"]
+
+
+@pytest.mark.parametrize(
+    "query", ["thon-f", "ython-f", "on-f", "--stand alone", "mode=a"]
+)
+def test_search_while_typing_matches_fresh_search(query):
+    typing = OptionSearchIndex(load_nuitka_options())
+    fresh = OptionSearchIndex(load_nuitka_options())
+    for end in range(1, len(query) + 1):
+        fresh.search("")
+        assert typing.search(query[:end]) == fresh.search(query[:end])
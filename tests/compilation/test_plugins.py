@@ -0,0 +1,46 @@
+from tuitka.plugins import (
+    ACCELERATED,
+    PACKAGED,
+    apply_build_options,
+    get_build_mode,
+    match_plugins,
+)
+
+
+def actions(decisions):
+    return {decision.plugin: decision.action for decision in decisions}
+
+
+def test_plugins_match_whole_import_names():
+    assert match_plugins(["pyqt5_tools", "tkinterweb", "numpy"], PACKAGED) == []
+    assert actions(match_plugins(["PyQt5", "tkinter"], PACKAGED)) == {
+        "pyqt5": "enable",
+        "tk-inter": "enable",
+    }
+
+
+def test_plugin_decisions_follow_build_mode_and_conflicts():
+    imports = ["PyQt5", "PySide6", "multiprocessing", "dill"]
+    assert actions(match_plugins(imports, PACKAGED)) == {
+        "pyside6": "enable",
+        "pyqt5": "skip",
+        "dill-compat": "enable",
+        "multiprocessing": "automatic",
+    }
+    assert actions(match_plugins(imports, ACCELERATED)) == {
+        "pyside6": "skip",
+        "pyqt5": "skip",
+        "dill-compat": "enable",
+        "multiprocessing": "automatic",
+    }
+    assert get_build_mode({"--mode": "app"}) == PACKAGED
+    assert get_build_mode({"--standalone": False}) == ACCELERATED
+
+
+def test_build_options_override_plugin_decisions():
+    decisions = match_plugins(["tkinter", "dill"], PACKAGED)
+    options = {"--disable-plugins": "tk-inter", "--enable-plugin=dill-compat": True}
+    assert actions(apply_build_options(decisions, options)) == {
+        "tk-inter": "skip",
+        "dill-compat": "configured",
+    }
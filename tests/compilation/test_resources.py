@@ -0,0 +1,29 @@
+import tuitka.resources as resources
+from tuitka.resources import get_resource_profile
+
+
+def test_resource_profile_on_large_builder(monkeypatch):
+    monkeypatch.setattr(resources, "get_cpu_count", lambda: 64)
+    monkeypatch.setattr(resources, "get_cgroup_cpu_limit", lambda: None)
+    monkeypatch.setattr(resources, "get_available_memory", lambda: 128 * 1024**3)
+
+    profile = get_resource_profile({"--standalone": True}, 4096, dependency_count=20)
+    assert profile.options == {"--jobs": "64", "--lto": "yes"}
+    assert "--jobs=64: 64 CPUs" in profile.describe()
+
+
+def test_resource_profile_in_small_container(monkeypatch):
+    monkeypatch.setattr(resources, "get_cpu_count", lambda: 2)
+    monkeypatch.setattr(resources, "get_cgroup_cpu_limit", lambda: 2.0)
+    monkeypatch.setattr(resources, "get_available_memory", lambda: 1536 * 1024**2)
+
+    profile = get_resource_profile({"--onefile": True}, 2 * 1024**2)
+    assert profile.options == {"--jobs": "1", "--lto": "no"}
+    assert "cgroup quota" in profile.reasons["--jobs"]
+    assert "1.5 GiB available memory" in profile.reasons["--lto"]
+
+
+def test_resource_profile_keeps_explicit_options(monkeypatch):
+    monkeypatch.setattr(resources, "get_available_memory", lambda: None)
+    profile = get_resource_profile({"--jobs": "3"}, 0)
+    assert profile.options == {}
@@ -0,0 +1,124 @@
+import json
+import shutil
+import sys
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from tuitka.size_report import (
+    DATA,
+    EXTENSION,
+    LIBRARY,
+    PROGRAM,
+    analyze_artifact,
+    classify_file,
+)
+
+
+def make_dist(folder):
+    folder.mkdir()
+    program = folder / "main.bin"
+    program.write_bytes(b"\x7fELF" + bytes(4000))
+    program.chmod(0o755)
+    (folder / "libpython3.11.so.1.0").write_bytes(bytes(3000))
+    package = folder / "pkg"
+    package.mkdir()
+    (package / "_speedups.cpython-311-x86_64-linux-gnu.so").write_bytes(bytes(2000))
+    (package / "data.json").write_text("{}" * 50)
+    (package / "alias.json").symlink_to("data.json")
+    (folder / "pkg.libs").mkdir()
+    (folder / "pkg.libs" / "libfoo.so").write_bytes(bytes(1000))
+    return program
+
+
+@pytest.mark.parametrize(
+    ("path", "kind"),
+    [
+        ("pkg/_speedups.cpython-311-x86_64-linux-gnu.so", EXTENSION),
+        ("pkg/speedups.pyd", EXTENSION),
+        ("PySide6/QtCore.abi3.so", EXTENSION),
+        ("libpython3.11.so.1.0", LIBRARY),
+        ("PySide6/qt-plugins/platforms/libqxcb.so", LIBRARY),
+        ("python311.dll", LIBRARY),
+        ("certifi/cacert.pem", DATA),
+    ],
+)
+def test_classify_file(path, kind):
+    assert classify_file(PurePosixPath(path)) == kind
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="payloads are resources there")
+@pytest.mark.parametrize(
+    ("compression", "checksums", "archive"),
+    [(False, False, False), (True, True, False), (True, False, True)],
+)
+def test_onefile_payload_matches_dist_folder(
+    tmp_path, monkeypatch, compression, checksums, archive
+):
+    from nuitka.tools.onefile_compressor.OnefileCompressor import (
+        attachOnefilePayload,
+    )
+
+    monkeypatch.setenv("NUITKA_CACHE_DIR", str(tmp_path / "nuitka-cache"))
+    dist = tmp_path / "main.dist"
+    program = make_dist(dist)
+    onefile = tmp_path / "main.bin"
+    shutil.copy(sys.executable, onefile)
+    attachOnefilePayload(
+        dist_dir=str(dist),
+        onefile_output_filename=str(onefile),
+        start_binary=str(program),
+        expect_compression=compression,
+        as_archive=archive,
+        use_compression_cache=False,
+        file_checksums=checksums,
+        win_path_sep=False,
+        low_memory=True,
+    )
+
+    folder_report = analyze_artifact(dist)
+    onefile_report = analyze_artifact(onefile)
+    assert folder_report.layout == "folder"
+    assert onefile_report.layout == "onefile"
+    assert onefile_report.compressed == compression
+    assert onefile_report.bootstrap_size == Path(sys.executable).stat().st_size
+    assert onefile_report.kinds == folder_report.kinds == {
+        PROGRAM: 4004,
+        EXTENSION: 2000,
+        LIBRARY: 4000,
+        DATA: 100,
+    }
+    assert onefile_report.packages == folder_report.packages == {
+        "pkg": 2100,
+        "pkg.libs": 1000,
+    }
+
+
+def test_size_report_of_plain_program(tmp_path):
+    program = tmp_path / "main.bin"
+    program.write_bytes(b"\x7fELF" + bytes(100))
+    program.chmod(0o755)
+
+    report = analyze_artifact(program)
+    assert report.layout == "file"
+    assert report.kinds[PROGRAM] == report.disk_size == 104
+    data = json.loads(json.dumps(report.to_dict()))
+    assert data["tree"]["children"] == [
+        {"name": "main.bin", "size": 104, "kind": PROGRAM}
+    ]
+
+
+def test_size_tree_sorting(tmp_path):
+    make_dist(tmp_path / "main.dist")
+    root = analyze_artifact(tmp_path / "main.dist").root
+    assert [node.name for node in root.sorted_children()] == [
+        "main.bin",
+        "libpython3.11.so.1.0",
+        "pkg",
+        "pkg.libs",
+    ]
+    assert [node.name for node in root.sorted_children("name")][:2] == [
+        "libpython3.11.so.1.0",
+        "main.bin",
+    ]
+    assert root.to_dict()["children"][2]["size"] == 2100
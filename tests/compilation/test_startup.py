@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+from tuitka.startup import StartupProfile
+
+
+def test_importing_tuitka_leaves_the_ui_unimported():
+    code = (
+        "import sys, tuitka, tuitka.assets; "
+        "print(sorted(name for name in ('textual', 'rich_pixels', 'tuitka.tui') "
+        "if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_startup_profile_reports_steps():
+    profile = StartupProfile(started=0.0, mode="tui")
+    profile.mark("import tuitka")
+    profile.mark("first paint")
+    report = profile.format_report().splitlines()
+    assert report[0] == "tuitka startup (tui)"
+    assert [line.split()[0] for line in report[1:]] == ["import", "first", "total"]
+    assert profile.total == sum(step.duration for step in profile.steps)
@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import tuitka.batch as batch
+from tuitka.batch import BuildJob
+from tuitka.watch import FileWatcher, get_watched_files, make_watch_job, watch_builds
+
+
+def stop_after(seconds):
+    deadline = time.monotonic() + seconds
+    return lambda: time.monotonic() > deadline
+
+
+def is_running(pid):
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except OSError:
+        return False
+    return state not in ("Z", "X")
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reports_content_changes_once_per_burst(tmp_path, use_inotify):
+    first, second, other = (tmp_path / name for name in ("a.py", "b.py", "c.py"))
+    first.write_text("a = 1\n")
+    other.write_text("")
+    watcher = FileWatcher([first, second], use_inotify=use_inotify)
+    try:
+        first.write_text("a = 2\n")
+        first.write_text("a = 3\n")
+        # Missing files are watched as well, creating one is a change.
+        second.write_text("b = 1\n")
+        other.write_text("c = 1\n")
+        assert watcher.wait(stop_after(5)) == {first, second}
+
+        # Saved without changes, nothing to rebuild.
+        first.write_text("a = 3\n")
+        assert watcher.wait(stop_after(1.5)) == set()
+    finally:
+        watcher.close()
+
+
+def test_watched_files_follow_local_imports(tmp_path):
+    script = tmp_path / "main.py"
+    script.write_text("import helpers\n")
+    (tmp_path / "helpers.py").write_text("import os\n")
+    (tmp_path / "unrelated.py").write_text("")
+
+    watched = get_watched_files(script)
+    assert script in watched
+    assert tmp_path / "helpers.py" in watched
+    assert tmp_path / "pyproject.toml" in watched
+    assert tmp_path / "unrelated.py" not in watched
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+def test_change_cancels_running_build(tmp_path, monkeypatch):
+    script = tmp_path / "main.py"
+    script.write_text("print(1)\n")
+    builds = []
+
+    def fake_command(script_path, python_version, **nuitka_options):
+        builds.append(nuitka_options)
+        if len(builds) > 1:
+            return [sys.executable, "-c", "pass"], None
+        # A compiler process started by the build, it has to stop as well.
+        code = (
+            "import subprocess, sys, time;"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+            "print(child.pid, flush=True); time.sleep(60)"
+        )
+        return [sys.executable, "-c", code], None
+
+    monkeypatch.setattr(batch, "prepare_nuitka_command", fake_command)
+
+    events = []
+    output = []
+
+    async def main():
+        task = asyncio.current_task()
+
+        def on_event(kind, item):
+            events.append(kind)
+            if kind == "finished":
+                task.cancel()
+
+        def on_output(chunk):
+            output.append(chunk)
+            script.write_text("print(2)\n")
+
+        watcher = FileWatcher([script])
+        try:
+            await watch_builds(make_watch_job(BuildJob(script)), watcher, on_event, on_output)
+        finally:
+            watcher.close()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main())
+
+    assert events == ["started", "cancelled", "started", "finished"]
+    # Both builds used the same kept build directory.
+    assert builds[0]["--output-dir"] == builds[1]["--output-dir"]
+    compiler_pid = int(b"".join(output).split()[0])
+    time.sleep(0.2)
+    assert not is_running(compiler_pid)
@@ -0,0 +1,97 @@
+import base64
+import hashlib
+import sys
+import zipfile
+
+import pytest
+
+from tuitka.utils import prepare_nuitka_command
+from tuitka.wheelhouse import check_wheelhouse, find_missing
+
+
+def make_wheel(wheelhouse, name, version, requires=()):
+    dist_info = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}/__init__.py": "",
+        f"{dist_info}/METADATA": "\n".join(
+            [
+                "Metadata-Version: 2.1",
+                f"Name: {name}",
+                f"Version: {version}",
+                *(f"Requires-Dist: {requirement}" for requirement in requires),
+            ]
+        )
+        + "\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nRoot-Is-Purelib: true\n"
+        "Tag: py3-none-any\n",
+    }
+    record = [
+        f"{path},sha256="
+        + base64.urlsafe_b64encode(hashlib.sha256(content.encode()).digest())
+        .rstrip(b"=")
+        .decode()
+        + f",{len(content)}"
+        for path, content in files.items()
+    ]
+    files[f"{dist_info}/RECORD"] = "\n".join([*record, f"{dist_info}/RECORD,,"]) + "\n"
+    wheelhouse.mkdir(exist_ok=True)
+    with zipfile.ZipFile(
+        wheelhouse / f"{name}-{version}-py3-none-any.whl", "w"
+    ) as wheel:
+        for path, content in files.items():
+            wheel.writestr(path, content)
+
+
+def test_find_missing_packages_offline(tmp_path, capsys):
+    wheelhouse = tmp_path / "wheelhouse"
+    make_wheel(wheelhouse, "alpha", "1.0", requires=["beta>=2"])
+    make_wheel(wheelhouse, "gamma", "0.1")
+
+    assert find_missing(["gamma"], wheelhouse, "3.11") == []
+    assert find_missing(["alpha", "gamma", "delta"], wheelhouse, "3.11") == [
+        "alpha",
+        "delta",
+    ]
+    # Lock file pins are looked up without their dependencies.
+    assert find_missing(["alpha==1.0", "gamma==0.2"], wheelhouse, "3.11", True) == [
+        "gamma==0.2"
+    ]
+
+    make_wheel(wheelhouse, "beta", "2.0")
+    assert check_wheelhouse(["alpha", "gamma"], wheelhouse, "3.11")
+    assert not check_wheelhouse(["delta"], wheelhouse, "3.11")
+    assert not check_wheelhouse(["alpha"], tmp_path / "missing", "3.11")
+    output = capsys.readouterr().out
+    assert "  delta\n" in output
+    assert "does not exist" in output
+
+
+def test_offline_builds_use_the_wheelhouse(tmp_path, monkeypatch):
+    script = tmp_path / "main.py"
+    script.write_text("print('hello')\n")
+    options = {"--standalone": True, "--assume-yes-for-downloads": True}
+
+    cmd, _ = prepare_nuitka_command(script, "3.11", **options)
+    assert "--assume-yes-for-downloads" in cmd
+    assert "--wheelhouse" not in cmd
+
+    monkeypatch.setenv("TUITKA_OFFLINE", "1")
+    monkeypatch.setenv("TUITKA_WHEELHOUSE", str(tmp_path / "wheelhouse"))
+    cmd, _ = prepare_nuitka_command(script, "3.11", **options)
+    assert cmd[:3] == [sys.executable, "-m", "tuitka.environments"]
+    assert "--assume-yes-for-downloads" not in cmd
+    assert cmd[cmd.index("--wheelhouse") + 1] == str(tmp_path / "wheelhouse")
+
+
+@pytest.mark.parametrize("offline", ["", "0", "false"])
+def test_wheelhouse_alone_stays_online(tmp_path, monkeypatch, offline):
+    monkeypatch.setenv("TUITKA_OFFLINE", offline)
+    monkeypatch.setenv("TUITKA_WHEELHOUSE", str(tmp_path / "wheelhouse"))
+    script = tmp_path / "main.py"
+    script.write_text("print('hello')\n")
+
+    cmd, _ = prepare_nuitka_command(
+        script, "3.11", **{"--assume-yes-for-downloads": True}
+    )
+    assert "--assume-yes-for-downloads" in cmd
+    assert "--wheelhouse" not in cmd
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every test's caches out of the real per-user cache."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("TUITKA_CACHE_DIR", str(path))
+    return path